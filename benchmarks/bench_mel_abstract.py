@@ -0,0 +1,67 @@
+"""Time attribute and method dispatch of containers made by AbstractPitch.mk_iterable.
+
+Every call on a container of 10000 pitches is compared with a loop over
+the single pitches, which is the least any dispatch has to do.
+
+    python benchmarks/bench_mel_abstract.py
+"""
+
+import timeit
+
+from mu.mel import abstract
+
+
+SIZE = 10000
+NUMBER = 20
+REPEAT = 5
+
+
+class BenchPitch(abstract.AbstractPitch):
+    __slots__ = ("_freq",)
+
+    def __init__(self, freq):
+        self._freq = freq
+
+    def calc(self):
+        return self._freq
+
+    @property
+    def cents(self):
+        return self._freq * 2
+
+    @property
+    def double(self):
+        return BenchPitch(self._freq * 2)
+
+    def add(self, value):
+        return BenchPitch(self._freq + value)
+
+
+def measure(statement, namespace) -> float:
+    """Return the fastest time of one execution in milliseconds."""
+    times = timeit.repeat(statement, globals=namespace, number=NUMBER, repeat=REPEAT)
+    return min(times) / NUMBER * 1000
+
+
+def main():
+    container_cls = BenchPitch.mk_iterable(list)
+    container = container_cls(BenchPitch(i) for i in range(SIZE))
+    namespace = {"container": container, "container_cls": container_cls}
+    cases = (
+        ("container.freq", "tuple(p.freq for p in container)"),
+        ("container.cents", "tuple(p.cents for p in container)"),
+        ("container.double", "container_cls(p.double for p in container)"),
+        ("container.add(1)", "container_cls(p.add(1) for p in container)"),
+    )
+    print("{} pitches, time per call in ms".format(SIZE))
+    print("{:<20}{:>12}{:>12}".format("call", "container", "loop"))
+    for statement, reference in cases:
+        print(
+            "{:<20}{:>12.3f}{:>12.3f}".format(
+                statement, measure(statement, namespace), measure(reference, namespace)
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
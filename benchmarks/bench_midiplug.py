@@ -0,0 +1,72 @@
+"""Compare the export of a MidiFile with and without pitch_bend_changes_only.
+
+For a sequence of glissandi and steady tones the export time, the size
+of the file and the number of messages are printed for both modes.
+
+    python benchmarks/bench_midiplug.py [number of tones]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+import mido
+
+from mu.mel import ji
+from mu.midiplug import midiplug
+from mu.sco import old
+from mu.utils import interpolations
+
+
+def mk_sequence(n_tones: int) -> tuple:
+    sequence = []
+    for i in range(n_tones):
+        glissando = None
+        if i % 2:
+            glissando = old.GlissandoLine(
+                interpolations.InterpolationLine(
+                    [
+                        old.PitchInterpolation(1, ji.r(1, 1)),
+                        old.PitchInterpolation(0, ji.r(9 + i % 3, 8)),
+                    ]
+                )
+            )
+        sequence.append(
+            midiplug.PyteqTone(
+                ji.r(3 + i % 5, 4),
+                delay=0.3 + (i % 4) * 0.1,
+                duration=0.5 + (i % 3) * 0.2,
+                glissando=glissando,
+            )
+        )
+    # tones mustn't sound longer than the sequence lasts
+    sequence.append(old.Rest(1))
+    return tuple(sequence)
+
+
+def main(n_tones: int = 200):
+    sequence = mk_sequence(n_tones)
+    print("{} tones".format(n_tones))
+    print("{:<32}{:>10}{:>12}{:>12}".format("mode", "time [s]", "size [B]", "messages"))
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "bench.mid")
+        for pitch_bend_changes_only in (False, True):
+            start = time.perf_counter()
+            midiplug.Pianoteq(
+                sequence, pitch_bend_changes_only=pitch_bend_changes_only
+            ).export(path)
+            duration = time.perf_counter() - start
+            n_messages = len(mido.MidiFile(path).tracks[0])
+            print(
+                "{:<32}{:>10.2f}{:>12}{:>12}".format(
+                    "pitch_bend_changes_only={}".format(pitch_bend_changes_only),
+                    duration,
+                    os.path.getsize(path),
+                    n_messages,
+                )
+            )
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -2,9 +2,12 @@ from mu.abstract import mutate
 
 import abc
 import bisect
+import inspect
+import itertools
 import math
 import operator
 import os
+import types
 import warnings
 
 try:
@@ -26,6 +29,8 @@ def is_private(string: str) -> bool:
 
 
 class AbstractPitch(abc.ABC):
+    __slots__ = ()
+
     _cent_calculation_constant = 1200 / (math.log10(2))
     _midi_tuning_table0 = tuple(i * 0.78125 for i in range(128))
     _midi_tuning_table1 = tuple(i * 0.0061 for i in range(128))
@@ -57,31 +62,80 @@ class AbstractPitch(abc.ABC):
         """Return True if pitch equals a Rest. Otherwise False."""
         return False
 
+    # properties of pitches, whose values are never pitches,
+    # so that their results don't have to be checked by adapt_result
+    _value_properties = frozenset(
+        (
+            "freq",
+            "cents",
+            "ratio",
+            "float",
+            "val_border",
+            "numerator",
+            "denominator",
+            "octave",
+            "is_empty",
+        )
+    )
+
     @classmethod
     def mk_iterable(cls, template) -> abc.ABCMeta:
         def adapt_result(self, cls, res):
-            if (cls,) * len(res) == tuple(map(lambda x: type(x), res)):
+            # same as comparing res with (cls,) * len(res) and (None,) * len(res),
+            # but without building both tuples
+            if not res or set(map(type, res)) == {cls}:
                 return type(self)(res)
-            elif (None,) * len(res) != res:
+            elif res.count(None) != len(res):
                 return res
             else:
                 return None
 
-        def method_decorator(func):
+        def method_decorator(key):
             def wrap(*args, **kwargs):
                 res = tuple(
-                    mutate.execute_method(f, func, args[1:], kwargs)
+                    mutate.execute_method(f, key, args[1:], kwargs)
                     for f in args[0]
                     if f is not None
                 )
                 return adapt_result(args[0], cls, res)
 
-            return wrap
+            # the function is looked up once instead of once per element,
+            # if all elements are instances of cls itself
+            func = inspect.getattr_static(cls, key, None)
+            if type(func) is not types.FunctionType:
+                return wrap
 
-        def property_decorator(func):
-            def wrap(*args, **kwargs):
+            def fast_wrap(*args, **kwargs):
                 self = args[0]
-                res = tuple(func.fget(f) for f in self)
+                if set(map(type, self)) != {cls}:
+                    return wrap(*args, **kwargs)
+                if kwargs:
+                    res = tuple(func(f, *args[1:], **kwargs) for f in self)
+                else:
+                    res = tuple(map(func, self, *map(itertools.repeat, args[1:])))
+                return adapt_result(self, cls, res)
+
+            return fast_wrap
+
+        def property_decorator(key, func):
+            fget = func.fget
+            if key in cls._value_properties:
+
+                def wrap(self):
+                    res = tuple(map(fget, self))
+                    if not res:
+                        # an empty container stays a container
+                        return type(self)(res)
+                    elif res.count(None) != len(res):
+                        return res
+                    else:
+                        # containers of empty pitches
+                        return None
+
+                return property(wrap)
+
+            def wrap(self):
+                res = tuple(map(fget, self))
                 return adapt_result(self, cls, res)
 
             return property(wrap)
@@ -97,7 +151,9 @@ class AbstractPitch(abc.ABC):
             (key, func) for key, func in zip(keys, functions) if type(func) == property
         )
         methods = {key: method_decorator(key) for key, func in old_method}
-        properties = {key: property_decorator(func) for key, func in old_property}
+        properties = {
+            key: property_decorator(key, func) for key, func in old_property
+        }
         return type(c_name, bases, {**methods, **properties})
 
     def __eq__(self, other: "AbstractPitch") -> bool:
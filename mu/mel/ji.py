@@ -1,16 +1,20 @@
 import collections
+import concurrent.futures
 import functools
+import heapq
 import itertools
 import json
 import math
 import operator
 import string
+import time
+import weakref
 
 from typing import Callable
 from typing import List
 from typing import Type
 
-import primesieve
+import numpy as np
 
 from mu.mel import abstract
 from mu.mel import mel
@@ -45,6 +49,94 @@ def comparable_monzo_decorator(func: Callable) -> Callable:
 
 CONCERT_PITCH = 440  # default concert pitch on a=440 Hz
 
+# derived values of Monzo - objects (ratio, float, cents, ...) are saved per object
+# until its val_border or multiply change. Set to False for memory-constrained runs.
+CACHE_DERIVED_VALUES = True
+
+# binary logarithm of the first n - primes (see Monzo.log2_val)
+_LOG2_PRIMES = []
+
+
+# names of the derived values of Monzo - objects that get cached besides the hash
+_CACHED_DERIVED_VALUES = (
+    "factorised",
+    "factorised_numerator_and_denominator",
+    "blueprint",
+    "ratio",
+    "float",
+    "cents",
+    "lv",
+    "_identity",
+)
+
+
+def _cached_derived_value(func: Callable) -> Callable:
+    # the hash is needed for every set or dict and gets its own slot, all
+    # other derived values share one list, which is only made when the first
+    # of them gets cached. None marks values that haven't been calculated yet.
+    if func.__name__ == "__hash__":
+
+        @functools.wraps(func)
+        def wrap(self):
+            if not CACHE_DERIVED_VALUES:
+                return func(self)
+
+            try:
+                return self._hash
+            except AttributeError:
+                value = self._hash = func(self)
+                return value
+
+        return wrap
+
+    position = _CACHED_DERIVED_VALUES.index(func.__name__)
+
+    @functools.wraps(func)
+    def wrap(self):
+        if not CACHE_DERIVED_VALUES:
+            return func(self)
+
+        try:
+            cache = self._cache
+        except AttributeError:
+            cache = self._cache = [None] * len(_CACHED_DERIVED_VALUES)
+        value = cache[position]
+        if value is None:
+            value = cache[position] = func(self)
+        return value
+
+    return wrap
+
+
+class _SharedVector(object):
+    """Flyweight for the exponent vector of Monzo - objects.
+
+    Tuples can't be weakly referenced, therefore every Monzo holds a reference
+    to the _SharedVector - object that owns its vector.
+    """
+
+    __slots__ = ("vector", "__weakref__")
+
+    def __init__(self, vector: tuple) -> None:
+        self.vector = vector
+
+
+# living Monzo - objects with identical exponents can share one vector (see
+# Monzo.share_vector). Entries disappear as soon as the last Monzo using them
+# has been garbage collected.
+_SHARED_VECTORS = weakref.WeakValueDictionary()
+
+
+def _share_vector(vector: tuple) -> _SharedVector:
+    # equal vectors of different types, e.g. (0, 1) and (0, 1.0), mustn't be shared
+    key = (vector, tuple(map(type, vector)))
+    try:
+        return _SHARED_VECTORS[key]
+    except KeyError:
+        shared = _SharedVector(vector)
+        _SHARED_VECTORS[key] = shared
+        return shared
+
 
 class Monzo(object):
     r"""A Monzo is a representation or notation of a musical interval in just intonation.
@@ -89,22 +181,81 @@ class Monzo(object):
     Fraction(5, 4)
     """
 
-    _val_shift = 0
+    # Monzo - objects have no __dict__, since often hundreds of thousands of
+    # them are alive at once. multiply is only used by JIPitch.
+    # _val_shift: how many primes (beginning with 2) are ignored
+    # (see Monzo.val_border). None of the cached values depends on multiply.
+    __slots__ = (
+        "_vector",
+        "_shared_vector",
+        "_val_shift",
+        "multiply",
+        "_hash",
+        "_cache",
+    )
+
+    # bits of the mantissa of a float; Monzos with a bigger height get converted
+    # to floats via their logarithm instead of their numerator and denominator
+    _float_precision = 53
 
     def __init__(self, iterable, val_border=1):
         self._vector = Monzo._init_vector(iterable, val_border)
-        self.val_border = val_border
+        self._val_shift = Monzo.count_primes(val_border)
 
+    @_cached_derived_value
     def __hash__(self):
         return hash((self._val_shift, self._vec))
 
+    @classmethod
+    def _from_vector(cls, vector: tuple, val_shift: int = 0) -> "Monzo":
+        """Initialise a new object without checking or trimming the vector.
+
+        The vector has to be a tuple of integers without trailing zeros,
+        starting with the exponent of prime 2.
+        """
+        obj = cls.__new__(cls)
+        obj._vector = vector
+        obj._val_shift = val_shift
+        return obj
+
+    def _clear_cache(self) -> None:
+        try:
+            del self._hash
+        except AttributeError:
+            pass
+        try:
+            del self._cache
+        except AttributeError:
+            pass
+
+    def _set_vector(self, vector: tuple) -> None:
+        self._vector = vector
+        self._clear_cache()
+
+    def _set_val_shift(self, val_shift: int) -> None:
+        self._val_shift = val_shift
+        self._clear_cache()
+
+    def share_vector(self) -> "Monzo":
+        """Use the same exponent vector as all other Monzos with equal exponents.
+
+        Sharing costs a dictionary lookup, therefore it's only worth it
+        for objects that live long, like the degrees of a scale. Pitches
+        made with r and m and the degrees of a JIScale share their vectors,
+        while other constructors and results of arithmetic operations don't,
+        unless share_vector gets called for them. Return the object itself.
+        """
+        self._shared_vector = _share_vector(self._vector)
+        self._vector = self._shared_vector.vector
+        return self
+
     @classmethod
     def from_ratio(
         cls, num: int, den: int, val_border: int = 1, multiply: float = None
     ) -> Type["Monzo"]:
         if multiply is None:
             multiply = CONCERT_PITCH
-        obj = cls(cls.ratio2monzo(Fraction(num, den), cls._val_shift))
+        obj = cls(cls.ratio2monzo(Fraction(num, den)))
         obj.val_border = val_border
         obj.multiply = multiply
         return obj
@@ -459,6 +610,16 @@ class Monzo(object):
         1.5625
         """
 
+        log2_val = Monzo.log2_val(len(_val))[_val_shift:]
+        height = sum(abs(e) * log2 for e, log2 in zip(monzo, log2_val))
+        if height > Monzo._float_precision:
+            # numerator and denominator would be bigger than the mantissa of a
+            # float, therefore it's cheaper to avoid the integer arithmetic
+            try:
+                return 2 ** Monzo.monzo2log2(monzo, _val_shift)
+            except OverflowError:
+                pass
+
         if _val_shift > 0:
             val_border = _val_shift - 1
             try:
@@ -474,6 +635,49 @@ class Monzo(object):
             calc = num // den
         return Monzo.adjust_float(calc, val_border)
 
+    @staticmethod
+    def monzo2log2(monzo: tuple, _val_shift: int) -> float:
+        r"""Transform a Monzo to the binary logarithm of its ratio.
+
+        Unlike Monzo.monzo2ratio this function never builds the numerator
+        and denominator of the ratio. The result is the dot product of
+        the Monzo with the binary logarithm of its val, therefore it can't
+        overflow even for very big exponents or primes.
+
+        Arguments are:
+            * Monzo -> The exponents of prime numbers
+            * _val-shift -> how many prime numbers shall be skipped
+                            (see Monzo._val_shift)
+        >>> myMonzo0 = (-1, 1)
+        >>> myMonzo1 = (2,)
+        >>> Monzo.monzo2log2(myMonzo0, 0)
+        0.5849625007211561
+        >>> Monzo.monzo2log2(myMonzo1, 1)
+        0.16992500144231215
+        """
+
+        log2_val = Monzo.log2_val(len(monzo) + _val_shift)
+        log2_ratio = sum(e * log2 for e, log2 in zip(monzo, log2_val[_val_shift:]))
+        if _val_shift > 0:
+            log2_ratio %= log2_val[_val_shift - 1]
+        return log2_ratio
+
+    @staticmethod
+    def monzo2cents(monzo: tuple, _val_shift: int) -> float:
+        r"""Transform a Monzo to its size in cents.
+
+        Arguments are:
+            * Monzo -> The exponents of prime numbers
+            * _val-shift -> how many prime numbers shall be skipped
+                            (see Monzo._val_shift)
+        >>> Monzo.monzo2cents((-1, 1), 0)
+        701.9550008653873
+        >>> Monzo.monzo2cents((0, 1), 1)
+        386.3137138648346
+        """
+
+        return 1200 * Monzo.monzo2log2(monzo, _val_shift)
+
     @staticmethod
     def ratio2monzo(ratio: Fraction, val_shift=0) -> Type["Monzo"]:
         r"""Transform a Fraction - Object to a Monzo.
@@ -498,20 +702,17 @@ class Monzo(object):
         (-1, 0, 1)
         """
 
-        gen_pos = prime_factors.factors(ratio.numerator)
-        gen_neg = prime_factors.factors(ratio.denominator)
-
-        factorised_num = prime_factors.factorise(ratio.numerator)
-        factorised_den = prime_factors.factorise(ratio.denominator)
+        factorised_num = tuple(prime_factors.factors(ratio.numerator))
+        factorised_den = tuple(prime_factors.factors(ratio.denominator))
 
-        biggest_prime = max(factorised_num + factorised_den)
+        biggest_prime = max(p for p, _ in factorised_num + factorised_den)
         monzo = [0] * Monzo.count_primes(biggest_prime)
 
-        for num, fac in gen_pos:
+        for num, fac in factorised_num:
             if num > 1:
                 monzo[Monzo.count_primes(num) - 1] += fac
 
-        for num, fac in gen_neg:
+        for num, fac in factorised_den:
             if num > 1:
                 monzo[Monzo.count_primes(num) - 1] -= fac
 
@@ -562,190 +763,78 @@ class Monzo(object):
 
     @staticmethod
     def nth_prime(arg):
-        r"""Find the nth - prime.
+        r"""Find the nth - prime (counting from 0).
 
-        More efficient version than primesieve.nth_primes,
-        since it uses saved Primes for n < 50.
+        The prime gets looked up in the lazily growing
+        prime table of mu.utils.prime_factors.
 
         Arguments:
             * n -> number, which Prime shall be found
 
         >>> Monzo.nth_prime(3)
-        5
+        7
         >>> Monzo.nth_prime(10)
-        29
+        31
         """
 
-        try:
-            primes = (
-                2,
-                3,
-                5,
-                7,
-                11,
-                13,
-                17,
-                19,
-                23,
-                29,
-                31,
-                37,
-                41,
-                43,
-                47,
-                53,
-                59,
-                61,
-                67,
-                71,
-                73,
-                79,
-                83,
-                89,
-                97,
-                101,
-                103,
-                107,
-                109,
-                113,
-                127,
-                131,
-                137,
-                139,
-                149,
-                151,
-                157,
-                163,
-                167,
-                173,
-                179,
-                181,
-                191,
-                193,
-                197,
-                199,
-                211,
-                223,
-                227,
-                229,
-            )
-            return primes[arg]
-        except IndexError:
-            return primesieve.nth_prime(arg)
+        if type(arg) == slice:
+            return Monzo.n_primes(arg.stop)[arg]
+        return prime_factors.PRIME_TABLE.nth_prime(arg)
 
     @staticmethod
     def n_primes(arg):
         r"""List the first n - primes.
 
-        More efficient version than primesieve.n_primes,
-        since it uses saved Primes for n < 50.
+        The primes get looked up in the lazily growing
+        prime table of mu.utils.prime_factors.
 
         Arguments:
-            * n -> number, which Prime shall be found
+            * n -> how many primes shall be returned
 
-        >>> Monzo.nth_prime(3)
+        >>> Monzo.n_primes(3)
         (2, 3, 5)
-        >>> Monzo.nth_prime(10)
+        >>> Monzo.n_primes(10)
         (2, 3, 5, 7, 11, 13, 17, 19, 23, 29)
         """
 
-        if arg <= 50:
-            return Monzo.nth_prime(slice(0, arg))
-        else:
-            return primesieve.n_primes(arg)
+        return prime_factors.PRIME_TABLE.n_primes(arg)
 
     @staticmethod
     def count_primes(arg):
-        r"""Count prime numbers.
+        r"""Count prime numbers that are smaller or equal than n.
 
-        More efficient version than primesieve.count_primes,
-        since it uses saved Primes for n < 70.
+        The amount gets looked up in the lazily growing
+        prime table of mu.utils.prime_factors.
 
         Arguments:
-            * n -> number, which Prime shall be found
+            * n -> number, until which primes shall be counted
 
-        >>> Monzo.nth_prime(3)
-        (2, 3, 5)
-        >>> Monzo.nth_prime(10)
-        (2, 3, 5, 7, 11, 13, 17, 19, 23, 29)
+        >>> Monzo.count_primes(3)
+        2
+        >>> Monzo.count_primes(10)
+        4
         """
 
-        if arg <= 70:
-            data = (
-                0,
-                0,
-                1,
-                2,
-                2,
-                3,
-                3,
-                4,
-                4,
-                4,
-                4,
-                5,
-                5,
-                6,
-                6,
-                6,
-                6,
-                7,
-                7,
-                8,
-                8,
-                8,
-                8,
-                9,
-                9,
-                9,
-                9,
-                9,
-                9,
-                10,
-                10,
-                11,
-                11,
-                11,
-                11,
-                11,
-                11,
-                12,
-                12,
-                12,
-                12,
-                13,
-                13,
-                14,
-                14,
-                14,
-                14,
-                15,
-                15,
-                15,
-                15,
-                15,
-                15,
-                16,
-                16,
-                16,
-                16,
-                16,
-                16,
-                17,
-                17,
-                18,
-                18,
-                18,
-                18,
-                18,
-                18,
-                19,
-                19,
-                19,
-            )
-            return data[arg]
-        else:
-            return primesieve.count_primes(arg)
+        return prime_factors.PRIME_TABLE.count_primes(arg)
+
+    @staticmethod
+    def log2_val(arg: int) -> tuple:
+        r"""Return the binary logarithm of the first n - primes.
+
+        The logarithms are saved in a module-level table, which
+        only grows when more primes are requested than ever before.
+
+        Arguments:
+            * n -> how many logarithms shall be returned
+
+        >>> Monzo.log2_val(3)
+        (1.0, 1.584962500721156, 2.321928094887362)
+        """
+
+        n_known = len(_LOG2_PRIMES)
+        if arg > n_known:
+            _LOG2_PRIMES.extend(math.log2(p) for p in Monzo.n_primes(arg)[n_known:])
+        return tuple(_LOG2_PRIMES[:arg])
 
     @staticmethod
     def indigestibility(num: int) -> float:
@@ -861,7 +950,7 @@ class Monzo(object):
 
     @val_border.setter
     def val_border(self, v: int):
-        self._val_shift = Monzo.count_primes(v)
+        self._set_val_shift(Monzo.count_primes(v))
 
     def set_val_border(self, val_border: int) -> Type["Monzo"]:
         """Return a copied version of the Monzo / JIPitch -Object with a new val_border.
@@ -884,6 +973,7 @@ class Monzo(object):
         return copied
 
     @property
+    @_cached_derived_value
     def factorised(self) -> tuple:
         """Return factorised / decomposed version of itsef.
 
@@ -903,6 +993,7 @@ class Monzo(object):
         return tuple(functools.reduce(operator.add, decomposed))
 
     @property
+    @_cached_derived_value
     def factorised_numerator_and_denominator(self) -> tuple:
         vec = self._vec
         val = self.val
@@ -920,6 +1011,7 @@ class Monzo(object):
         )
 
     @property
+    @_cached_derived_value
     def blueprint(self, ignore: tuple = (2,)) -> tuple:
         blueprint = []
         for factorised in self.factorised_numerator_and_denominator:
@@ -933,6 +1025,7 @@ class Monzo(object):
         return tuple(blueprint)
 
     @property
+    @_cached_derived_value
     def ratio(self) -> Fraction:
         """Return the Monzo transformed to a Ratio (Fraction-Object).
 
@@ -991,6 +1084,7 @@ class Monzo(object):
         return denominator
 
     @property
+    @_cached_derived_value
     def float(self) -> float:
         """Return the float of a Monzo or JIPitch - object.
 
@@ -1008,8 +1102,9 @@ class Monzo(object):
         return Monzo.monzo2float(self, self._val, self._val_shift)
 
     @property
+    @_cached_derived_value
     def cents(self) -> float:
-        return self.ratio2ct(self.ratio)
+        return Monzo.monzo2cents(self._vec, self._val_shift)
 
     def __float__(self) -> float:
         return float(self.float)
@@ -1030,7 +1125,7 @@ class Monzo(object):
         v_shift = self._val_shift
         new = self.copy()
         if v_shift > 0:
-            new._vector = (0,) * v_shift + self._vec
+            new._set_vector((0,) * v_shift + self._vec)
         return new
 
     def adjust_register(
@@ -1071,7 +1166,7 @@ class Monzo(object):
             id_num, id_den = ratio.numerator, ratio.denominator
         else:
             identity_simplified = identity_pitch.simplify()
-            identity_simplified._val_shift = 0
+            identity_simplified._set_val_shift(0)
             id_num = identity_simplified.numerator
             id_den = identity_simplified.denominator
             while id_num * v_border < id_den:
@@ -1407,6 +1502,7 @@ class Monzo(object):
         return math.log(num * de, 2)
 
     @property
+    @_cached_derived_value
     def lv(self) -> int:
         if self.val:
             return abs(Monzo.gcd(*tuple(filter(lambda x: x != 0, self))))
@@ -1415,6 +1511,12 @@ class Monzo(object):
 
     @property
     def identity(self) -> Type["Monzo"]:
+        # the cached identity is copied, since Monzo - objects are mutable
+        return self._identity.copy()
+
+    @property
+    @_cached_derived_value
+    def _identity(self) -> Type["Monzo"]:
         if self._val:
             val_border = self.val_border
             filtered = type(self)([1 / self.lv] * len(self), val_border)
@@ -1674,7 +1776,7 @@ class Monzo(object):
 
 
 class JIPitch(Monzo, abstract.AbstractPitch):
-    multiply = 1
+    __slots__ = ()
 
     def __init__(self, iterable, val_border: int = 1, multiply: float = None):
         if multiply is None:
@@ -1726,6 +1828,7 @@ class JIPitch(Monzo, abstract.AbstractPitch):
             Monzo.__pow__(self, val), self.val_border, multiply=self.multiply
         )
 
+    @_cached_derived_value
     def __hash__(self):
         return hash(self._vec)
         # return abstract.AbstractPitch.__hash__(self)
@@ -1780,139 +1883,816 @@ class JIPitch(Monzo, abstract.AbstractPitch):
                 return mel.EmptyPitch()
 
 
-class JIContainer(object):
-    def __init__(self, iterable, multiply=260):
-        super(type(self), self).__init__(iterable)
+class MonzoArray(object):
+    r"""A MonzoArray stores many Monzo - or JIPitch - objects in one numpy array.
+
+    Every row of the underlying two dimensional integer array
+    contains the exponents of one Monzo. Shorter vectors are padded
+    with zeros. All rows share the same val and the same val_border,
+    therefore calculations like addition or subtraction are
+    done for all Monzos at once, without initialising a new
+    Monzo - object for every element.
+
+    If the passed Monzos have different val_border - properties, a
+    val_border has to be passed explicitly. Tuples of exponents
+    get interpreted like the first argument of the Monzo - class.
+
+    >>> ma = MonzoArray((r(3, 2), r(5, 4), r(7, 4)))
+    >>> ma.ratio
+    (Fraction(3, 2), Fraction(5, 4), Fraction(7, 4))
+    >>> (ma + r(3, 2)).ratio
+    (Fraction(9, 4), Fraction(15, 8), Fraction(21, 8))
+    >>> ma.cents
+    array([701.95500087, 386.31371386, 968.82590647])
+    """
+
+    _harmonicity_metrics = (
+        "barlow",
+        "simplified_barlow",
+        "euler",
+        "tenney",
+        "wilson",
+        "vogel",
+    )
+
+    def __init__(
+        self, iterable=tuple([]), val_border: int = None, multiply: float = None
+    ) -> None:
+        items = tuple(iterable)
+        monzos = tuple(item for item in items if isinstance(item, Monzo))
+
+        if val_border is None:
+            shifts = set(m._val_shift for m in monzos)
+            if len(shifts) > 1:
+                msg = "Monzos with different val_borders can't be combined "
+                msg += "to one MonzoArray without passing a val_border."
+                raise ValueError(msg)
+            elif shifts:
+                val_shift = shifts.pop()
+            else:
+                val_shift = 0
+        else:
+            val_shift = Monzo.count_primes(val_border)
+
+        if monzos:
+            pitch_class = type(monzos[0])
+        else:
+            pitch_class = Monzo
+
+        if multiply is None:
+            if monzos:
+                multiply = getattr(monzos[0], "multiply", CONCERT_PITCH)
+            else:
+                multiply = CONCERT_PITCH
+
+        rows = tuple(
+            item._vector if isinstance(item, Monzo) else (0,) * val_shift + tuple(item)
+            for item in items
+        )
+
+        self._matrix = MonzoArray._trim(MonzoArray._mk_matrix(rows))
+        self._val_shift = val_shift
+        self._pitch_class = pitch_class
         self.multiply = multiply
-        self._val_border = 1
+
+    @classmethod
+    def _from_matrix(
+        cls, matrix: np.ndarray, val_shift: int, pitch_class: type, multiply: float
+    ) -> "MonzoArray":
+        obj = cls.__new__(cls)
+        obj._matrix = cls._trim(matrix)
+        obj._val_shift = val_shift
+        obj._pitch_class = pitch_class
+        obj.multiply = multiply
+        return obj
 
     @staticmethod
-    def from_str(cls, string: str) -> "JIContainer":
-        ratios = string.split(", ")
-        return cls(JIPitch.from_str(r) for r in ratios)
+    def _mk_matrix(rows: tuple) -> np.ndarray:
+        r"""Convert vectors with different lengths to one zero-padded matrix.
 
-    @classmethod
-    def from_scl(cls, name: str) -> "JIContainer":
-        """Generating JIContainer from the scl file format.
+        >>> MonzoArray._mk_matrix(((1, 2), (3,)))
+        array([[1, 2],
+               [3, 0]])
+        """
 
-        See: http://huygens-fokker.org/scala/scl_format.html
+        width = max((len(row) for row in rows), default=0)
+        padded = [tuple(row) + (0,) * (width - len(row)) for row in rows]
+        return np.array(padded, dtype=np.int64).reshape((len(rows), width))
+
+    @staticmethod
+    def _pad(matrix: np.ndarray, width: int) -> np.ndarray:
+        difference = width - matrix.shape[1]
+        if difference > 0:
+            return np.pad(matrix, ((0, 0), (0, difference)), "constant")
+        return matrix
+
+    @staticmethod
+    def _trim(matrix: np.ndarray) -> np.ndarray:
+        """Discard all columns after the last column that contains a not 0 - element.
+
+        This is the MonzoArray - equivalent to Monzo.discard_nulls.
         """
 
-        def convert2pitch(scl_line: str) -> JIPitch:
-            p = scl_line.split(" ")[0]
-            if p[-1] == ".":
-                msg = "Can't translate cent values to JIPitch"
-                raise NotImplementedError(msg)
-            else:
-                ratio = p.split("/")
-                ratio_size = len(ratio)
-                if ratio_size == 2:
-                    num, den = tuple(int(n) for n in ratio)
-                elif ratio_size == 1:
-                    num = int(ratio[0])
-                    den = 1
-                else:
-                    msg = "Can't read ratio {0}.".format(ratio)
-                    raise NotImplementedError(msg)
+        used_columns = np.flatnonzero(matrix.any(axis=0))
+        if used_columns.size:
+            return matrix[:, : used_columns[-1] + 1]
+        return matrix[:, :0]
 
-                try:
-                    assert num > den
-                except AssertionError:
-                    msg = "ERROR: Invalide ratio {0}. ".format(ratio)
-                    msg += "Ratios have to be positiv (numerator "
-                    msg += "has to be bigger than denominator)."
-                    raise ValueError(msg)
+    def _mk_element(self, vector: tuple) -> Monzo:
+        element = self._pitch_class._from_vector(vector, self._val_shift)
+        if issubclass(self._pitch_class, JIPitch):
+            element.multiply = self.multiply
+        return element
 
-                return r(num, den)
+    def _vectors(self) -> tuple:
+        """Return the rows of the MonzoArray as tuples without trailing zeros."""
+        matrix = self._matrix
+        nonzero = matrix != 0
+        lengths = matrix.shape[1] - np.argmax(nonzero[:, ::-1], axis=1)
+        lengths[~nonzero.any(axis=1)] = 0
+        return tuple(
+            tuple(row[:length])
+            for row, length in zip(matrix.tolist(), lengths.tolist())
+        )
 
-        with open(name, "r") as f:
-            lines = f.read().splitlines()
-            # deleting comments
-            lines = tuple(line for line in lines if line and line[0] != "!")
-            description = lines[0]
-            pitches = lines[2:]
-            estimated_amount_pitches = int(lines[1])
-            real_amount_pitches = len(pitches)
+    def __len__(self) -> int:
+        return self._matrix.shape[0]
 
-            try:
-                assert estimated_amount_pitches == real_amount_pitches
-            except AssertionError:
-                msg = "'{}' contains {} pitches ".format(
-                    description, real_amount_pitches
-                )
-                msg += "while {} pitches are expected.".format(estimated_amount_pitches)
-                raise ValueError(msg)
+    def __iter__(self):
+        return (self._mk_element(vector) for vector in self._vectors())
 
-        return cls((r(1, 1),) + tuple(convert2pitch(p) for p in pitches))
+    def __getitem__(self, idx):
+        if isinstance(idx, (int, np.integer)):
+            return self._mk_element(Monzo.discard_nulls(self._matrix[idx].tolist()))
+        else:
+            return self._from_matrix(
+                self._matrix[idx], self._val_shift, self._pitch_class, self.multiply
+            )
+
+    def __repr__(self) -> str:
+        return "MonzoArray({0})".format(tuple(self))
+
+    def copy(self) -> "MonzoArray":
+        return self._from_matrix(
+            self._matrix.copy(), self._val_shift, self._pitch_class, self.multiply
+        )
 
     @property
-    def val_border(self) -> int:
-        i = 0
-        v = None
-        while v is None:
-            try:
-                v = self[i].val_border
-            except AttributeError:
-                i += 1
-            except IndexError:
-                v = 1
-        return v
+    def _vec(self) -> np.ndarray:
+        return self._matrix[:, self._val_shift :]
 
-    @val_border.setter
-    def val_border(self, arg: int) -> None:
-        self._val_border = arg
-        shift_val = Monzo.count_primes(arg)
-        for f in self:
-            f._val_shift = shift_val
+    @property
+    def _val(self) -> tuple:
+        return tuple(Monzo.n_primes(self._matrix.shape[1]))
 
-    @classmethod
-    def mk_line(cls, reference, count):
-        return cls([reference.scalar(i + 1) for i in range(count)])
+    @property
+    def val(self) -> tuple:
+        return self._val[self._val_shift :]
 
     @property
-    def avg_gender(self):
-        if self:
-            return sum(map(lambda b: 1 if b is True else -1, self.gender)) / len(self)
+    def val_border(self) -> int:
+        if self._val_shift == 0:
+            return 1
         else:
-            return 0
+            return Monzo.nth_prime(self._val_shift - 1)
 
-    @property
-    def avg_lv(self):
-        if self:
-            return sum(p.lv for p in self) / len(self)
+    @val_border.setter
+    def val_border(self, v: int) -> None:
+        self._val_shift = Monzo.count_primes(v)
+
+    def __math(self, other, operation) -> "MonzoArray":
+        if isinstance(other, Monzo):
+            other_matrix = MonzoArray._mk_matrix((other._vector,))
         else:
-            return 0
+            other_matrix = other._matrix
 
-    @staticmethod
-    def from_json(cls, data):
-        iterable = data[0]
-        multiply = data[1]
-        obj = cls(tuple(JIPitch.from_json(p) for p in iterable))
-        obj.multiply = multiply
-        return obj
+        if other._val_shift != self._val_shift:
+            msg = "Can't calculate with objects that have different val_borders."
+            raise ValueError(msg)
 
-    def convert2json(self):
-        return json.dumps(
-            (tuple((p._vec, p.val_border, p.multiply) for p in self), self.multiply)
+        width = max((self._matrix.shape[1], other_matrix.shape[1]))
+        result = operation(
+            MonzoArray._pad(self._matrix, width), MonzoArray._pad(other_matrix, width)
+        )
+        result[:, : self._val_shift] = 0
+        return self._from_matrix(
+            result, self._val_shift, self._pitch_class, self.multiply
         )
 
-    @staticmethod
-    def load_json(cls, name: str):
-        with open(name, "r") as f:
-            encoded = json.loads(f.read())
-        return cls.from_json(encoded)
+    def __add__(self, other) -> "MonzoArray":
+        return self.__math(other, operator.add)
 
-    def export2json(self, name: str):
-        with open(name, "w") as f:
-            f.write(self.convert2json())
+    def __sub__(self, other) -> "MonzoArray":
+        return self.__math(other, operator.sub)
 
-    def set_multiply(self, arg: float):
-        """Set the multiply - argument of every containing pitch - element."""
-        for p in self:
-            if p is not None:
-                p.multiply = arg
+    def scalar(self, factor: int) -> "MonzoArray":
+        """Return the scalar-product of every Monzo and the (integer) factor."""
+        if int(factor) != factor:
+            raise ValueError("MonzoArray can only be multiplied with integer.")
+        result = self._matrix * int(factor)
+        result[:, : self._val_shift] = 0
+        return self._from_matrix(
+            result, self._val_shift, self._pitch_class, self.multiply
+        )
 
-    def set_muliplied_multiply(self, arg: float):
+    def inverse(self) -> "MonzoArray":
+        result = -self._matrix
+        result[:, : self._val_shift] = 0
+        return self._from_matrix(
+            result, self._val_shift, self._pitch_class, self.multiply
+        )
+
+    def pairs(self, operation: Callable = operator.sub, ordered=False) -> "MonzoArray":
+        r"""Apply operation on the exponents of every pair of two different rows.
+
+        If ordered is False, the pairs are equal to itertools.combinations(self, 2),
+        otherwise they are equal to itertools.permutations(self, 2).
+
+        >>> MonzoArray((r(3, 2), r(5, 4), r(7, 4))).pairs(operator.sub).ratio
+        (Fraction(6, 5), Fraction(6, 7), Fraction(5, 7))
+        """
+
+        n_rows = len(self)
+        if ordered:
+            idx0, idx1 = np.nonzero(~np.eye(n_rows, dtype=bool))
+        else:
+            idx0, idx1 = np.triu_indices(n_rows, k=1)
+        result = operation(self._matrix[idx0], self._matrix[idx1])
+        result[:, : self._val_shift] = 0
+        return self._from_matrix(
+            result, self._val_shift, self._pitch_class, self.multiply
+        )
+
+    def unique(self) -> "MonzoArray":
+        """Return a MonzoArray without duplicate rows (in order of first occurrence).
+
+        Exponents of primes that are ignored because of the val_border
+        are not considered.
+        """
+
+        vec = self._vec
+        if vec.shape[1] == 0:
+            return self[: min((len(self), 1))]
+        first_occurrences = np.unique(vec, axis=0, return_index=True)[1]
+        return self[np.sort(first_occurrences)]
+
+    @property
+    def _log2(self) -> np.ndarray:
+        """Return the binary logarithm of every (val_border - adjusted) ratio."""
+        log2_val = np.array(Monzo.log2_val(self._matrix.shape[1]))
+        log2_val = log2_val[self._val_shift :]
+        log2_ratio = self._vec.dot(log2_val)
+        val_border = self.val_border
+        if val_border > 1:
+            log2_ratio = np.mod(log2_ratio, math.log2(val_border))
+        return log2_ratio
+
+    @property
+    def ratio(self) -> tuple:
+        _val = self._val
+        return tuple(
+            Monzo.monzo2ratio(tuple(int(e) for e in row), _val, self._val_shift)
+            for row in self._vec
+        )
+
+    @property
+    def float(self) -> np.ndarray:
+        return np.exp2(self._log2)
+
+    @property
+    def cents(self) -> np.ndarray:
+        return self._log2 * 1200
+
+    @property
+    def freq(self) -> np.ndarray:
+        return self.float * self.multiply
+
+    @property
+    def _adjusted(self) -> tuple:
+        """Return exponents and primes of every ratio like Monzo.adjust_monzo.
+
+        If the val_border is bigger than 1 the first column contains the
+        exponents of the val_border. Rows of unisons are 0.
+        """
+
+        vec = self._vec
+        val = np.array(self.val, dtype=np.int64)
+        val_border = self.val_border
+        if val_border > 1:
+            log_val_border = math.log(val_border)
+            res = (log_val_border - vec.dot(np.log(val))) / log_val_border
+            res = np.where(res < 0, res - 1, res).astype(np.int64)
+            res[~vec.any(axis=1)] = 0
+            vec = np.column_stack((res, vec))
+            val = np.concatenate(((val_border,), val))
+        return vec, val
+
+    def _harmonicity_wilson(self) -> np.ndarray:
+        vec, val = self._adjusted
+        unison = ~vec.any(axis=1)
+        return np.abs(vec).dot(np.where(val == 2, 0, val)) + unison
+
+    def _harmonicity_vogel(self) -> np.ndarray:
+        vec, val = self._adjusted
+        unison = ~vec.any(axis=1)
+        return np.abs(vec).dot(np.where(val == 2, 1, val)) + unison
+
+    def _harmonicity_euler(self) -> np.ndarray:
+        vec, val = self._adjusted
+        return np.abs(vec).dot(val - 1) + 1
+
+    def _harmonicity_barlow(self) -> np.ndarray:
+        vec, val = self._adjusted
+        # indigestibility of every prime
+        weights = 2 * ((val - 1) ** 2) / val
+        ind_num = np.clip(vec, 0, None).dot(weights)
+        ind_den = np.clip(-vec, 0, None).dot(weights)
+        sign = np.where(ind_num < ind_den, -1, 1)
+        with np.errstate(divide="ignore"):
+            return sign / (ind_num + ind_den)
+
+    def _harmonicity_simplified_barlow(self) -> np.ndarray:
+        barlow = np.abs(self._harmonicity_barlow())
+        barlow[np.isinf(barlow)] = 1
+        return barlow
+
+    def _harmonicity_tenney(self) -> np.ndarray:
+        vec, val = self._adjusted
+        return np.abs(vec).dot(np.log2(val))
+
+    def harmonicity(self, metric: str = "barlow") -> np.ndarray:
+        r"""Return the harmonicity of every Monzo.
+
+        Equals the harmonicity_METRIC - properties of Monzo - objects.
+        Available metrics are 'barlow', 'simplified_barlow', 'euler',
+        'tenney', 'wilson' and 'vogel'.
+
+        >>> ma = MonzoArray((r(3, 2), r(5, 4), r(1, 1)))
+        >>> ma.harmonicity("euler")
+        array([4, 7, 1])
+        >>> ma.harmonicity("barlow")
+        array([0.27272727, 0.11904762,        inf])
+        """
+
+        try:
+            calculate = getattr(self, "_harmonicity_{0}".format(metric))
+        except AttributeError:
+            msg = "Unknown harmonicity metric '{0}'. ".format(metric)
+            msg += "Available metrics are: {0}.".format(
+                ", ".join(MonzoArray._harmonicity_metrics)
+            )
+            raise ValueError(msg)
+        return calculate()
+
+    def _ratio_matrix(self) -> np.ndarray:
+        """Return the exponents of every (val_border - adjusted) ratio.
+
+        The resulting matrix contains the exponents of all primes, including
+        the exponents of the val_border, which are calculated like in
+        MonzoArray._adjusted.
+        """
+
+        val_shift = self._val_shift
+        matrix = MonzoArray._pad(self._matrix, val_shift).copy()
+        matrix[:, :val_shift] = 0
+        if val_shift:
+            matrix[:, val_shift - 1] = self._adjusted[0][:, 0]
+        return matrix
+
+    def normalize(self, prime: int = 2) -> "MonzoArray":
+        r"""Move every ratio between 1 and prime.
+
+        Equals Monzo.normalize for every element. The resulting
+        MonzoArray has a val_border of 1.
+
+        >>> MonzoArray((r(3, 1), r(5, 16), r(1, 1))).normalize().ratio
+        (Fraction(3, 2), Fraction(5, 4), Fraction(1, 1))
+        """
+
+        if not prime_factors.is_prime(prime):
+            msg = "MonzoArray can only be normalized by prime numbers."
+            raise ValueError(msg)
+
+        column = Monzo.count_primes(prime) - 1
+        matrix = MonzoArray._pad(self._ratio_matrix(), column + 1)
+        matrix[:, column] = 0
+        log2_val = np.array(Monzo.log2_val(matrix.shape[1]))
+        matrix[:, column] = -np.floor(matrix.dot(log2_val) / log2_val[column])
+        return self._from_matrix(matrix, 0, self._pitch_class, self.multiply)
+
+    def register(self, octave: int) -> "MonzoArray":
+        r"""Move every ratio to the octave.
+
+        Equals Monzo.register for every element.
+
+        >>> MonzoArray((r(3, 1), r(5, 16))).register(1).ratio
+        (Fraction(3, 1), Fraction(5, 2))
+        """
+
+        matrix = MonzoArray._pad(self.normalize()._matrix, 1)
+        matrix[:, 0] += octave
+        return self._from_matrix(matrix, 0, self._pitch_class, self.multiply)
+
+    def move_to_closest_register(self, reference: Monzo) -> "MonzoArray":
+        r"""Move every ratio to the octave, where it is closest to the reference.
+
+        Equals Monzo.move_to_closest_register for every element. The
+        reference needs a val_border of 1.
+
+        >>> MonzoArray((r(3, 1), r(5, 16))).move_to_closest_register(r(2, 1)).ratio
+        (Fraction(3, 2), Fraction(5, 2))
+        """
+
+        if reference._val_shift != 0:
+            msg = "Can't calculate with objects that have different val_borders."
+            raise ValueError(msg)
+
+        normalized = self.normalize()
+        octave = reference.octave
+        adaptions = np.arange(-1, 2)
+        distances = np.abs(
+            normalized._log2[:, np.newaxis]
+            + (octave + adaptions)
+            - reference.cents / 1200
+        )
+        # equally close registers resolve to the higher one (like in the Monzo - method)
+        best = adaptions[::-1][np.argmin(distances[:, ::-1], axis=1)]
+        matrix = MonzoArray._pad(normalized._matrix, 1)
+        matrix[:, 0] += octave + best
+        return self._from_matrix(matrix, 0, self._pitch_class, self.multiply)
+
+
+class HarmonicityTable(object):
+    r"""Precomputed harmonicity, cents and monzo of every ratio in a bounded space.
+
+    The ratio space is an exponent box: every prime of the primes - argument
+    can have an exponent between -max_exponent and max_exponent. Ratios whose
+    odd limit is bigger than odd_limit are marked as invalid. The val_border
+    is applied like for Monzo - objects, hence all primes have to be bigger
+    than the val_border.
+
+    Rows are saved in the mixed radix order of their exponents. Therefore
+    the row of any monzo can be calculated in O(1) without searching.
+    Tables can be saved to disk and loaded again as a read-only memory
+    map, which can be shared between different processes.
+
+    >>> table = HarmonicityTable.build(primes=(3, 5, 7), max_exponent=2)
+    >>> table.get_ratio(7, 6)["barlow"]
+    0.07167235494880546
+    >>> table.get_monzo(r(5, 4))["euler"]
+    7
+    """
+
+    fields = ("barlow", "euler", "tenney", "cents")
+
+    def __init__(
+        self,
+        table: np.ndarray,
+        primes: tuple,
+        max_exponent: int,
+        val_border: int = 2,
+        odd_limit: int = None,
+    ) -> None:
+        self._table = table
+        self._primes = tuple(primes)
+        self._max_exponent = max_exponent
+        self._val_border = val_border
+        self._odd_limit = odd_limit
+        self._val_shift = Monzo.count_primes(val_border)
+        self._columns = tuple(Monzo.count_primes(p) - 1 for p in self._primes)
+        self._radix = 2 * max_exponent + 1
+
+    def __repr__(self) -> str:
+        return "HarmonicityTable(primes={0}, max_exponent={1})".format(
+            self.primes, self.max_exponent
+        )
+
+    def __len__(self) -> int:
+        return int(np.count_nonzero(self._table["valid"]))
+
+    @property
+    def primes(self) -> tuple:
+        return self._primes
+
+    @property
+    def max_exponent(self) -> int:
+        return self._max_exponent
+
+    @property
+    def val_border(self) -> int:
+        return self._val_border
+
+    @property
+    def odd_limit(self) -> int:
+        return self._odd_limit
+
+    @property
+    def table(self) -> np.ndarray:
+        """The structured array that contains all rows (including invalid ones)."""
+        return self._table
+
+    @staticmethod
+    def mk_dtype(n_primes: int) -> np.dtype:
+        return np.dtype(
+            [
+                ("numerator", np.int64),
+                ("denominator", np.int64),
+                ("monzo", np.int8, (n_primes,)),
+                ("barlow", np.float64),
+                ("euler", np.int64),
+                ("tenney", np.float64),
+                ("cents", np.float64),
+                ("valid", np.bool_),
+            ]
+        )
+
+    @classmethod
+    def build(
+        cls,
+        primes: tuple = (3, 5, 7),
+        max_exponent: int = 2,
+        val_border: int = 2,
+        odd_limit: int = None,
+    ) -> "HarmonicityTable":
+        """Calculate the table for every ratio within the exponent box."""
+        primes = tuple(primes)
+        val_shift = Monzo.count_primes(val_border)
+        for prime in primes:
+            if not prime_factors.is_prime(prime) or prime <= val_border:
+                msg = "Every element of primes has to be a prime number that is "
+                msg += "bigger than the val_border {0}.".format(val_border)
+                raise ValueError(msg)
+
+        # numerator and denominator are saved as 64 bit integers
+        log2_size = max_exponent * sum(math.log2(p) for p in primes)
+        if log2_size + math.log2(max((val_border, 2))) >= 63:
+            raise ValueError("The exponent box is too big for 64 bit integers.")
+
+        n_primes = len(primes)
+        radix = 2 * max_exponent + 1
+        grid = np.indices((radix,) * n_primes).reshape(n_primes, -1).T
+        grid -= max_exponent
+
+        columns = tuple(Monzo.count_primes(p) - 1 for p in primes)
+        matrix = np.zeros((len(grid), max(columns, default=-1) + 1), dtype=np.int64)
+        matrix[:, columns] = grid
+        monzos = MonzoArray._from_matrix(matrix, val_shift, Monzo, CONCERT_PITCH)
+
+        table = np.zeros(len(grid), dtype=cls.mk_dtype(n_primes))
+        ratios = monzos.ratio
+        table["numerator"] = tuple(ratio.numerator for ratio in ratios)
+        table["denominator"] = tuple(ratio.denominator for ratio in ratios)
+        table["monzo"] = grid
+        for field in ("barlow", "euler", "tenney"):
+            table[field] = monzos.harmonicity(field)
+        table["cents"] = monzos.cents
+
+        if odd_limit is None:
+            table["valid"] = True
+        else:
+
+            def odd(n: int) -> int:
+                while n % 2 == 0:
+                    n //= 2
+                return n
+
+            table["valid"] = tuple(
+                max((odd(ratio.numerator), odd(ratio.denominator))) <= odd_limit
+                for ratio in ratios
+            )
+
+        return cls(table, primes, max_exponent, val_border, odd_limit)
+
+    def save(self, path: str) -> None:
+        """Save the table to path (.npy - format) and its metadata to path.json."""
+        with open(path, "wb") as f:
+            np.save(f, np.asarray(self._table))
+        metadata = {
+            "primes": self.primes,
+            "max_exponent": self.max_exponent,
+            "val_border": self.val_border,
+            "odd_limit": self.odd_limit,
+        }
+        with open("{0}.json".format(path), "w") as f:
+            f.write(json.dumps(metadata))
+
+    @classmethod
+    def load(cls, path: str) -> "HarmonicityTable":
+        """Memory - map a table that has been saved with HarmonicityTable.save."""
+        with open("{0}.json".format(path), "r") as f:
+            metadata = json.loads(f.read())
+        table = np.load(path, mmap_mode="r")
+        return cls(
+            table,
+            tuple(metadata["primes"]),
+            metadata["max_exponent"],
+            metadata["val_border"],
+            metadata["odd_limit"],
+        )
+
+    def _index(self, exponents: tuple) -> int:
+        index = 0
+        for exponent in exponents:
+            if abs(exponent) > self._max_exponent:
+                raise KeyError(exponents)
+            index = index * self._radix + exponent + self._max_exponent
+        return index
+
+    def _row(self, exponents: tuple) -> np.void:
+        row = self._table[self._index(exponents)]
+        if not row["valid"]:
+            raise KeyError(exponents)
+        return row
+
+    def get_monzo(self, monzo) -> np.void:
+        """Return the row of a Monzo - object or of a tuple of exponents.
+
+        Tuples contain one exponent for every prime of the table.
+        Raise KeyError if the monzo isn't part of the table.
+        """
+
+        if not isinstance(monzo, Monzo):
+            if len(monzo) != len(self._primes):
+                raise KeyError(monzo)
+            return self._row(tuple(monzo))
+
+        vector = monzo._vector
+        columns = self._columns
+        ignored = max((self._val_shift, monzo._val_shift))
+        for idx, exponent in enumerate(vector[ignored:], ignored):
+            if exponent and idx not in columns:
+                raise KeyError(monzo)
+        exponents = tuple(
+            vector[column] if column < len(vector) else 0 for column in columns
+        )
+        return self._row(exponents)
+
+    def get_ratio(self, numerator: int, denominator: int) -> np.void:
+        """Return the row of the ratio numerator / denominator.
+
+        Raise KeyError if the ratio isn't part of the table.
+        """
+
+        ratio = Fraction(numerator, denominator)
+        exponents = dict.fromkeys(self._primes, 0)
+        for number, sign in ((ratio.numerator, 1), (ratio.denominator, -1)):
+            for prime, count in prime_factors.factors(number):
+                if prime in exponents:
+                    exponents[prime] += sign * count
+                elif prime > self._val_border:
+                    raise KeyError((numerator, denominator))
+        return self._row(tuple(exponents[prime] for prime in self._primes))
+
+
+class JIContainer(object):
+    def __init__(self, iterable, multiply=260):
+        super(type(self), self).__init__(iterable)
+        self.multiply = multiply
+        self._val_border = 1
+
+    @staticmethod
+    def from_str(cls, string: str) -> "JIContainer":
+        ratios = string.split(", ")
+        return cls(JIPitch.from_str(r) for r in ratios)
+
+    @classmethod
+    def from_scl(cls, name: str) -> "JIContainer":
+        """Generating JIContainer from the scl file format.
+
+        See: http://huygens-fokker.org/scala/scl_format.html
+        """
+
+        def convert2pitch(scl_line: str) -> JIPitch:
+            p = scl_line.split(" ")[0]
+            if p[-1] == ".":
+                msg = "Can't translate cent values to JIPitch"
+                raise NotImplementedError(msg)
+            else:
+                ratio = p.split("/")
+                ratio_size = len(ratio)
+                if ratio_size == 2:
+                    num, den = tuple(int(n) for n in ratio)
+                elif ratio_size == 1:
+                    num = int(ratio[0])
+                    den = 1
+                else:
+                    msg = "Can't read ratio {0}.".format(ratio)
+                    raise NotImplementedError(msg)
+
+                try:
+                    assert num > den
+                except AssertionError:
+                    msg = "ERROR: Invalide ratio {0}. ".format(ratio)
+                    msg += "Ratios have to be positiv (numerator "
+                    msg += "has to be bigger than denominator)."
+                    raise ValueError(msg)
+
+                return r(num, den)
+
+        with open(name, "r") as f:
+            lines = f.read().splitlines()
+            # deleting comments
+            lines = tuple(line for line in lines if line and line[0] != "!")
+            description = lines[0]
+            pitches = lines[2:]
+            estimated_amount_pitches = int(lines[1])
+            real_amount_pitches = len(pitches)
+
+            try:
+                assert estimated_amount_pitches == real_amount_pitches
+            except AssertionError:
+                msg = "'{}' contains {} pitches ".format(
+                    description, real_amount_pitches
+                )
+                msg += "while {} pitches are expected.".format(estimated_amount_pitches)
+                raise ValueError(msg)
+
+        return cls((r(1, 1),) + tuple(convert2pitch(p) for p in pitches))
+
+    @property
+    def val_border(self) -> int:
+        i = 0
+        v = None
+        while v is None:
+            try:
+                v = self[i].val_border
+            except AttributeError:
+                i += 1
+            except IndexError:
+                v = 1
+        return v
+
+    @val_border.setter
+    def val_border(self, arg: int) -> None:
+        self._val_border = arg
+        shift_val = Monzo.count_primes(arg)
+        for f in self:
+            f._set_val_shift(shift_val)
+
+    @classmethod
+    def mk_line(cls, reference, count):
+        return cls([reference.scalar(i + 1) for i in range(count)])
+
+    @property
+    def cents(self) -> tuple:
+        """Return the cent value of every containing pitch.
+
+        The cent values are calculated at once with a MonzoArray,
+        e.g. in the log domain. Rests return None.
+        """
+
+        pitches = tuple(self)
+        monzos = tuple(p for p in pitches if isinstance(p, Monzo))
+        if len(set(p._val_shift for p in monzos)) > 1:
+            return tuple(p.cents for p in pitches)
+
+        cents = iter(MonzoArray(monzos).cents.tolist())
+        return tuple(next(cents) if isinstance(p, Monzo) else p.cents for p in pitches)
+
+    @property
+    def avg_gender(self):
+        if self:
+            return sum(map(lambda b: 1 if b is True else -1, self.gender)) / len(self)
+        else:
+            return 0
+
+    @property
+    def avg_lv(self):
+        if self:
+            return sum(p.lv for p in self) / len(self)
+        else:
+            return 0
+
+    @staticmethod
+    def from_json(cls, data):
+        iterable = data[0]
+        multiply = data[1]
+        obj = cls(tuple(JIPitch.from_json(p) for p in iterable))
+        obj.multiply = multiply
+        return obj
+
+    def convert2json(self):
+        return json.dumps(
+            (tuple((p._vec, p.val_border, p.multiply) for p in self), self.multiply)
+        )
+
+    @staticmethod
+    def load_json(cls, name: str):
+        with open(name, "r") as f:
+            encoded = json.loads(f.read())
+        return cls.from_json(encoded)
+
+    def export2json(self, name: str):
+        with open(name, "w") as f:
+            f.write(self.convert2json())
+
+    def set_multiply(self, arg: float):
+        """Set the multiply - argument of every containing pitch - element."""
+        for p in self:
+            if p is not None:
+                p.multiply = arg
+
+    def set_muliplied_multiply(self, arg: float):
         """Multiply the multiply-property of every containing pitch with the input."""
         for p in self:
             if p is not None:
@@ -1922,14 +2702,82 @@ class JIContainer(object):
         r = tuple((r, p, round(f, 2)) for r, p, f in zip(self, self.primes, self.freq))
         return tuple(sorted(r, key=lambda t: t[2]))
 
+    def _monzo_array(self) -> MonzoArray:
+        """Return all pitches as one MonzoArray.
+
+        Return None if the container has other elements than JIPitch - objects
+        or if its pitches differ in their val_border or multiply.
+        """
+        return JIContainer._mk_monzo_array(tuple(self))
+
+    @staticmethod
+    def _mk_monzo_array(pitches: tuple) -> MonzoArray:
+        if not all(isinstance(p, JIPitch) for p in pitches):
+            return None
+        if len(set(p._val_shift for p in pitches)) > 1:
+            return None
+        if len(set(p.multiply for p in pitches)) > 1:
+            return None
+        return MonzoArray(pitches)
+
+    def _place_in_register(self, method: str, *args) -> tuple:
+        """Call method with args on every pitch at once (see MonzoArray.register).
+
+        Return None if the pitches can't be combined to one MonzoArray.
+        """
+        monzos = self._monzo_array()
+        if monzos is not None:
+            try:
+                return tuple(getattr(monzos, method)(*args))
+            except ValueError:
+                pass
+        return None
+
+    def normalize(self, prime: int = 2) -> "JIContainer":
+        """Move every pitch between 1 and prime (see Monzo.normalize)."""
+        pitches = self._place_in_register("normalize", prime)
+        if pitches is None:
+            pitches = (p.normalize(prime) for p in self)
+        return type(self)(pitches)
+
+    def register(self, octave: int) -> "JIContainer":
+        """Move every pitch to the octave (see Monzo.register)."""
+        pitches = self._place_in_register("register", octave)
+        if pitches is None:
+            pitches = (p.register(octave) for p in self)
+        return type(self)(pitches)
+
+    def move_to_closest_register(self, reference: JIPitch) -> "JIContainer":
+        """Move every pitch to its register closest to the reference.
+
+        See Monzo.move_to_closest_register. The octaves are calculated with
+        the binary logarithms of all pitches at once.
+
+        >>> JIMel((r(3, 1), r(5, 16))).move_to_closest_register(r(2, 1))
+        [3/2, 5/2]
+        """
+        pitches = self._place_in_register("move_to_closest_register", reference)
+        if pitches is None:
+            pitches = (p.move_to_closest_register(reference) for p in self)
+        return type(self)(pitches)
+
     def dot_sum(self):
         """Return the sum of every dot-product between two Monzos in the Container"""
-        d = 0
-        for m_out in self:
-            for m_in in self:
-                if m_in != m_out:
-                    d += m_out.dot(m_in)
-        return d
+        monzos = self._monzo_array()
+        if monzos is None:
+            d = 0
+            for m_out in self:
+                for m_in in self:
+                    if m_in != m_out:
+                        d += m_out.dot(m_in)
+            return d
+
+        # sum of all dot - products minus the products of equal pitches
+        vec = monzos._vec
+        summed = vec.sum(axis=0)
+        unique, counts = np.unique(vec, axis=0, return_counts=True)
+        equal = ((unique * unique).sum(axis=1) * counts * counts).sum()
+        return int(summed.dot(summed) - equal)
 
     def summed_summed(self):
         summed = self.summed()
@@ -2052,20 +2900,27 @@ class JIContainer(object):
 
         Return a float - value.
         """
-        h0 = self.copy()
-        h0._val_shift = 1
-        h1 = other.copy()
-        h1._val_shift = 1
-        diff = JIPitch([])
-        length = len(h0) + len(h1)
-        if length != 0:
-            for p0 in h0:
-                for p1 in h1:
-                    diff += p0 - p1
-            return diff.summed() / length
-        else:
+        length = len(self) + len(other)
+        if length == 0:
             return 0.0
 
+        monzos0 = JIContainer._monzo_array(self)
+        monzos1 = JIContainer._monzo_array(other)
+        vectorizable = monzos0 is not None and monzos1 is not None
+        if vectorizable and monzos0._val_shift == monzos1._val_shift == 0:
+            # sum of all differences p0 - p1
+            width = max((monzos0._matrix.shape[1], monzos1._matrix.shape[1]))
+            summed0 = MonzoArray._pad(monzos0._matrix, width).sum(axis=0)
+            summed1 = MonzoArray._pad(monzos1._matrix, width).sum(axis=0)
+            diff = len(monzos1) * summed0 - len(monzos0) * summed1
+            return int(np.abs(diff).sum()) / length
+
+        diff = JIPitch([])
+        for p0 in self:
+            for p1 in other:
+                diff += p0 - p1
+        return diff.summed() / length
+
 
 class JIMel(JIPitch.mk_iterable(mel.Mel), JIContainer):
     def __init__(self, iterable, multiply=260):
@@ -2094,6 +2949,15 @@ class JIMel(JIPitch.mk_iterable(mel.Mel), JIContainer):
     def export2json(self, name: str):
         return JIContainer.export2json(self, name)
 
+    def normalize(self, prime: int = 2) -> "JIMel":
+        return JIContainer.normalize(self, prime)
+
+    def register(self, octave: int) -> "JIMel":
+        return JIContainer.register(self, octave)
+
+    def move_to_closest_register(self, reference: JIPitch) -> "JIMel":
+        return JIContainer.move_to_closest_register(self, reference)
+
     def calc(self):
         return mel.Mel.calc(self)
 
@@ -2126,6 +2990,10 @@ class JIMel(JIPitch.mk_iterable(mel.Mel), JIContainer):
     def remove(self, *pitch):
         return JIContainer.remove(self, *pitch)
 
+    @property
+    def cents(self) -> tuple:
+        return JIContainer.cents.__get__(self)
+
     @property
     def val_border(self) -> int:
         return JIContainer.val_border.__get__(self)
@@ -2225,7 +3093,12 @@ class JIMel(JIPitch.mk_iterable(mel.Mel), JIContainer):
             result.append(pitch)
         return type(self)(result)
 
-    def find_by_walk_best(self, pitch, compare_function) -> tuple:
+    # biggest melody for an exact find_by_walk_best (memory grows with 2 ** n)
+    _max_exact_walk = 18
+
+    def find_by_walk_best(
+        self, pitch, compare_function, time_budget: float = None
+    ) -> tuple:
         """Iterative usage of the find_by - method.
 
         The input pitch
@@ -2233,35 +3106,171 @@ class JIMel(JIPitch.mk_iterable(mel.Mel), JIContainer):
         until the Container might be empty. Unlike the find_by_walk - method
         the find_by_walk_best - method will always return the best result
         (e. g. with the lowest summed fitness)
+
+        The best results are found with the Held-Karp algorithm (dynamic
+        programming over all subsets of the melody), that is exponential
+        in the length of the melody, but much faster than testing every
+        permutation. Equal pitches are treated like one pitch, so that
+        every walk is returned only once. Melodies with more than 18
+        pitches need a time_budget (in seconds): then a local search
+        returns the best walk it could find within the given time.
         """
 
-        def calc_fitness(ind):
-            fitness = tuple(compare_function(p0, p1) for p0, p1 in zip(ind, ind[1:]))
-            return sum(fitness)
-
-        permutations = itertools.permutations(self)
-        result = []
-        current_min = None
-        for ind in permutations:
-            if pitch is not None:
-                ind = (pitch,) + ind
-            fitness = calc_fitness(ind)
-            if current_min is not None:
-                if fitness == current_min:
-                    current_min = fitness
-                    result.append((ind, fitness))
-                elif fitness < current_min:
-                    current_min = fitness
-                    result = [(ind, fitness)]
-            else:
-                current_min = fitness
-                result.append((ind, fitness))
+        items = tuple(self)
+        n_items = len(items)
+        costs = np.zeros((n_items, n_items))
+        for idx0, p0 in enumerate(items):
+            for idx1, p1 in enumerate(items):
+                if idx0 != idx1:
+                    costs[idx0, idx1] = compare_function(p0, p1)
+        if pitch is None:
+            start_costs = np.zeros(n_items)
+            start = tuple([])
+        else:
+            start_costs = np.array([compare_function(pitch, p) for p in items])
+            start = (pitch,)
+
+        if time_budget is not None:
+            walks = (JIMel._walk_by_local_search(costs, start_costs, time_budget),)
+        elif n_items > JIMel._max_exact_walk:
+            msg = "Melodies with more than {0} pitches need a time_budget.".format(
+                JIMel._max_exact_walk
+            )
+            raise ValueError(msg)
+        else:
+            # index of the first equal pitch for every pitch
+            groups = tuple(
+                next(idx for idx, p in enumerate(items) if p == item) for item in items
+            )
+            walks = JIMel._walk_by_held_karp(costs, start_costs, groups)
+
+        return tuple(
+            type(self)(start + tuple(items[idx] for idx in walk)) for walk in walks
+        )
+
+    @staticmethod
+    def _walk_by_held_karp(
+        costs: np.ndarray, start_costs: np.ndarray, groups: tuple = None
+    ) -> tuple:
+        """Return all walks (as index tuples) with minimal fitness.
+
+        The walks are sorted like itertools.permutations. Items with the
+        same group (e.g. equal pitches) need to have equal costs. Of all
+        walks that only differ in the order of items of the same group,
+        only the first one is returned.
+        """
 
-        minima = min(result, key=lambda x: x[1])
-        all_minima = (
-            type(self)(f[0]) for i, f in enumerate(result) if f[1] == minima[1]
+        n_items = len(start_costs)
+        if n_items == 0:
+            return (tuple([]),)
+        if groups is None:
+            groups = tuple(range(n_items))
+
+        def first_of_groups(indices) -> tuple:
+            # only the first item of every group needs to be visited
+            visited_groups = set([])
+            firsts = []
+            for idx in indices:
+                if groups[idx] not in visited_groups:
+                    visited_groups.add(groups[idx])
+                    firsts.append(idx)
+            return tuple(firsts)
+
+        bits = 1 << np.arange(n_items)
+        members = tuple(np.flatnonzero(mask & bits) for mask in range(1 << n_items))
+
+        # fitness[mask, idx]: best fitness of visiting all pitches of mask
+        # after visiting pitch idx
+        fitness = np.zeros((1 << n_items, n_items))
+        for mask in range(1, 1 << n_items):
+            following = members[mask]
+            fitness[mask] = (
+                costs[:, following] + fitness[mask ^ bits[following], following]
+            ).min(axis=1)
+
+        def is_minimal(value: float, minima: float) -> bool:
+            return abs(value - minima) <= 1e-9 * max((1, abs(minima)))
+
+        def walk(path: tuple, mask: int, minima: float):
+            if mask == 0:
+                yield path
+            for idx in first_of_groups(members[mask]):
+                rest = fitness[mask ^ bits[idx], idx]
+                if is_minimal(costs[path[-1], idx] + rest, minima):
+                    yield from walk(path + (idx,), mask ^ bits[idx], rest)
+
+        complete = (1 << n_items) - 1
+        first = start_costs + fitness[complete ^ bits, np.arange(n_items)]
+        minima = first.min()
+        return tuple(
+            path
+            for idx in first_of_groups(range(n_items))
+            if is_minimal(first[idx], minima)
+            for path in walk(
+                (idx,), complete ^ bits[idx], first[idx] - start_costs[idx]
+            )
         )
-        return tuple(all_minima)
+
+    @staticmethod
+    def _walk_by_local_search(
+        costs: np.ndarray, start_costs: np.ndarray, time_budget: float
+    ) -> tuple:
+        """Return a good walk that has been found within time_budget seconds.
+
+        Starts with a nearest neighbour walk, that is improved by moving
+        single pitches and reversing segments. Local minima are left
+        by randomly exchanging parts of the walk.
+        """
+
+        deadline = time.monotonic() + time_budget
+        n_items = len(start_costs)
+        if n_items == 0:
+            return tuple([])
+
+        def calc_fitness(walk: list) -> float:
+            return start_costs[walk[0]] + costs[walk[:-1], walk[1:]].sum()
+
+        def improve(walk: list) -> list:
+            fitness = calc_fitness(walk)
+            improved = True
+            while improved:
+                improved = False
+                for idx0 in range(n_items):
+                    if time.monotonic() > deadline:
+                        return walk
+                    for idx1 in range(idx0 + 1, n_items + 1):
+                        reversed_segment = (
+                            walk[:idx0] + walk[idx0:idx1][::-1] + walk[idx1:]
+                        )
+                        moved = walk[:idx0] + walk[idx0 + 1 : idx1] + [walk[idx0]]
+                        moved += walk[idx1:]
+                        for candidate in (reversed_segment, moved):
+                            candidate_fitness = calc_fitness(candidate)
+                            if candidate_fitness < fitness:
+                                walk, fitness = candidate, candidate_fitness
+                                improved = True
+            return walk
+
+        # nearest neighbour walk
+        walk = [int(np.argmin(start_costs))]
+        unvisited = set(range(n_items)) - set(walk)
+        while unvisited:
+            nearest = min(unvisited, key=lambda idx: (costs[walk[-1], idx], idx))
+            walk.append(nearest)
+            unvisited.remove(nearest)
+
+        best = improve(walk)
+        best_fitness = calc_fitness(best)
+        random = np.random.RandomState(0)
+        while n_items > 3 and time.monotonic() < deadline:
+            cuts = sorted(random.choice(np.arange(1, n_items), 3, replace=False))
+            kicked = best[: cuts[0]] + best[cuts[1] : cuts[2]]
+            kicked += best[cuts[0] : cuts[1]] + best[cuts[2] :]
+            candidate = improve(kicked)
+            candidate_fitness = calc_fitness(candidate)
+            if candidate_fitness < best_fitness:
+                best, best_fitness = candidate, candidate_fitness
+        return tuple(best)
 
 
 class JIHarmony(JIPitch.mk_iterable(mel.Harmony), JIContainer):
@@ -2286,9 +3295,22 @@ class JIHarmony(JIPitch.mk_iterable(mel.Harmony), JIContainer):
     def export2json(self, name: str):
         return JIContainer.export2json(self, name)
 
+    def normalize(self, prime: int = 2) -> "JIHarmony":
+        return JIContainer.normalize(self, prime)
+
+    def register(self, octave: int) -> "JIHarmony":
+        return JIContainer.register(self, octave)
+
+    def move_to_closest_register(self, reference: JIPitch) -> "JIHarmony":
+        return JIContainer.move_to_closest_register(self, reference)
+
     @property
     def intervals(self):
         """Return all present intervals between single notes."""
+        monzos = self._monzo_array()
+        if monzos is not None:
+            return JIHarmony(monzos.pairs(operator.sub, ordered=True).unique())
+
         data = tuple(self)
         intervals = JIHarmony([])
         for i, p0 in enumerate(data):
@@ -2306,13 +3328,19 @@ class JIHarmony(JIPitch.mk_iterable(mel.Harmony), JIContainer):
         It accumulates the results.
         """
 
-        h0 = self.copy()
-        h0._val_shift = 1
-        h1 = other.copy()
-        h1._val_shift = 1
+        monzos0 = self._monzo_array()
+        monzos1 = JIContainer._monzo_array(other)
+        if monzos0 is not None and monzos1 is not None:
+            if monzos0._val_shift == monzos1._val_shift:
+                # the sum of all dot - products equals the dot - product of the sums
+                width = max((monzos0._matrix.shape[1], monzos1._matrix.shape[1]))
+                summed0 = MonzoArray._pad(monzos0._vec, width).sum(axis=0)
+                summed1 = MonzoArray._pad(monzos1._vec, width).sum(axis=0)
+                return int(summed0.dot(summed1))
+
         acc = 0
-        for p0 in h0:
-            for p1 in h1:
+        for p0 in self:
+            for p1 in other:
                 acc += p0.dot(p1)
         return acc
 
@@ -2335,6 +3363,16 @@ class JIHarmony(JIPitch.mk_iterable(mel.Harmony), JIContainer):
     @property
     def root(self):
         ls = list(self)
+        monzos = self._monzo_array()
+        if monzos is not None:
+            if not ls:
+                return tuple([])
+            vec = monzos._vec
+            distance = np.abs(vec[:, np.newaxis, :] - vec[np.newaxis, :, :])
+            distance = distance.sum(axis=(1, 2))
+            minima = np.flatnonzero(distance == distance.min())
+            return tuple(ls[c] for c in minima)
+
         distance = []
         for t in ls:
             local_distance = 0
@@ -2349,6 +3387,10 @@ class JIHarmony(JIPitch.mk_iterable(mel.Harmony), JIContainer):
     def freq(self) -> tuple:
         return self.calc()
 
+    @property
+    def cents(self) -> tuple:
+        return JIContainer.cents.__get__(self)
+
     @property
     def val_border(self) -> int:
         if self:
@@ -2369,23 +3411,30 @@ class JIHarmony(JIPitch.mk_iterable(mel.Harmony), JIContainer):
             return JIHarmony([])
 
     def operator_harmony(self, func):
-        # TODO(replace ugly implementation by a better one)
-        new_har = type(self)([], self.multiply)
-        for c, p in enumerate(self):
-            for c2, p2 in enumerate(self):
-                if c2 > c:
-                    new_har.add(func(p, p2))
+        monzos = None
+        if func in (operator.add, operator.sub, operator.mul):
+            # these operations can be applied on the exponents directly
+            monzos = self._monzo_array()
+
+        if monzos is not None:
+            new_har = type(self)(monzos.pairs(func).unique(), self.multiply)
+        else:
+            new_har = type(self)([], self.multiply)
+            for c, p in enumerate(self):
+                for c2, p2 in enumerate(self):
+                    if c2 > c:
+                        new_har.add(func(p, p2))
         new_har.val_border = self.val_border
         return new_har
 
     def add_harmony(self):
-        return self.operator_harmony(lambda x, y: x + y)
+        return self.operator_harmony(operator.add)
 
     def sub_harmony(self):
-        return self.operator_harmony(lambda x, y: x - y)
+        return self.operator_harmony(operator.sub)
 
     def mul_harmony(self):
-        return self.operator_harmony(lambda x, y: x * y)
+        return self.operator_harmony(operator.mul)
 
     def components_harmony(self):
         return JIHarmony(
@@ -2412,6 +3461,25 @@ class JIHarmony(JIPitch.mk_iterable(mel.Harmony), JIContainer):
     @property
     def differential(self):
         harmony = type(self)([])
+        monzos = self._monzo_array()
+        if monzos is not None:
+            ratios = monzos.ratio
+            terms = tuple(r.numerator for r in ratios) + tuple(
+                r.denominator for r in ratios
+            )
+            # products of two terms have to fit into 64 bit integers
+            if max(terms, default=0) < 2 ** 31:
+                num = np.array(terms[: len(ratios)], dtype=np.int64)
+                den = np.array(terms[len(ratios) :], dtype=np.int64)
+                idx0, idx1 = np.triu_indices(len(ratios), k=1)
+                diff_num = np.abs(num[idx0] * den[idx1] - num[idx1] * den[idx0])
+                diff_den = den[idx0] * den[idx1]
+                gcd = np.gcd(diff_num, diff_den)
+                differences = np.column_stack((diff_num // gcd, diff_den // gcd))
+                for diff_num, diff_den in np.unique(differences, axis=0):
+                    harmony.add(JIPitch.from_ratio(int(diff_num), int(diff_den)))
+                return harmony
+
         for p0 in self:
             for p1 in self:
                 if p0 != p1:
@@ -2419,26 +3487,197 @@ class JIHarmony(JIPitch.mk_iterable(mel.Harmony), JIContainer):
                     harmony.add(diff)
         return harmony
 
-    def adjust_register_by_fitness(self, function, range_harmonies=None):
-        # TODO(add documentation), make implementation better understandable
-        identities = self.identity
-        length_identities = len(identities)
+    def adjust_register_by_fitness(
+        self,
+        function: Callable,
+        range_harmonies: tuple = None,
+        lower_bound: Callable = None,
+        processes: int = None,
+    ) -> tuple:
+        r"""Return all registrations of the JIHarmony with the lowest fitness.
+
+        Every identity of the harmony gets one startperiod of range_harmonies
+        (see adjust_register_of_identities). The possible solutions are the
+        combinations of len(self.identity) items of range_harmonies, which
+        is repeated once per identity.
+        Each solution is a tuple of (identity, startperiod) - pairs and
+        function(harmony, solution) returns its fitness (lower is better).
+
+        The solutions are visited in the order of itertools.combinations
+        and only the currently best solutions are kept. A lower_bound -
+        function with the same arguments gets partial solutions (the pairs
+        of the first n identities) and should return a value that isn't
+        higher than the fitness of any complete solution starting with
+        them. Partial solutions whose lower bound is higher than the best
+        fitness found so far are skipped. With processes > 1 the solution
+        space is split by the first startperiod and searched in a process
+        pool (function and lower_bound have to be picklable then).
+
+        >>> h = JIHarmony((r(3, 2, val_border=2), r(5, 4, val_border=2)))
+        >>> def fitness(harmony, solution):
+        ...     return sum(abs(register - 3) for _, register in solution)
+        >>> h.adjust_register_by_fitness(fitness, range_harmonies=(2, 3, 4))
+        (JIHarmony({3/2, 5/4}),)
+        """
+        identities = tuple(self.identity)
         if range_harmonies is None:
             range_harmonies = tuple(range(8))
-        possible_solutions = itertools.combinations(
-            range_harmonies * length_identities, length_identities
+        registers = tuple(range_harmonies) * len(identities)
+        first_indices = tuple(range(len(registers) - len(identities) + 1))
+        arguments = (self, function, lower_bound, identities, registers)
+        if processes and processes > 1 and identities:
+            with concurrent.futures.ProcessPoolExecutor(processes) as executor:
+                futures = tuple(
+                    executor.submit(_best_registers_by_fitness, *arguments, (idx,))
+                    for idx in first_indices
+                )
+                results = tuple(future.result() for future in futures)
+            fits = tuple(fit for fit, _ in results if fit is not None)
+            best_fit = min(fits) if fits else None
+            minimas = tuple(
+                solution
+                for fit, solutions in results
+                if fit is not None and fit == best_fit
+                for solution in solutions
+            )
+        else:
+            minimas = _best_registers_by_fitness(*arguments, first_indices)[1]
+
+        # equal solutions (the same startperiods may appear in different
+        # combinations) only get adjusted once
+        adjusted = {}
+        for solution in minimas:
+            if solution not in adjusted:
+                adjusted[solution] = self.adjust_register_of_identities(*solution)
+        return tuple(adjusted[solution] for solution in minimas)
+
+
+class JIHarmonyIndex(object):
+    r"""Index of many JIHarmony - objects, which are equal after transposition.
+
+    Every harmony is saved under a canonical key: the sorted intervals
+    of all its pitches to its root (see JIHarmony.converted2root), with
+    exponents in respect to the val_border of the index. If a harmony
+    has more than one root, the smallest key is taken. Transpositions
+    of a harmony therefore share one key and membership tests are O(1).
+
+    Nearest neighbours can be found by JIContainer.diff or by
+    JIHarmony.dot. Both only depend on the number of pitches and
+    the summed exponents of a harmony, which are saved for every
+    harmony in one numpy array.
+
+    >>> index = JIHarmonyIndex((JIHarmony((r(1, 1), r(5, 4), r(3, 2))),))
+    >>> JIHarmony((r(9, 8), r(45, 32), r(27, 16))) in index
+    True
+    >>> JIHarmony((r(1, 1), r(6, 5), r(3, 2))) in index
+    False
+    >>> index.nearest(JIHarmony((r(1, 1), r(6, 5), r(3, 2))))[0] == JIHarmony(
+    ...     (r(1, 1), r(5, 4), r(3, 2)))
+    True
+    """
+
+    _metrics = ("diff", "dot")
+
+    def __init__(self, harmonies=tuple([]), val_border: int = 1) -> None:
+        self._val_border = val_border
+        self._harmonies = []
+        self._keys = {}
+        self._lengths = []
+        self._sums = []
+        self._matrix = None
+        for harmony in harmonies:
+            self.add(harmony)
+
+    def __repr__(self) -> str:
+        return "JIHarmonyIndex({0})".format(len(self))
+
+    def __len__(self) -> int:
+        return len(self._harmonies)
+
+    def __iter__(self):
+        return iter(self._harmonies)
+
+    def __contains__(self, harmony: "JIHarmony") -> bool:
+        return self.key(harmony) in self._keys
+
+    @property
+    def val_border(self) -> int:
+        return self._val_border
+
+    def _vec(self, harmony: "JIHarmony") -> np.ndarray:
+        return MonzoArray(tuple(harmony), val_border=self._val_border)._vec
+
+    @staticmethod
+    def _summed(harmony: "JIHarmony") -> np.ndarray:
+        # distances are independent from the val_border of the index
+        return MonzoArray(tuple(harmony), val_border=1)._vec.sum(axis=0)
+
+    def key(self, harmony: "JIHarmony") -> tuple:
+        """Return the transposition - invariant key of a harmony."""
+        vec = self._vec(harmony)
+        if not len(vec):
+            return tuple([])
+        distance = np.abs(vec[:, np.newaxis, :] - vec[np.newaxis, :, :])
+        distance = distance.sum(axis=(1, 2))
+        return min(
+            tuple(
+                sorted(
+                    set(Monzo.discard_nulls(row) for row in (vec - vec[root]).tolist())
+                )
+            )
+            for root in np.flatnonzero(distance == distance.min())
         )
-        data = []
-        for solution in possible_solutions:
-            solution = tuple(zip(identities, solution))
-            fit = function(self, solution)
-            data.append((solution, fit))
-        minima = min(data, key=lambda i: i[1])
-        minimas = (sol for sol in data if sol[1] == minima[1])
+
+    def add(self, harmony: "JIHarmony") -> None:
+        self._keys.setdefault(self.key(harmony), []).append(len(self._harmonies))
+        self._harmonies.append(harmony)
+        self._lengths.append(len(harmony))
+        self._sums.append(tuple(JIHarmonyIndex._summed(harmony).tolist()))
+        self._matrix = None
+
+    def transpositions(self, harmony: "JIHarmony") -> tuple:
+        """Return all saved harmonies that are transpositions of the harmony."""
         return tuple(
-            self.adjust_register_of_identities(*minima[0]) for minima in minimas
+            self._harmonies[idx] for idx in self._keys.get(self.key(harmony), [])
         )
 
+    def nearest(self, harmony: "JIHarmony", n: int = 1, metric: str = "diff") -> tuple:
+        """Return the n saved harmonies that are closest to the harmony.
+
+        With metric='diff' the harmonies with the smallest JIContainer.diff are
+        returned, with metric='dot' the harmonies with the biggest JIHarmony.dot.
+        Equally close harmonies are returned in the order they have been added.
+        The val_border of the index only affects the keys, distances are
+        always calculated with val_border=1, like JIContainer.diff of pitches
+        with val_border=1.
+        """
+        if metric not in JIHarmonyIndex._metrics:
+            msg = "Unknown metric '{0}'. Available metrics are: {1}.".format(
+                metric, ", ".join(JIHarmonyIndex._metrics)
+            )
+            raise ValueError(msg)
+
+        if self._matrix is None:
+            self._matrix = MonzoArray._mk_matrix(self._sums)
+        summed = JIHarmonyIndex._summed(harmony)
+        width = max((self._matrix.shape[1], summed.shape[0]))
+        matrix = MonzoArray._pad(self._matrix, width)
+        summed = np.pad(summed, (0, width - summed.shape[0]), "constant")
+        lengths = np.array(self._lengths, dtype=np.int64)
+
+        if metric == "diff":
+            diff = np.abs(lengths[:, np.newaxis] * summed - len(harmony) * matrix)
+            total_lengths = lengths + len(harmony)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                fitness = np.where(
+                    total_lengths == 0, 0, diff.sum(axis=1) / total_lengths
+                )
+        else:
+            fitness = -matrix.dot(summed)
+
+        best = np.argsort(fitness, kind="stable")[:n]
+        return tuple(self._harmonies[idx] for idx in best)
+
 
 class JICadence(JIPitch.mk_iterable(mel.Cadence), JIContainer):
     def __init__(self, iterable: List[JIHarmony], multiply: int = 1) -> None:
@@ -2471,6 +3710,42 @@ class JICadence(JIPitch.mk_iterable(mel.Cadence), JIContainer):
     def export2json(self, name: str):
         return JIContainer.export2json(self, name)
 
+    def _place_in_register(self, method: str, *args) -> tuple:
+        """Call method with args on the pitches of all harmonies at once.
+
+        Return None if the pitches can't be combined to one MonzoArray.
+        """
+        harmonies = tuple(self)
+        if not all(isinstance(h, JIHarmony) for h in harmonies):
+            return None
+        pitches = tuple(p for h in harmonies for p in h)
+        monzos = JIContainer._mk_monzo_array(pitches)
+        if monzos is None:
+            return None
+        try:
+            placed = iter(getattr(monzos, method)(*args))
+        except ValueError:
+            return None
+        return tuple(type(h)(next(placed) for _ in range(len(h))) for h in harmonies)
+
+    def normalize(self, prime: int = 2) -> tuple:
+        harmonies = self._place_in_register("normalize", prime)
+        if harmonies is None:
+            harmonies = tuple(h.normalize(prime) for h in self)
+        return harmonies
+
+    def register(self, octave: int) -> tuple:
+        harmonies = self._place_in_register("register", octave)
+        if harmonies is None:
+            harmonies = tuple(h.register(octave) for h in self)
+        return harmonies
+
+    def move_to_closest_register(self, reference: JIPitch) -> tuple:
+        harmonies = self._place_in_register("move_to_closest_register", reference)
+        if harmonies is None:
+            harmonies = tuple(h.move_to_closest_register(reference) for h in self)
+        return harmonies
+
     @property
     def val_border(self) -> int:
         return JIContainer.val_border.__get__(self)
@@ -2500,6 +3775,10 @@ class JICadence(JIPitch.mk_iterable(mel.Cadence), JIContainer):
     def float(self):
         return tuple(h.float for h in self)
 
+    @property
+    def cents(self):
+        return tuple(h.cents for h in self)
+
     @property
     def gender(self):
         return tuple(h.gender for h in self)
@@ -2634,10 +3913,21 @@ class JIScale(JIPitch.mk_iterable(mel.Scale), JIContainer):
 
     def __init__(self, period, periodsize=JIPitch([1])):
         period = JIMel(sorted(period))
+        # log2 of the frequency of every pitch compared to the frequency of periodsize
+        # tells how often periodsize has to be subtracted
+        log2_period = periodsize.cents / 1200
+        border = log2_period + math.log2(periodsize.multiply)
         for i, p in enumerate(period):
-            while p > periodsize:
-                p -= periodsize
-            period[i] = p
+            distance = p.cents / 1200 + math.log2(p.multiply) - border
+            if distance > 0:
+                if log2_period <= 0:
+                    msg = "Can't move {0} into the period {1}.".format(p, periodsize)
+                    raise ValueError(msg)
+                # small tolerance, so that pitches equal to periodsize stay unchanged
+                n_periods = math.ceil(distance / log2_period - 1e-12)
+                period[i] = p - periodsize.scalar(n_periods)
+        for p in period:
+            p.share_vector()
         mel.Scale.__init__(self, period, periodsize)
 
     @property
@@ -2647,12 +3937,135 @@ class JIScale(JIPitch.mk_iterable(mel.Scale), JIContainer):
     def map(self, function):
         return type(self)((function(x) for x in self.period), function(self.periodsize))
 
+    def _mk_index(self) -> dict:
+        # JIPitch.__eq__ compares multiply and the vector of the other pitch
+        # sliced by the own _val_shift, therefore there is one dict per _val_shift
+        index = {}
+        for c, x in enumerate(self):
+            try:
+                key = (x.multiply, x._vec)
+            except AttributeError:
+                # not hashable in respect to JIPitch.__eq__
+                return None
+            index.setdefault(x._val_shift, {}).setdefault(key, c)
+        return index
+
+    def _clear_index(self) -> None:
+        try:
+            del self.__index
+        except AttributeError:
+            pass
+
+    def add(self, item) -> None:
+        self._clear_index()
+        super().add(item)
+
+    def discard(self, item) -> None:
+        self._clear_index()
+        super().discard(item)
+
     def index(self, item):
+        """Return the position of item in the scale.
+
+        Positions are looked up in a dict, which is built once and
+        rebuilt when the size of the scale changes, when pitches are
+        added or when val_border is set. Pitches mustn't be changed
+        directly while they belong to the scale, since the dict
+        wouldn't notice.
+        """
+        try:
+            size, index = self.__index
+        except AttributeError:
+            size, index = None, None
+        if size != len(self):
+            size, index = len(self), self._mk_index()
+            self.__index = (size, index)
+
+        if index is not None:
+            try:
+                multiply, vector = item.multiply, item._vector
+            except AttributeError:
+                raise ValueError("x not in tuple")
+            positions = tuple(
+                keys[(multiply, vector[val_shift:])]
+                for val_shift, keys in index.items()
+                if (multiply, vector[val_shift:]) in keys
+            )
+            if positions:
+                return min(positions)
+            raise ValueError("x not in tuple")
+
         for c, x in enumerate(self):
             if x == item:
                 return c
         raise ValueError("x not in tuple")
 
+    def quantize(self, values, frequencies: bool = False) -> tuple:
+        r"""Return the closest scale degree for every value.
+
+        Values are cents by default or frequencies if frequencies is True.
+        Scale degrees repeat in every period, therefore values outside
+        of the first period are mapped on the degrees of the scale
+        transposed by the periodsize. Values in the middle of two
+        degrees get the lower degree. All values are looked up at once
+        with numpy.searchsorted in the sorted degrees. Equal results
+        are the same JIPitch - object.
+
+        >>> scale = JIScale((r(1, 1), r(9, 8), r(5, 4), r(3, 2)), r(2, 1))
+        >>> scale.quantize((10, 190, 1900, -500))
+        (1, 9/8, 3, 3/4)
+        """
+        degrees = tuple(self.period)
+        if not degrees:
+            raise ValueError("Can't quantize values on an empty scale.")
+        log2_period = self.periodsize.cents / 1200
+        if log2_period <= 0:
+            msg = "Can't quantize values on a scale with a period <= 1/1."
+            raise ValueError(msg)
+
+        if frequencies:
+            positions = np.log2(tuple(p.freq for p in degrees))
+            values = np.log2(np.asarray(values, dtype=float))
+        else:
+            positions = np.array(tuple(p.cents for p in degrees)) / 1200
+            values = np.asarray(values, dtype=float) / 1200
+        # move degrees and values into the first period
+        degree_periods = np.floor(positions / log2_period).astype(int)
+        positions = positions - (degree_periods * log2_period)
+        order = np.argsort(positions, kind="stable")
+        positions = positions[order]
+        n_periods = np.floor((values - positions[0]) / log2_period).astype(int)
+        values = values - (n_periods * log2_period)
+
+        # the first degree of the next period is the last candidate
+        positions = np.append(positions, positions[0] + log2_period)
+        upper = np.clip(np.searchsorted(positions, values), 1, len(positions) - 1)
+        lower = upper - 1
+        is_upper = (positions[upper] - values) < (values - positions[lower])
+        closest = np.where(is_upper, upper, lower)
+        n_periods = n_periods + (closest == len(degrees))
+        closest = order[closest % len(degrees)]
+        n_periods = n_periods - degree_periods[closest]
+
+        # every transposed degree is only initialised once
+        transposed = {}
+        quantized = []
+        for key in zip(closest.tolist(), n_periods.tolist()):
+            try:
+                quantized.append(transposed[key])
+            except KeyError:
+                degree, n = key
+                pitch = degrees[degree]
+                if n != 0:
+                    pitch = pitch + self.periodsize.scalar(n)
+                transposed[key] = pitch
+                quantized.append(pitch)
+        return tuple(quantized)
+
+    @property
+    def cents(self) -> tuple:
+        return JIContainer.cents.__get__(self)
+
     @property
     def val_border(self) -> int:
         return JIContainer.val_border.__get__(self)
@@ -2660,6 +4073,7 @@ class JIScale(JIPitch.mk_iterable(mel.Scale), JIContainer):
     @val_border.setter
     def val_border(self, arg) -> None:
         JIContainer.val_border.__set__(self, arg)
+        self._clear_index()
 
 
 class GeneratorScale(JIScale):
@@ -2671,6 +4085,118 @@ class GeneratorScale(JIScale):
         s = s.accumulate()
         JIScale.__init__(self, s, period)
 
+    @staticmethod
+    def _degree_vectors(generator: tuple, n: int = None, period=JIPitch([1])):
+        def mk_vector(pitch: JIPitch) -> tuple:
+            ratio = pitch.ratio
+            if ratio == 1:
+                return tuple([])
+            return tuple(Monzo.ratio2monzo(ratio))
+
+        generators = tuple(mk_vector(g) for g in generator)
+        period_vector = mk_vector(period)
+        width = max(len(v) for v in generators + (period_vector,))
+        generators = tuple(v + (0,) * (width - len(v)) for v in generators)
+        period_vector = period_vector + (0,) * (width - len(period_vector))
+        log2_val = Monzo.log2_val(width)
+        log2_period = sum(e * log2 for e, log2 in zip(period_vector, log2_val))
+        if log2_period <= 0:
+            raise ValueError("The period has to be bigger than 1/1.")
+        if n is None:
+            # the chain only closes if one cycle of generators is a rational
+            # multiple of the period, otherwise it never repeats
+            cycle = tuple(sum(exponents) for exponents in zip(*generators))
+            nth = next(idx for idx, e in enumerate(period_vector) if e != 0)
+            if any(
+                c * period_vector[nth] != p * cycle[nth]
+                for c, p in zip(cycle, period_vector)
+            ):
+                msg = "The chain of generators never closes, n has to be given."
+                raise ValueError(msg)
+
+        degree = (0,) * width
+        # the chain is periodic as soon as a degree repeats at the same
+        # position of the generators
+        states = set()
+        degrees = set()
+        for count in itertools.count():
+            phase = count % len(generators)
+            if (n is not None and count >= n) or (degree, phase) in states:
+                return
+            states.add((degree, phase))
+            if degree not in degrees:
+                degrees.add(degree)
+                yield degree
+
+            degree = tuple(d + g for d, g in zip(degree, generators[phase]))
+            position = sum(e * log2 for e, log2 in zip(degree, log2_val))
+            position /= log2_period
+            n_periods = math.floor(position)
+            # degrees that are exactly on a period border mustn't get lost
+            # because of floating point errors
+            if abs(position - round(position)) < 1e-9:
+                border = round(position)
+                if degree == tuple(border * p for p in period_vector):
+                    n_periods = border
+            if n_periods:
+                degree = tuple(d - n_periods * p for d, p in zip(degree, period_vector))
+
+    @staticmethod
+    def iter_degrees(*generator: JIPitch, n: int = None, period=JIPitch([1])):
+        r"""Generate the degrees of a chain of generators one by one.
+
+        Starting with 1/1 the generators are added cyclically and every
+        new degree is moved between 1/1 and period. Degrees that have
+        already been generated are skipped. The generator stops after n
+        steps of the chain, or as soon as a degree repeats at the same
+        position of the generators, since the chain is periodic then.
+        Without n it only stops when the chain closes. Chains that never
+        close raise a ValueError, since they would never stop.
+
+        >>> tuple(GeneratorScale.iter_degrees(r(3, 2), n=5, period=r(2, 1)))
+        (1, 3/2, 9/8, 27/16, 81/64)
+        >>> tuple(GeneratorScale.iter_degrees(r(3, 2), r(4, 3), period=r(2, 1)))
+        (1, 3/2)
+        """
+        for vector in GeneratorScale._degree_vectors(generator, n, period):
+            degree = JIPitch._from_vector(Monzo.discard_nulls(vector))
+            degree.multiply = CONCERT_PITCH
+            yield degree
+
+    @staticmethod
+    def degree_array(*generator: JIPitch, n: int = None, period=JIPitch([1])):
+        r"""Return the degrees of GeneratorScale.iter_degrees as one MonzoArray.
+
+        No JIPitch - objects are initialised for the single degrees.
+
+        >>> GeneratorScale.degree_array(r(3, 2), n=3, period=r(2, 1)).ratio
+        (Fraction(1, 1), Fraction(3, 2), Fraction(9, 8))
+        """
+        vectors = tuple(GeneratorScale._degree_vectors(generator, n, period))
+        return MonzoArray._from_matrix(
+            MonzoArray._mk_matrix(vectors), 0, JIPitch, CONCERT_PITCH
+        )
+
+    @classmethod
+    def build(cls, *generator: JIPitch, n: int = None, period=JIPitch([1])):
+        r"""Return a GeneratorScale with the degrees of GeneratorScale.iter_degrees.
+
+        Unlike the constructor, which only moves degrees above the
+        period down, build moves every degree into [1/1, period) and
+        skips repeated degrees. Therefore the period has to be bigger
+        than 1/1 and the default period is 2/1 instead of 1/1.
+        Scales of generators below 1/1 differ:
+
+        >>> GeneratorScale(r(2, 3), n=4, period=r(2, 1))
+        (8/27, 4/9, 2/3, 1, 2)
+        >>> GeneratorScale.build(r(2, 3), n=4, period=r(2, 1))
+        (1, 32/27, 4/3, 16/9, 2)
+        """
+        scale = cls.__new__(cls)
+        degrees = cls.iter_degrees(*generator, n=n, period=period)
+        JIScale.__init__(scale, degrees, period)
+        return scale
+
 
 class JIStencil(object):
     r"""This class implements a non-general way to handle complex JI harmony.
@@ -2874,16 +4400,49 @@ class BlueprintPitch(object):
             msg += " But only {0} numbers were given.".format(len(args))
             raise ValueError(msg)
 
+        return self._instance(args)
+
+    def _instance(self, primes: tuple) -> JIPitch:
+        """Return the pitch for already validated prime numbers.
+
+        The exponents are written into the monzo directly, without
+        multiplying and factorising numerator and denominator.
+        """
         index = 0
-        num_and_den = [[1], [1]]
-        for item_idx, item in enumerate(self.blueprint):
+        exponents = {}
+        for sign, item in zip((1, -1), self.blueprint):
             for exponent, amount in enumerate(item):
                 exponent += 1
                 for n in range(amount):
-                    num_and_den[item_idx].append(args[index] ** exponent)
+                    column = Monzo.count_primes(primes[index]) - 1
+                    exponents[column] = exponents.get(column, 0) + sign * exponent
                     index += 1
 
-        return r(*tuple(functools.reduce(operator.mul, n) for n in num_and_den))
+        vector = [0] * (max(exponents, default=-1) + 1)
+        for column, exponent in exponents.items():
+            vector[column] = exponent
+        pitch = JIPitch._from_vector(Monzo.discard_nulls(vector))
+        pitch.multiply = CONCERT_PITCH
+        return pitch
+
+    def instances(
+        self,
+        primes: tuple,
+        predicates: tuple = tuple([]),
+        validated: bool = False,
+        processes: int = None,
+        chunksize: int = 1000,
+    ):
+        r"""Generate the pitch for every assignment of primes from a pool.
+
+        See BlueprintHarmony.instances.
+
+        >>> tuple(BlueprintPitch((1,), (1,)).instances((3, 5, 7)))
+        (3/5, 3/7, 5/3, 5/7, 7/3, 7/5)
+        """
+        return _iter_blueprint_instances(
+            self, primes, predicates, validated, processes, chunksize
+        )
 
 
 class BlueprintHarmony(object):
@@ -2913,6 +4472,16 @@ class BlueprintHarmony(object):
         self.__blueprint = blueprint
         self.__sorted_available_indices = tuple(sorted(available_numbers))
 
+        # canonical form for comparison and hashing
+        self.__identity = frozenset(self.__mk_identity())
+        self.__hash = hash(self.__identity)
+
+        # positions of the indices of every pitch within the sorted indices
+        self.__positions = tuple(
+            tuple(self.__sorted_available_indices.index(idx) for idx in indices)
+            for _, indices in blueprint
+        )
+
     @classmethod
     def from_harmony(cls, harmony: tuple) -> "BlueprintHarmony":
         def identify_blueprint_for_pitch(pitch: JIPitch, known_primes: tuple) -> tuple:
@@ -2970,8 +4539,7 @@ class BlueprintHarmony(object):
             functools.reduce(operator.add, tuple(sorted(div) for div in divisions))
         )
 
-    @property
-    def identity(self) -> set:
+    def __mk_identity(self) -> set:
         items_per_idx = [[] for i in range(self.size)]
         for bp in self.blueprint:
             hash_blueprint_pitch = hash(bp[0].blueprint)
@@ -2981,6 +4549,23 @@ class BlueprintHarmony(object):
                 items_per_idx[real_index].append((hash_blueprint_pitch, ID))
         return set(tuple(item) for item in items_per_idx)
 
+    @property
+    def identity(self) -> set:
+        return set(self.__identity)
+
+    @staticmethod
+    def dedupe(iterable) -> tuple:
+        """Return all different BlueprintHarmony - objects in order of first occurrence.
+
+        >>> bp = BlueprintPitch((1,))
+        >>> BlueprintHarmony.dedupe((
+        ...     BlueprintHarmony((bp, (0,)), (bp, (1,))),
+        ...     BlueprintHarmony((bp, (1,)), (bp, (0,))),
+        ...     BlueprintHarmony((bp, (0,)), (bp, (0,)))))
+        ((((A¹ | 1), (0,)), ((A¹ | 1), (1,))), (((A¹ | 1), (0,)), ((A¹ | 1), (0,))))
+        """
+        return tuple(dict.fromkeys(iterable))
+
     @property
     def blueprint(self) -> tuple:
         return self.__blueprint
@@ -2999,7 +4584,7 @@ class BlueprintHarmony(object):
         )
 
     def __hash__(self) -> int:
-        return hash(self.blueprint)
+        return self.__hash
 
     def __len__(self) -> int:
         return len(self.blueprint)
@@ -3014,7 +4599,7 @@ class BlueprintHarmony(object):
         called with the same attributes in the same order.
         """
         try:
-            return self.identity == other.identity
+            return self.__identity == other.__identity
         except AttributeError:
             return False
 
@@ -3031,6 +4616,96 @@ class BlueprintHarmony(object):
             p(*tuple(args[idx] for idx in indices)) for p, indices in self.blueprint
         )
 
+    def _instance(self, primes: tuple) -> tuple:
+        """Return the pitches for already validated prime numbers.
+
+        The n-th prime is assigned to the n-th smallest index of the harmony.
+        """
+        return tuple(
+            p._instance(tuple(primes[position] for position in positions))
+            for (p, _), positions in zip(self.blueprint, self.__positions)
+        )
+
+    def instances(
+        self,
+        primes: tuple,
+        predicates: tuple = tuple([]),
+        validated: bool = False,
+        processes: int = None,
+        chunksize: int = 1000,
+    ):
+        r"""Generate the harmonies for every assignment of primes from a pool.
+
+        The assignments are the permutations of length self.size of
+        primes, whose n-th item replaces the n-th smallest index of
+        the harmony. Only harmonies for which every predicate returns
+        True are yielded. Unless validated is True every item of primes
+        is checked once to be a prime number; the single harmonies
+        aren't checked anymore.
+
+        With processes > 1 the permutations are split into chunks of
+        chunksize assignments, which are calculated in a process pool.
+        The results keep their order and only a few chunks are calculated
+        in advance, so that huge spaces can be consumed lazily.
+        Predicates have to be picklable then.
+
+        >>> bp0 = BlueprintPitch((1,))
+        >>> bph = BlueprintHarmony((bp0, (0,)), (BlueprintPitch((1,), (1,)), (0, 1)))
+        >>> tuple(bph.instances((3, 5, 7)))
+        ((3, 3/5), (3, 3/7), (5, 5/3), (5, 5/7), (7, 7/3), (7, 7/5))
+        """
+        return _iter_blueprint_instances(
+            self, primes, predicates, validated, processes, chunksize
+        )
+
+
+def _blueprint_instances(blueprint, assignments, predicates: tuple) -> tuple:
+    return tuple(_filter_blueprint_instances(blueprint, assignments, predicates))
+
+
+def _filter_blueprint_instances(blueprint, assignments, predicates: tuple):
+    for primes in assignments:
+        instance = blueprint._instance(primes)
+        if all(predicate(instance) for predicate in predicates):
+            yield instance
+
+
+def _iter_blueprint_instances(
+    blueprint, primes: tuple, predicates: tuple, validated: bool, processes, chunksize
+):
+    """Validate the prime pool and return a generator of all blueprint instances.
+
+    See BlueprintHarmony.instances.
+    """
+    primes = tuple(primes)
+    if not validated:
+        for prime in primes:
+            if not prime_factors.is_prime(prime):
+                msg = "Every argument has to be a prime number."
+                msg += " {0} is not a prime number.".format(prime)
+                raise ValueError(msg)
+
+    assignments = itertools.permutations(primes, blueprint.size)
+    if not processes or processes < 2:
+        return _filter_blueprint_instances(blueprint, assignments, predicates)
+
+    chunks = iter(lambda: tuple(itertools.islice(assignments, chunksize)), ())
+    return _iter_blueprint_instances_in_pool(blueprint, chunks, predicates, processes)
+
+
+def _iter_blueprint_instances_in_pool(blueprint, chunks, predicates, processes: int):
+    with concurrent.futures.ProcessPoolExecutor(processes) as executor:
+        # only a few chunks are calculated in advance
+        pending = collections.deque()
+        for chunk in chunks:
+            pending.append(
+                executor.submit(_blueprint_instances, blueprint, chunk, predicates)
+            )
+            if len(pending) >= 2 * processes:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
 
 def find_all_available_pitches_in_a_specified_range(
     pitch: JIPitch, minima: JIPitch, maxima: JIPitch
@@ -3053,57 +4728,270 @@ def find_all_available_pitches_in_a_specified_range(
     return tuple(p_norm.register(o) for o in range(oct0, oct1))
 
 
-def find_best_voice_leading(pitches: tuple, tonal_range: tuple) -> tuple:
-    """Brute force searching for the best voice leading.
+def _k_best_voice_leadings(candidates: tuple, k: int) -> tuple:
+    """Return the k best (fitness, solution) - pairs for one part without rests.
 
-    The best voice leading is defined as the voice leading
-    with the smallest sum of cent differences between two
-    succeeding pitches.
+    Viterbi algorithm that runs backwards through the part. For every candidate
+    of every position the k best continuations until the end of the part are
+    saved as (fitness, next candidate, rank of the next candidate's
+    continuation). Sorting equally fit continuations by their next candidate
+    and its rank makes the first solution equal to the first best solution
+    of itertools.product.
     """
 
-    def brute_force_algorithm(pitches: tuple) -> tuple:
-        element = None
-        fitness = None
-        for solution in itertools.product(
-            *tuple(
-                find_all_available_pitches_in_a_specified_range(p, minima, maxima)
-                for p in pitches
-            )
-        ):
-            differences = sum(
-                abs((p0 - p1).cents) for p0, p1 in zip(solution, solution[1:])
+    def key(option: tuple) -> tuple:
+        # fitness is rounded, so that numerical noise doesn't matter for ties
+        return (round(option[0], 6),) + option[1:]
+
+    if not candidates:
+        return ((0, tuple([])),)
+
+    cents = tuple(np.array([p.cents for p in c]) for c in candidates)
+    layers = [[[(0, None, None)] for _ in candidates[-1]]]
+    for idx in reversed(range(len(candidates) - 1)):
+        distances = np.abs(cents[idx][:, np.newaxis] - cents[idx + 1]).tolist()
+        following = layers[-1]
+        layer = []
+        for distance in distances:
+            options = (
+                (distance[nxt] + continuation[0], nxt, rank)
+                for nxt, continuations in enumerate(following)
+                for rank, continuation in enumerate(continuations)
             )
+            layer.append(heapq.nsmallest(k, options, key=key))
+        layers.append(layer)
+    layers.reverse()
+
+    starts = (
+        (continuation[0], first, rank)
+        for first, continuations in enumerate(layers[0])
+        for rank, continuation in enumerate(continuations)
+    )
+    solutions = []
+    for fitness, candidate, rank in heapq.nsmallest(k, starts, key=key):
+        solution = []
+        for idx, layer in enumerate(layers):
+            solution.append(candidates[idx][candidate])
+            candidate, rank = layer[candidate][rank][1:]
+        solutions.append((fitness, tuple(solution)))
+    return tuple(solutions)
+
+
+def _best_registers_by_fitness(
+    harmony: "JIHarmony",
+    function: Callable,
+    lower_bound: Callable,
+    identities: tuple,
+    registers: tuple,
+    first_indices: tuple,
+) -> tuple:
+    """Return (best fitness, best solutions) for JIHarmony.adjust_register_by_fitness.
+
+    Walks depth-first through the combinations of registers whose first item
+    has one of the first_indices, in the order of itertools.combinations.
+    Subtrees whose lower bound is higher than the best fitness are skipped.
+    """
+    n_identities = len(identities)
+    n_registers = len(registers)
+    solution = [None] * n_identities
+    best = [None, []]
+
+    def search(indices: range, depth: int) -> None:
+        for idx in indices:
+            solution[depth] = (identities[depth], registers[idx])
+            if depth + 1 == n_identities:
+                current = tuple(solution)
+                fit = function(harmony, current)
+                if best[0] is None or fit < best[0]:
+                    best[0], best[1] = fit, [current]
+                elif fit == best[0]:
+                    best[1].append(current)
+            else:
+                if lower_bound is not None and best[0] is not None:
+                    if lower_bound(harmony, tuple(solution[: depth + 1])) > best[0]:
+                        continue
+                search(
+                    range(idx + 1, n_registers - n_identities + depth + 2), depth + 1
+                )
 
-            is_addable = True
+    if n_identities:
+        search(first_indices, 0)
+    else:
+        best[0], best[1] = function(harmony, ()), [()]
+    return best[0], best[1]
 
-            if element:
-                is_addable = differences < fitness
 
-            if is_addable:
-                element = solution
-                fitness = differences
+def find_best_voice_leading(
+    pitches: tuple, tonal_range: tuple, k_best: int = None
+) -> tuple:
+    """Find the best voice leading.
 
-        return element
+    The best voice leading is defined as the voice leading
+    with the smallest sum of cent differences between two
+    succeeding pitches.
+
+    The solution is found with dynamic programming, the runtime grows linear
+    with the length of pitches and quadratic with the amount of available
+    registers per pitch. If k_best is an integer, a tuple with the k best
+    voice leadings (the best one first) is returned instead of only one
+    voice leading.
+    """
 
     assert len(tonal_range) == 2
     minima, maxima = tonal_range
+    k = 1 if k_best is None else k_best
 
     splited_by_rests = tools.split_iterable_by_n(pitches, mel.TheEmptyPitch)
 
-    result = tuple([])
+    # (fitness, solution) - pairs of the k best voice leadings until now
+    result = ((0, tuple([])),)
     for part in splited_by_rests:
-        if part[-1] == mel.TheEmptyPitch:
-            is_last_rest = True
+        if part and part[-1] == mel.TheEmptyPitch:
+            rest = (mel.TheEmptyPitch,)
             part = part[:-1]
         else:
-            is_last_rest = False
+            rest = tuple([])
+
+        candidates = tuple(
+            find_all_available_pitches_in_a_specified_range(p, minima, maxima)
+            for p in part
+        )
+        solutions = _k_best_voice_leadings(candidates, k)
+        combined = (
+            (result[idx0][0] + solutions[idx1][0], idx0, idx1)
+            for idx0 in range(len(result))
+            for idx1 in range(len(solutions))
+        )
+        result = tuple(
+            (fitness, result[idx0][1] + solutions[idx1][1] + rest)
+            for fitness, idx0, idx1 in heapq.nsmallest(
+                k, combined, key=lambda option: (round(option[0], 6),) + option[1:]
+            )
+        )
 
-        result += brute_force_algorithm(part)
+    if k_best is None:
+        return result[0][1]
+    return tuple(solution for fitness, solution in result)
 
-        if is_last_rest:
-            result += (mel.TheEmptyPitch,)
 
-    return tuple(result)
+def harmonicity(pitches, metric: str = "barlow") -> np.ndarray:
+    r"""Return the harmonicity of many pitches at once.
+
+    pitches can be any iterable of Monzo - / JIPitch - objects with the same
+    val_border or a MonzoArray. For the available metrics
+    see MonzoArray.harmonicity.
+
+    >>> harmonicity((r(3, 2), r(7, 4)), metric="tenney")
+    array([2.5849625 , 4.80735492])
+    """
+
+    if not isinstance(pitches, MonzoArray):
+        pitches = MonzoArray(pitches)
+    return pitches.harmonicity(metric)
+
+
+# weight of one exponent of a prime for the complexity metrics of
+# pitches_by_complexity (barlow: indigestibility of the prime)
+_COMPLEXITY_WEIGHTS = {
+    "tenney": math.log2,
+    "euler": lambda prime: prime - 1,
+    "barlow": lambda prime: 2 * ((prime - 1) ** 2) / prime,
+}
+
+
+def pitches_by_complexity(
+    prime_limit: int,
+    max_exponent=None,
+    val_border: int = 1,
+    metric: str = "tenney",
+    multiply: float = None,
+):
+    r"""Yield every JIPitch within a prime limit ordered by increasing complexity.
+
+    Arguments are:
+        * prime_limit -> biggest prime that may be part of a pitch
+        * max_exponent -> biggest absolute exponent, either one integer
+                          for all primes or a tuple with one integer for
+                          every prime that is bigger than the val_border.
+                          None means unbounded exponents.
+        * val_border -> see Monzo.val_border
+        * metric -> 'tenney' (harmonicity_tenney), 'euler'
+                    (harmonicity_euler) or 'barlow' (1 / abs(harmonicity_barlow))
+
+    The pitches are searched best-first with a heap, hence the first k
+    pitches are found without enumerating all possible exponents.
+    Exponents of the val_border aren't part of the search, but
+    are considered for the order of the pitches.
+
+    >>> tuple(itertools.islice(pitches_by_complexity(5, val_border=2), 5))
+    (1, 3/2, 4/3, 5/3, 5/4)
+    """
+
+    try:
+        weight = _COMPLEXITY_WEIGHTS[metric]
+    except KeyError:
+        msg = "Unknown complexity metric '{0}'. Available metrics are: {1}.".format(
+            metric, ", ".join(_COMPLEXITY_WEIGHTS)
+        )
+        raise ValueError(msg)
+
+    val_shift = Monzo.count_primes(val_border)
+    primes = Monzo.n_primes(Monzo.count_primes(prime_limit))[val_shift:]
+    n_primes = len(primes)
+
+    if max_exponent is None or isinstance(max_exponent, int):
+        bounds = (max_exponent,) * n_primes
+    else:
+        bounds = tuple(max_exponent)
+        if len(bounds) != n_primes:
+            msg = "max_exponent needs one bound for each of the primes {0}.".format(
+                primes
+            )
+            raise ValueError(msg)
+
+    weights = tuple(weight(prime) for prime in primes)
+    log_primes = tuple(math.log(prime) for prime in primes)
+    if val_shift:
+        val_border = Monzo.nth_prime(val_shift - 1)
+        border_weight = weight(val_border)
+        log_val_border = math.log(val_border)
+
+    def complexity(lower_bound: float, exponents: tuple) -> float:
+        # adds the exponent of the val_border like Monzo.adjust_monzo
+        if val_shift and any(exponents):
+            log_ratio = sum(e * log_p for e, log_p in zip(exponents, log_primes))
+            res = (log_val_border - log_ratio) / log_val_border
+            if res < 0:
+                res -= 1
+            return lower_bound + border_weight * abs(int(res))
+        return lower_bound
+
+    # Every exponent vector is generated exactly once: children only change
+    # the prime that has been changed last or primes with a higher index.
+    frontier = [(0, (0,) * n_primes, 0)]
+    ready = []
+    while True:
+        while frontier and (not ready or frontier[0][0] < ready[0][0]):
+            lower_bound, exponents, last = heapq.heappop(frontier)
+            heapq.heappush(ready, (complexity(lower_bound, exponents), exponents))
+            for idx in range(last, n_primes):
+                exponent = exponents[idx]
+                if exponent:
+                    candidates = (exponent + (1 if exponent > 0 else -1),)
+                else:
+                    candidates = (1, -1)
+                for candidate in candidates:
+                    if bounds[idx] is None or abs(candidate) <= bounds[idx]:
+                        child = exponents[:idx] + (candidate,) + exponents[idx + 1 :]
+                        heapq.heappush(
+                            frontier, (lower_bound + weights[idx], child, idx)
+                        )
+
+        if not ready:
+            return
+
+        exponents = heapq.heappop(ready)[1]
+        yield JIPitch(exponents, val_border, multiply)
 
 
 """
@@ -3111,9 +4999,15 @@ def find_best_voice_leading(pitches: tuple, tonal_range: tuple) -> tuple:
 """
 
 
+# pitches that are written down by hand usually live long, therefore
+# they share their vectors (see Monzo.share_vector)
+
+
 def r(num: int, den: int, val_border: int = 1, multiply: float = None) -> JIPitch:
-    return JIPitch.from_ratio(num, den, val_border, multiply)
+    return JIPitch.from_ratio(num, den, val_border, multiply).share_vector()
 
 
 def m(*num: int, val_border: int = 1, multiply: float = None) -> JIPitch:
-    return JIPitch.from_monzo(*num, val_border=val_border, multiply=multiply)
+    return JIPitch.from_monzo(
+        *num, val_border=val_border, multiply=multiply
+    ).share_vector()
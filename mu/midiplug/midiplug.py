@@ -18,6 +18,7 @@ import os
 import subprocess
 
 import mido
+import numpy as np
 
 __directory = os.path.dirname(os.path.abspath(__file__))
 with open(os.path.join(__directory, "", "../mel/12edo"), "r") as f:
@@ -56,7 +57,9 @@ class MidiTone(old.Tone):
             channel=channel,
         )
 
-    def control_messages(self, channel: int, n_points: int) -> list:
+    def control_messages(
+        self, channel: int, n_points: int, tolerance: float = None
+    ) -> list:
         """Generate control messages for a particular tone.
 
         Since tones can be distributed on different midi channels, the respective
@@ -64,6 +67,11 @@ class MidiTone(old.Tone):
         points the tone lasts in the respective grid for control messages that
         dynamically change within the tone.
 
+        If tolerance isn't None, dynamically changing values only get a new
+        message when they differ more than tolerance (in steps of the
+        control value 0 - 127) from the last sent value (see
+        interpolations.simplify_by_tolerance).
+
         Return list of lists where each sublist represents one tick. Each
         tick contains control messages that are supposed to get send at this
         particular tick.
@@ -84,17 +92,26 @@ class MidiTone(old.Tone):
                     )
 
                 elif isinstance(value, infit.InfIt):
-                    for n in range(n_points):
-                        local_value = next(value)
-                        if local_value is not None:
-                            messages_per_tick[n].append(
-                                self.make_control_message(arg, local_value, channel)
-                            )
+                    values_per_tick = tuple(
+                        (n, local_value)
+                        for n, local_value in enumerate(
+                            next(value) for i in range(n_points)
+                        )
+                        if local_value is not None
+                    )
+                    for n, local_value in self._simplify_control_values(
+                        arg, values_per_tick, tolerance
+                    ):
+                        messages_per_tick[n].append(
+                            self.make_control_message(arg, local_value, channel)
+                        )
 
                 elif isinstance(value, interpolations.InterpolationLine):
-
-                    for n, local_value in enumerate(
-                        value(n_points, interpolation_type="points")
+                    values_per_tick = tuple(
+                        enumerate(value(n_points, interpolation_type="points"))
+                    )
+                    for n, local_value in self._simplify_control_values(
+                        arg, values_per_tick, tolerance
                     ):
                         messages_per_tick[n].append(
                             self.make_control_message(arg, local_value, channel)
@@ -108,6 +125,26 @@ class MidiTone(old.Tone):
 
         return list(list(tick) for tick in messages_per_tick)
 
+    def _simplify_control_values(
+        self, arg: str, values_per_tick: tuple, tolerance: float
+    ) -> tuple:
+        """Return only the (tick, value) - pairs that are needed within tolerance."""
+
+        if tolerance is None or not values_per_tick:
+            return values_per_tick
+
+        boundaries = self._init_args[arg][0]
+        difference = boundaries[1] - boundaries[0]
+        control_values = tuple(
+            127 * (value - boundaries[0]) / difference for n, value in values_per_tick
+        )
+        simplified = interpolations.simplify_by_tolerance(control_values, tolerance)
+        return tuple(
+            pair
+            for nth, pair in enumerate(values_per_tick)
+            if nth == 0 or simplified[nth] != simplified[nth - 1]
+        )
+
 
 class _SynthesizerMidiTone(abc.ABCMeta):
     """Metaclass for Tone - objects that are intented to generate midi output."""
@@ -300,8 +337,10 @@ class DivaTone(MidiTone, metaclass=_SynthesizerMidiTone):
         "osc_tune_mod_depth2": ((-24, 24), 32),
     }
 
-    def control_messages(self, channel: int, n_points: int, midi_key: int) -> tuple:
-        messages_per_tick = super().control_messages(channel, n_points)
+    def control_messages(
+        self, channel: int, n_points: int, midi_key: int, tolerance: float = None
+    ) -> tuple:
+        messages_per_tick = super().control_messages(channel, n_points, tolerance)
         cent_deviation = AbstractPitch.ratio2ct(self.pitch.freq / _12edo_freq[midi_key])
         assert cent_deviation > -100 and cent_deviation < 100
         percentage = (cent_deviation + 100) / 200
@@ -500,8 +539,12 @@ class MidiFile(abc.ABC):
         sequence: tuple,
         available_midi_notes: tuple = tuple(range(128)),
         tie: bool = False,
+        pitch_bend_changes_only: bool = False,
+        pitch_bend_tolerance: float = None,
+        control_tolerance: float = None,
     ):
         self.__available_midi_notes = available_midi_notes
+        self.__pitch_bend_changes_only = pitch_bend_changes_only
         if tie:
             sequence = MidiFile.discard_pauses_and_tie_sequence(tuple(sequence))
         else:
@@ -511,14 +554,15 @@ class MidiFile(abc.ABC):
         self.__duration = float(sum(t.delay for t in sequence))
         n_hits = int(self.__duration // gridsize)
         n_hits += self.delay_between_control_messages_and_note_on_message + 2
-        self.__grid = tuple(i * gridsize for i in range(0, n_hits))
+        # the grid is only virtual: tick n is at n * gridsize
+        self.__n_hits = n_hits
         self.__gridsize = gridsize
         self.__grid_position_per_tone = self.detect_grid_position(
-            sequence, self.__grid, self.__duration
+            sequence, gridsize, n_hits
         )
         self.__amount_available_midi_notes = len(available_midi_notes)
         self.__sequence = sequence
-        self.__overlapping_dict = MidiFile.mk_overlapping_dict(filtered_sequence)
+        self.__overlapping_dict = MidiFile.mk_overlapping_dict(sequence)
         self.__midi_keys_dict = MidiFile.mk_midi_key_dictionary(
             set(t.pitch for t in filtered_sequence),
             available_midi_notes,
@@ -538,18 +582,25 @@ class MidiFile(abc.ABC):
 
         n_points_per_tone = tuple(b - a for a, b in self.__grid_position_per_tone)
         self.__control_messages = self.mk_control_messages_per_tone(
-            filtered_sequence, n_points_per_tone
+            filtered_sequence, n_points_per_tone, control_tolerance
         )
 
         self.__note_on_off_messages = self.mk_note_on_off_messages(
             filtered_sequence, self.keys
         )
         self.__pitch_bending_per_tone = self.detect_pitch_bending_per_tone(
-            filtered_sequence, self.__gridsize, self.__grid_position_per_tone
+            filtered_sequence,
+            self.__gridsize,
+            self.__grid_position_per_tone,
+            pitch_bend_tolerance,
         )
-        self.__pitch_bending_per_channel = self.distribute_pitch_bends_on_channels(
+        if pitch_bend_changes_only:
+            distribute_pitch_bends = self.distribute_pitch_bend_changes_on_channels
+        else:
+            distribute_pitch_bends = self.distribute_pitch_bends_on_channels
+        self.__pitch_bending_per_channel = distribute_pitch_bends(
             self.__pitch_bending_per_tone,
-            self.__grid,
+            self.__n_hits,
             self.__grid_position_per_tone,
             self.__gridsize,
         )
@@ -577,12 +628,10 @@ class MidiFile(abc.ABC):
         return tuple(new)
 
     def distribute_pitch_bends_on_channels(
-        self, pitch_bends_per_tone, grid, grid_position_per_tone, gridsize
+        self, pitch_bends_per_tone, n_hits: int, grid_position_per_tone, gridsize
     ) -> tuple:
         channels = itertools.cycle(range(len(self.available_channel)))
-        pitches_per_channels = list(
-            list(0 for j in range(len(grid))) for i in self.available_channel
-        )
+        pitches_per_channels = list([0] * n_hits for i in self.available_channel)
         for position, pitch_bends in zip(grid_position_per_tone, pitch_bends_per_tone):
             channel = next(channels)
             start = (
@@ -594,11 +643,6 @@ class MidiFile(abc.ABC):
         # transform to pitch_bending midi - messages
         first = True
         pitch_bending_messages = []
-        total_range = MidiFile.maximum_cent_deviation * 2
-        # total_range = MidiFile.maximum_cent_deviation * 1
-        warn = "Maximum pitch bending is {0} cents up or down!".format(
-            MidiFile.maximum_pitch_bending
-        )
         standardmessage0 = tuple(
             mido.Message("pitchwheel", channel=channel_number, pitch=0, time=0)
             for channel_number in self.available_channel
@@ -617,21 +661,10 @@ class MidiFile(abc.ABC):
                 else:
                     time = 0
                 if cent_deviation != 0:
-                    pitch_percent = (
-                        cent_deviation + MidiFile.maximum_cent_deviation
-                    ) / total_range
-                    if pitch_percent > 1:
-                        pitch_percent = 1
-                        logging.warn(warn)
-                    if pitch_percent < 0:
-                        pitch_percent = 0
-                        logging.warn(warn)
-                    midi_pitch = int(MidiFile.maximum_pitch_bending * pitch_percent)
-                    midi_pitch -= MidiFile.maximum_pitch_bending_positive
                     msg = mido.Message(
                         "pitchwheel",
                         channel=channel_number,
-                        pitch=midi_pitch,
+                        pitch=MidiFile.convert_cents2midi_pitch(cent_deviation),
                         time=time,
                     )
                 else:
@@ -649,10 +682,103 @@ class MidiFile(abc.ABC):
         pitch_bending_messages = tuple(reversed(pitch_bending_messages))
         return pitch_bending_messages
 
+    @staticmethod
+    def convert_cents2midi_pitch(cent_deviation: float) -> int:
+        """Convert a cent deviation to the value of a pitchwheel message."""
+        total_range = MidiFile.maximum_cent_deviation * 2
+        warn = "Maximum pitch bending is {0} cents up or down!".format(
+            MidiFile.maximum_pitch_bending
+        )
+        pitch_percent = (cent_deviation + MidiFile.maximum_cent_deviation) / total_range
+        if pitch_percent > 1:
+            pitch_percent = 1
+            logging.warn(warn)
+        if pitch_percent < 0:
+            pitch_percent = 0
+            logging.warn(warn)
+        midi_pitch = int(MidiFile.maximum_pitch_bending * pitch_percent)
+        return midi_pitch - MidiFile.maximum_pitch_bending_positive
+
+    def distribute_pitch_bend_changes_on_channels(
+        self, pitch_bends_per_tone, n_hits: int, grid_position_per_tone, gridsize
+    ) -> tuple:
+        """Return pitchwheel messages only for ticks where a channel changes its bend.
+
+        Unlike distribute_pitch_bends_on_channels, which makes one message per
+        channel and tick, the result contains one tuple per channel with
+        (tick, message) - pairs. Every channel gets reset to 0 at the first tick.
+        Later tones overwrite the pitch bends of earlier tones on the same channel,
+        exactly like in distribute_pitch_bends_on_channels, and channels fall back
+        to 0 in ticks without any tone. In distribute_pitch_bends_on_channels
+        the messages of the last channel carry the delta time of every tick,
+        so they sound one tick later. They are moved here as well, and the last
+        channel gets another 0 at the last tick, so that trailing rests don't
+        get lost. All messages have time=0, the delta times are set by
+        mk_complete_messages.
+        """
+        channels = itertools.cycle(range(len(self.available_channel)))
+        # only the ticks where a tone is playing are saved
+        cents_per_channel = tuple({} for i in self.available_channel)
+        for position, pitch_bends in zip(grid_position_per_tone, pitch_bends_per_tone):
+            channel = next(channels)
+            start = (
+                position[0] + self.delay_between_control_messages_and_note_on_message
+            )
+            end = position[1] + self.delay_between_control_messages_and_note_on_message
+            cents_per_channel[channel].update(zip(range(start, end), pitch_bends))
+
+        pitch_bending_messages = []
+        last_channel = self.available_channel[-1]
+        for channel_number, cents_per_tick in zip(
+            self.available_channel, cents_per_channel
+        ):
+            changes = [(0, 0)]
+            last_tick = 0
+            for tick in sorted(cents_per_tick):
+                midi_pitch = 0
+                if cents_per_tick[tick] != 0:
+                    midi_pitch = MidiFile.convert_cents2midi_pitch(cents_per_tick[tick])
+                # the pitch bend returns to 0 after the last tone has stopped
+                if tick > last_tick + 1 and changes[-1][1] != 0:
+                    changes.append((last_tick + 1, 0))
+                if midi_pitch != changes[-1][1]:
+                    if changes[-1][0] == tick:
+                        changes[-1] = (tick, midi_pitch)
+                    else:
+                        changes.append((tick, midi_pitch))
+                last_tick = tick
+            if changes[-1][1] != 0:
+                changes.append((last_tick + 1, 0))
+            if channel_number == last_channel:
+                if changes[-1][0] < n_hits - 1:
+                    changes.append((n_hits - 1, 0))
+                changes = [(tick + 1, pitch) for tick, pitch in changes]
+            pitch_bending_messages.append(
+                tuple(
+                    (
+                        tick,
+                        mido.Message(
+                            "pitchwheel", channel=channel_number, pitch=pitch, time=0
+                        ),
+                    )
+                    for tick, pitch in changes
+                )
+            )
+        return tuple(pitch_bending_messages)
+
     def detect_pitch_bending_per_tone(
-        self, sequence, gridsize: float, grid_position_per_tone: tuple
+        self,
+        sequence,
+        gridsize: float,
+        grid_position_per_tone: tuple,
+        tolerance: float = None,
     ) -> tuple:
-        """Return tuple filled with tuples that contain cent deviation per step."""
+        """Return tuple filled with tuples that contain cent deviation per step.
+
+        If tolerance isn't None, the cent deviation is only changed when it
+        differs more than tolerance cents from the last value
+        (see interpolations.simplify_by_tolerance).
+        """
 
         def mk_interpolation(obj, size):
 
@@ -675,6 +801,10 @@ class MidiFile(abc.ABC):
             glissando = mk_interpolation(tone.glissando, size)
             vibrato = mk_interpolation(tone.vibrato, size)
             resulting_cents = tuple(a + b for a, b in zip(glissando, vibrato))
+            if tolerance is not None:
+                resulting_cents = interpolations.simplify_by_tolerance(
+                    resulting_cents, tolerance
+                )
             pitch_bending.append(resulting_cents)
 
         return tuple(pitch_bending)
@@ -732,27 +862,25 @@ class MidiFile(abc.ABC):
         return tuple(messages)
 
     @staticmethod
-    def detect_grid_position(sequence: tuple, grid: tuple, duration: float) -> tuple:
-        def find_closest_point(points, time):
-            pos = bisect.bisect_right(points, time)
-            try:
-                return min(
-                    (
-                        (abs(time - points[pos]), pos),
-                        (abs(time - points[pos - 1]), pos - 1),
-                    ),
-                    key=operator.itemgetter(0),
-                )[1]
-            except IndexError:
-                # if pos is len(points) + 1
-                return pos - 1
-
-        delays = tuple(float(tone.delay) for tone in sequence)
-        starts = tuple(itertools.accumulate((0,) + delays))[:-1]
-        durations = tuple(float(tone.duration) for tone in sequence)
-        endings = tuple(s + d for s, d in zip(starts, durations))
-        start_points = tuple(find_closest_point(grid, s) for s in starts)
-        end_points = tuple(find_closest_point(grid, e) for e in endings)
+    def detect_grid_position(sequence: tuple, gridsize: float, n_hits: int) -> tuple:
+        """Return the closest ticks of the start and the end of every tone.
+
+        The grid has n_hits ticks with the distance gridsize. Positions are
+        calculated with tools.find_closest_grid_index, without making the grid
+        itself. Rests don't get any positions.
+        """
+
+        def find_closest_points(times: np.ndarray) -> tuple:
+            positions = tools.find_closest_grid_index(times, gridsize)
+            return tuple(np.clip(positions, 0, n_hits - 1).tolist())
+
+        delays = np.array(tuple(float(tone.delay) for tone in sequence), dtype=float)
+        durations = np.array(
+            tuple(float(tone.duration) for tone in sequence), dtype=float
+        )
+        starts = np.concatenate(((0,), np.cumsum(delays)[:-1]))
+        start_points = find_closest_points(starts)
+        end_points = find_closest_points(starts + durations)
         zipped = tuple(zip(start_points, end_points))
         return tuple(
             start_end
@@ -765,11 +893,11 @@ class MidiFile(abc.ABC):
         return tuple(self.__sequence)
 
     def mk_control_messages_per_tone(
-        self, sequence: tuple, n_points_per_tone: tuple
+        self, sequence: tuple, n_points_per_tone: tuple, tolerance: float = None
     ) -> tuple:
         channels = itertools.cycle(self.available_channel)
         return tuple(
-            tone.control_messages(next(channels), n_points)
+            tone.control_messages(next(channels), n_points, tolerance)
             for tone, n_points in zip(sequence, n_points_per_tone)
         )
 
@@ -793,20 +921,23 @@ class MidiFile(abc.ABC):
 
     @staticmethod
     def mk_overlapping_dict(sequence) -> dict:
+        """Return for every tone the indices of all earlier tones that still sound.
+
+        Rests only count for the absolute position of the following tones.
+        They don't get an entry in the dictionary and don't count for the
+        indices, so that the indices are the same as in the filtered sequence.
+        """
         delays = tuple(float(t.delay) for t in sequence)
-        absolute_delays = tuple(
-            b - a for a, b in zip(delays, delays[1:] + (sum(delays),))
+        starts = tools.accumulate_from_zero(delays)[:-1]
+        intervals = tuple(
+            (start, start + float(tone.duration))
+            for start, tone in zip(starts, sequence)
+            if not tone.pitch.is_empty
         )
-        overlapping_dict = {i: [] for i, t in enumerate(sequence)}
-        for i, tone in enumerate(sequence):
-            if tone.delay < tone.duration:
-                ending = delays[i] + tone.duration
-                for j, abs_delay in enumerate(absolute_delays[i + 1 :]):
-                    if abs_delay < ending:
-                        overlapping_dict[i + j + 1].append(i)
-                    else:
-                        break
-        return overlapping_dict
+        return {
+            i: list(overlapping)
+            for i, overlapping in enumerate(tools.find_overlapping_intervals(intervals))
+        }
 
     @staticmethod
     def distribute_tones_on_midi_keys(
@@ -815,6 +946,49 @@ class MidiFile(abc.ABC):
         available_midi_notes,
         overlapping_dict,
         midi_keys_dict,
+    ) -> tuple:
+        """Return one midi key per tone, so that simultaneous tones never share a key.
+
+        Every tone gets the best ranked key of its pitch in midi_keys_dict that
+        isn't used by any of the earlier tones in overlapping_dict. Since tones
+        are visited in the order of their start, this only fails if there are
+        more simultaneous tones than available keys, which raises a ValueError.
+        If a tone doesn't find any free key for other reasons (for
+        overlapping_dicts that don't describe tones in time), the slower
+        distribute_tones_on_midi_keys_by_backtracking is tried.
+        """
+        converted_keys = []
+        for index, tone in enumerate(sequence):
+            simultan_tones = overlapping_dict[index]
+            busy_keys = set(converted_keys[idx] for idx in simultan_tones)
+            for key in midi_keys_dict[tone.pitch]:
+                if key not in busy_keys:
+                    converted_keys.append(key)
+                    break
+            else:
+                # if all busy tones are sounding at the same time, there
+                # are too many simultan tones and backtracking can't help
+                if all(
+                    set(simultan_tones[:nth]).issubset(overlapping_dict[idx])
+                    for nth, idx in enumerate(simultan_tones)
+                ):
+                    raise ValueError("No solution found! Too many simultan tones.")
+                return MidiFile.distribute_tones_on_midi_keys_by_backtracking(
+                    sequence,
+                    amount_available_midi_notes,
+                    available_midi_notes,
+                    overlapping_dict,
+                    midi_keys_dict,
+                )
+        return tuple(available_midi_notes[key] for key in converted_keys)
+
+    @staticmethod
+    def distribute_tones_on_midi_keys_by_backtracking(
+        sequence,
+        amount_available_midi_notes,
+        available_midi_notes,
+        overlapping_dict,
+        midi_keys_dict,
     ) -> tuple:
         def convert_keys(keys) -> tuple:
             return tuple(midi_keys_dict[t.pitch][key] for t, key in zip(sequence, keys))
@@ -832,8 +1006,14 @@ class MidiFile(abc.ABC):
 
         keys = [0]
         amount_tones = len(sequence)
-        while len(keys) < amount_tones:
-            if is_alright(keys, overlapping_dict) is True:
+        if amount_tones == 0:
+            return tuple([])
+        while True:
+            alright = is_alright(keys, overlapping_dict)
+            # the last tone has to be checked as well
+            if alright and len(keys) == amount_tones:
+                break
+            if alright:
                 keys.append(0)
             else:
                 while keys[-1] + 1 == amount_available_midi_notes:
@@ -903,6 +1083,15 @@ class MidiFile(abc.ABC):
         assert length_seq == len(note_on_off_messages)
         assert length_seq == len(tuning_messages)
 
+        if self.__pitch_bend_changes_only:
+            return self.mk_complete_messages_with_pitch_bend_changes(
+                control_messages,
+                note_on_off_messages,
+                pitch_bending_per_channel,
+                tuning_messages,
+                grid_position_per_tone,
+            )
+
         messages_per_tick = list(zip(*reversed(pitch_bending_per_channel)))
         messages_per_tick = [list(s) for s in messages_per_tick]
 
@@ -928,6 +1117,64 @@ class MidiFile(abc.ABC):
         messages_per_tick = tuple(tuple(reversed(tick)) for tick in messages_per_tick)
         return tuple(item for sublist in messages_per_tick for item in sublist)
 
+    def mk_complete_messages_with_pitch_bend_changes(
+        self,
+        control_messages,
+        note_on_off_messages,
+        pitch_bend_changes_per_channel,
+        tuning_messages,
+        grid_position_per_tone,
+    ) -> tuple:
+        """Sort all messages by their tick and set the delta times of the messages.
+
+        Counterpart of mk_complete_messages for the (tick, message) - pairs of
+        distribute_pitch_bend_changes_on_channels. Only ticks that contain any
+        message are visited.
+        """
+        messages_per_tick = {}
+        for note_on_off, control_per_tick, tuning, grid_position in zip(
+            note_on_off_messages,
+            control_messages,
+            tuning_messages,
+            grid_position_per_tone,
+        ):
+            note_on, note_off = note_on_off
+            start, stop = grid_position
+            messages_per_tick.setdefault(
+                start + self.delay_between_control_messages_and_note_on_message, []
+            ).append(note_on)
+            messages_per_tick.setdefault(start, []).extend(tuning)
+
+            for position, c_msg in zip(range(start, stop), control_per_tick):
+                if c_msg:
+                    messages_per_tick.setdefault(position, []).extend(c_msg)
+
+            messages_per_tick.setdefault(
+                stop + self.delay_between_control_messages_and_note_on_message, []
+            ).append(note_off)
+
+        # pitch bends come after all other messages of the same tick,
+        # like in mk_complete_messages
+        messages_per_tick = {
+            tick: list(reversed(messages))
+            for tick, messages in messages_per_tick.items()
+        }
+        for pitch_bend_changes in pitch_bend_changes_per_channel:
+            for tick, message in pitch_bend_changes:
+                messages_per_tick.setdefault(tick, []).append(message)
+
+        messages = []
+        last_tick = 0
+        for tick in sorted(messages_per_tick):
+            for nth, message in enumerate(messages_per_tick[tick]):
+                if nth == 0:
+                    message = message.copy(time=tick - last_tick)
+                elif message.time != 0:
+                    message = message.copy(time=0)
+                messages.append(message)
+            last_tick = tick
+        return tuple(messages)
+
     @property
     def miditrack(self) -> mido.MidiFile:
         return self.__miditrack
@@ -1094,9 +1341,18 @@ class Bliss(NonSysexTuningMidiFile):
         super().__init__(sequence, tuple(range(128), **kwargs))
 
     def detect_pitch_bending_per_tone(
-        self, sequence, gridsize: float, grid_position_per_tone: tuple
+        self,
+        sequence,
+        gridsize: float,
+        grid_position_per_tone: tuple,
+        tolerance: float = None,
     ) -> tuple:
-        """Return tuple filled with tuples that contain cent deviation per step."""
+        """Return tuple filled with tuples that contain cent deviation per step.
+
+        If tolerance isn't None, the cent deviation is only changed when it
+        differs more than tolerance cents from the last value
+        (see interpolations.simplify_by_tolerance).
+        """
 
         def mk_interpolation(obj, size):
 
@@ -1119,6 +1375,10 @@ class Bliss(NonSysexTuningMidiFile):
             glissando = mk_interpolation(tone.glissando, size)
             vibrato = mk_interpolation(tone.vibrato, size)
             resulting_cents = tuple(a + b for a, b in zip(glissando, vibrato))
+            if tolerance is not None:
+                resulting_cents = interpolations.simplify_by_tolerance(
+                    resulting_cents, tolerance
+                )
             pitch_bending.append(resulting_cents)
 
         return tuple(pitch_bending)
@@ -1131,10 +1391,10 @@ class Diva(NonSysexTuningMidiFile):
         super().__init__(sequence, tuple(range(128), **kwargs))
 
     def mk_control_messages_per_tone(
-        self, sequence: tuple, n_points_per_tone: tuple
+        self, sequence: tuple, n_points_per_tone: tuple, tolerance: float = None
     ) -> tuple:
         channels = itertools.cycle(self.available_channel)
         return tuple(
-            tone.control_messages(next(channels), n_points, key)
+            tone.control_messages(next(channels), n_points, key, tolerance)
             for tone, n_points, key in zip(sequence, n_points_per_tone, self.keys)
         )
@@ -166,25 +166,25 @@ class InterpolationLine(muobjects.MUList):
         muobjects.MUList.__init__(self, iterable)
 
     def interpolate_by_grid_size(self, gridsize: float) -> tuple:
-        def find_closest_point(points, time):
-            pos = bisect.bisect_right(points, time)
-            try:
-                return min(
-                    (
-                        (abs(time - points[pos]), pos),
-                        (abs(time - points[pos - 1]), pos - 1),
-                    ),
-                    key=operator.itemgetter(0),
-                )[1]
-            except IndexError:
-                # if pos is len(points) + 1
-                return pos
-
-        points = Linear()(0, float(self.duration), int(self.duration / gridsize))
-        absolute_delays = self.delay.convert2absolute()
-        positions = tuple(
-            find_closest_point(points, float(delay)) for delay in absolute_delays
+        duration = float(self.duration)
+        n_points = int(self.duration / gridsize)
+        # the delays are rounded to the closest of n_points points, which are
+        # equally spaced between 0 and duration; delays after the last
+        # point get the position n_points
+        absolute_delays = np.array(
+            tuple(float(delay) for delay in self.delay.convert2absolute())
         )
+        if n_points < 2:
+            positions = np.full(len(absolute_delays), n_points)
+        else:
+            positions = np.where(
+                absolute_delays >= duration,
+                n_points,
+                tools.find_closest_grid_index(
+                    absolute_delays, duration / (n_points - 1)
+                ),
+            )
+        positions = tuple(positions.astype(int).tolist())
         interpolation_size = tuple(b - a for a, b in zip(positions, positions[1:]))
         interpolations = tuple(
             item0.interpolate(item1, steps + 1)[:-1]
@@ -457,3 +457,31 @@ class FallingRising(SimpleCurve):
             FloatInterpolationEvent(0.5, self.minima, self.interpolation_type),
             FloatInterpolationEvent(0, self.maxima, self.interpolation_type),
         )
+
+
+def simplify_by_tolerance(values: tuple, tolerance: float) -> tuple:
+    """Hold every value until the following values differ more than tolerance.
+
+    Midi receivers keep a controller or pitch bend value until the next
+    message arrives. Therefore only the positions where the returned values
+    change need a message, while no value differs more than tolerance from
+    the original curve. The first and the last value are always kept.
+
+    >>> simplify_by_tolerance((0, 0.5, 1, 1.5, 2, 2.2), 1)
+    (0, 0, 0, 1.5, 1.5, 2.2)
+    """
+
+    if tolerance < 0:
+        raise ValueError("Tolerance has to be positive.")
+
+    simplified = []
+    for value in values:
+        if not simplified or abs(value - simplified[-1]) > tolerance:
+            simplified.append(value)
+        else:
+            simplified.append(simplified[-1])
+
+    if simplified:
+        simplified[-1] = values[-1]
+
+    return tuple(simplified)
@@ -1,25 +1,147 @@
+import array
+import functools
+import itertools
+import math
+import os
+
+import numpy as np
 import primesieve
 
 """
 factorise and factors - function from the pyprimes - library.
 (https://github.com/uzumaxy/pyprimes/blob/master/src/pyprimes/factors.py)
-replaced pyprimes.primes by primesieve.Iterator(), which improves
-speed about a factor of 10.
+Integers until the bound of the module-level SPF_SIEVE are factorised by
+looking up their smallest prime factor, bigger integers are factorised by
+trial division with the primes of PRIME_TABLE and the results are memoized.
 """
 
-"""
-def __load_precalculated_factors():
-    import json
-    import os
-    dirname = os.path.dirname(__file__)
-    f_name = "primes.json"
-    with open("{0}/{1}".format(dirname, f_name), "r") as f:
-        precalculated_factors = f.read()
-    return json.loads(precalculated_factors)
 
+class PrimeTable(object):
+    """Lazily growing table of prime numbers.
 
-__PRECALCULATED_FACTORS = __load_precalculated_factors()
-"""
+    The table saves all primes until its current limit and additionally
+    for every integer until the limit how many primes are smaller or equal
+    than this integer. Therefore looking up the nth - prime or counting
+    primes are O(1) - operations. Only if a request exceeds the current limit
+    the table gets extended in one bulk call of primesieve, where the new
+    limit is at least twice as big as the old limit.
+
+    Requests that are bigger than max_limit are passed
+    to primesieve directly.
+
+    >>> table = PrimeTable()
+    >>> table.nth_prime(0)
+    2
+    >>> table.nth_prime(10)
+    31
+    >>> table.count_primes(10)
+    4
+    >>> table.n_primes(5)
+    (2, 3, 5, 7, 11)
+    """
+
+    max_limit = 2 ** 22
+
+    def __init__(self, limit: int = 1024) -> None:
+        self._limit = 1
+        self._primes = []
+        # amount of primes that are smaller or equal than 0 and 1
+        self._prime_counts = array.array("i", (0, 0))
+        self.extend(limit)
+
+    def __repr__(self) -> str:
+        return "PrimeTable({0})".format(self.limit)
+
+    def __len__(self) -> int:
+        return len(self._primes)
+
+    def __iter__(self):
+        """Iterate over all primes.
+
+        After the primes of the table further primes are generated by primesieve.
+        """
+        n_primes, limit = len(self._primes), self._limit
+        for idx in range(n_primes):
+            yield self._primes[idx]
+        iterator = primesieve.Iterator()
+        iterator.skipto(limit)
+        while True:
+            yield iterator.next_prime()
+
+    @property
+    def limit(self) -> int:
+        """Every prime that is smaller or equal than the limit is saved."""
+        return self._limit
+
+    @staticmethod
+    def estimate_nth_prime(n: int) -> int:
+        """Return an upper bound for the nth - prime (counting from 0)."""
+        n += 1
+        if n < 6:
+            return 13
+        log_n = math.log(n)
+        return int(n * (log_n + math.log(log_n))) + 1
+
+    def extend(self, limit: int) -> None:
+        """Sieve all primes until the new limit.
+
+        The new limit is at least twice as big as the current limit and
+        not bigger than max_limit.
+        """
+
+        limit = min((max((limit, self._limit * 2)), self.max_limit))
+        if limit > self._limit:
+            n_primes = len(self._primes)
+            new_primes = tuple(primesieve.primes(self._limit + 1, limit))
+            counts = self._prime_counts
+            previous = self._limit
+            for prime in new_primes:
+                counts.extend(itertools.repeat(n_primes, prime - previous - 1))
+                n_primes += 1
+                counts.append(n_primes)
+                previous = prime
+            counts.extend(itertools.repeat(n_primes, limit - previous))
+            self._primes.extend(new_primes)
+            self._limit = limit
+
+    def nth_prime(self, n: int) -> int:
+        """Return the nth - prime (counting from 0)."""
+        if n >= len(self._primes):
+            self.extend(self.estimate_nth_prime(n))
+        try:
+            return self._primes[n]
+        except IndexError:
+            return primesieve.nth_prime(n + 1)
+
+    def n_primes(self, n: int) -> tuple:
+        """Return the first n - primes."""
+        if n > len(self._primes):
+            self.extend(self.estimate_nth_prime(n))
+        if n <= len(self._primes):
+            return tuple(self._primes[:n])
+        return tuple(primesieve.n_primes(n))
+
+    def count_primes(self, n: int) -> int:
+        """Count how many primes are smaller or equal than n."""
+        if n < 2:
+            return 0
+        elif n > self._limit:
+            self.extend(n)
+        try:
+            return self._prime_counts[n]
+        except IndexError:
+            return primesieve.count_primes(n)
+
+    def index(self, prime: int) -> int:
+        """Return the index of a prime (e.g. the inverse of PrimeTable.nth_prime)."""
+        idx = self.count_primes(prime) - 1
+        if self.nth_prime(idx) != prime:
+            raise ValueError("{0} is not a prime number.".format(prime))
+        return idx
+
+
+# module-level table that is shared by all modules which need fast access to primes
+PRIME_TABLE = PrimeTable()
 
 
 class Prime_Generator(object):
@@ -33,6 +155,129 @@ class Prime_Generator(object):
         return self
 
 
+class SmallestPrimeFactorSieve(object):
+    """Table with the smallest prime factor of every integer until a bound.
+
+    With the help of the table any integer that is smaller or equal than
+    the bound can be factorised in O(log n) by repeatedly dividing through
+    its smallest prime factor. The table needs 4 bytes per integer.
+
+    If a path is passed the table will be saved to this file (in the .npy -
+    format) and is memory - mapped from there. A saved table gets reused
+    in case it is at least as big as the requested bound.
+
+    >>> sieve = SmallestPrimeFactorSieve(100)
+    >>> sieve.smallest_prime_factor(91)
+    7
+    >>> sieve.factors(84)
+    ((2, 2), (3, 1), (7, 1))
+    """
+
+    def __init__(self, bound: int = 2 ** 16, path: str = None) -> None:
+        table = None
+        if path is not None and os.path.isfile(path):
+            table = np.load(path, mmap_mode="r")
+            if len(table) <= bound:
+                table = None
+
+        if table is None:
+            table = SmallestPrimeFactorSieve.mk_table(bound)
+            if path is not None:
+                np.save(path, table)
+                table = np.load(path, mmap_mode="r")
+
+        self._table = table
+        self._path = path
+
+    def __repr__(self) -> str:
+        return "SmallestPrimeFactorSieve({0})".format(self.bound)
+
+    @staticmethod
+    def mk_table(bound: int) -> np.ndarray:
+        """Sieve the smallest prime factor of every integer until the bound."""
+        table = np.zeros(bound + 1, dtype=np.uint32)
+        n_sieving_primes = PRIME_TABLE.count_primes(int(bound ** 0.5))
+        for prime in PRIME_TABLE.n_primes(n_sieving_primes):
+            multiples = table[prime * prime :: prime]
+            multiples[multiples == 0] = prime
+        # every integer that hasn't been marked is its own smallest prime factor
+        primes = np.flatnonzero(table == 0)
+        table[primes] = primes
+        return table
+
+    @property
+    def bound(self) -> int:
+        """Every integer that is smaller or equal than the bound is saved."""
+        return len(self._table) - 1
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    def smallest_prime_factor(self, n: int) -> int:
+        return int(self._table[n])
+
+    def factors(self, n: int) -> tuple:
+        """Return tuples of (prime, count) for a positive integer n <= bound."""
+        table = self._table
+        result = []
+        while n > 1:
+            prime = int(table[n])
+            count = 0
+            while n % prime == 0:
+                n //= prime
+                count += 1
+            result.append((prime, count))
+        return tuple(result)
+
+
+# module-level sieve for factorising small integers.
+# it can be replaced via the load_sieve function.
+SPF_SIEVE = SmallestPrimeFactorSieve()
+
+# maximal amount of saved factorisations of integers that are bigger than
+# the bound of SPF_SIEVE
+MEMO_SIZE = 2 ** 14
+
+
+def load_sieve(bound: int, path: str = None) -> SmallestPrimeFactorSieve:
+    """Replace the module-level sieve by a new sieve with a different bound.
+
+    If path is not None the sieve gets memory - mapped from this file.
+    """
+    global SPF_SIEVE
+    SPF_SIEVE = SmallestPrimeFactorSieve(bound, path)
+    return SPF_SIEVE
+
+
+@functools.lru_cache(maxsize=MEMO_SIZE)
+def _factors_above_bound(n: int) -> tuple:
+    bound = SPF_SIEVE.bound
+    result = []
+    for prime in PRIME_TABLE:
+        if prime * prime > n:
+            break
+
+        if n % prime == 0:
+            count = 0
+            while n % prime == 0:
+                count += 1
+                n //= prime
+            result.append((prime, count))
+            # the rest can be looked up in the sieve
+            if n <= bound:
+                return tuple(result) + SPF_SIEVE.factors(n)
+
+    result.append((n, 1))
+    return tuple(result)
+
+
+def _factors(n: int) -> tuple:
+    if n <= SPF_SIEVE.bound:
+        return SPF_SIEVE.factors(n)
+    return _factors_above_bound(n)
+
+
 def factorise(n: int) -> list:
     """factorise(integer) -> [list of factors]
 
@@ -62,31 +307,13 @@ def factors(n: int):
     is given as the only factor. For all other integer n, all of the factors
     returned are prime.
     """
-    # if n < 900000 - 1:
-    if False:
-        # pre = __PRECALCULATED_FACTORS[n]
-        # for fac in pre:
-        #     yield fac
+    if n in (0, 1, -1):
+        yield (n, 1)
         return
-    else:
-        if n in (0, 1, -1):
-            yield (n, 1)
-            return
-        elif n < 0:
-            yield (-1, 1)
-            n = -n
-        assert n >= 2
-        for p in Prime_Generator():
-            if p * p > n:
-                break
-            count = 0
-            while n % p == 0:
-                count += 1
-                n //= p
-            if count:
-                yield (p, count)
-        if n != 1:
-            yield (n, 1)
+    elif n < 0:
+        yield (-1, 1)
+        n = -n
+    yield from _factors(n)
 
 
 def is_prime(n: int) -> bool:
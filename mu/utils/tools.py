@@ -3,6 +3,7 @@
 import bisect
 import decimal
 import functools
+import heapq
 import itertools
 import math
 import operator
@@ -47,6 +48,28 @@ def find_closest_index(item: float, data: tuple, key=None) -> int:
         return indices[differences.index(min(differences))]
 
 
+def find_closest_grid_index(times: np.ndarray, gridsize: float) -> np.ndarray:
+    """Return the indices of the closest points of the grid 0, gridsize, 2 * gridsize.
+
+    The grid doesn't get made, but for every time the two neighbouring
+    points are calculated. In the middle of two points the later point
+    wins. The result is the same like find_closest_index with a tuple of
+    all points i * gridsize, including floating point errors of the points.
+
+    >>> find_closest_grid_index(np.array((0, 0.24, 0.25, 0.74)), 0.5)
+    array([0, 0, 1, 1])
+    """
+
+    times = np.asarray(times, dtype=float)
+    lower = np.floor(times / gridsize).astype(int)
+    # the division can be one point off because of floating point errors
+    lower = np.where(lower * gridsize > times, lower - 1, lower)
+    lower = np.where((lower + 1) * gridsize <= times, lower + 1, lower)
+    upper = lower + 1
+    is_upper = np.abs(times - (upper * gridsize)) <= np.abs(times - (lower * gridsize))
+    return np.where(is_upper, upper, lower)
+
+
 def igmkdir(path: str) -> None:
     """mkdir that ignores FileExistsError."""
     try:
@@ -467,3 +490,29 @@ def gaussian_window(size_per_half: int = 50) -> tuple:
     return tuple(
         map(float, _gaussian(1 + (math.ceil(size_per_half) * 2), size_per_half / 3))
     )
+
+
+def find_overlapping_intervals(intervals: tuple) -> tuple:
+    """Return for every interval the indices of all earlier intervals that overlap.
+
+    Intervals are (start, end) - pairs. Earlier intervals start before the
+    respective interval or at the same time with a smaller index. Intervals
+    that only touch each other don't overlap. Intervals are visited in the
+    order of their start, while a heap keeps all intervals that haven't
+    ended yet, therefore the function takes O(n log n) plus the size of
+    the result.
+
+    >>> find_overlapping_intervals(((0, 2), (1, 3), (2, 4), (5, 6)))
+    ((), (0,), (1,), ())
+    """
+
+    overlapping = [tuple([])] * len(intervals)
+    active = []
+    for index in sorted(range(len(intervals)), key=lambda idx: intervals[idx][0]):
+        start, end = intervals[index]
+        while active and active[0][0] <= start:
+            heapq.heappop(active)
+        overlapping[index] = tuple(sorted(idx for _, idx in active))
+        if end > start:
+            heapq.heappush(active, (end, index))
+    return tuple(overlapping)
@@ -97,6 +97,50 @@ class InheritanceTest(unittest.TestCase):
         compare_obj = test_class([n0.multiplied(fac), n1.multiplied(2)])
         self.assertEqual(test_obj0.multiplied(fac), compare_obj)
 
+    def test_iterable_method_dispatch(self):
+        """test whether elements of subclasses still use their own methods
+        and whether None - elements are skipped"""
+
+        pitch_test = self.PitchTest
+
+        class SubPitchTest(pitch_test):
+            def multiplied(self, arg):
+                return pitch_test(self.freq * arg * 2)
+
+        test_class = self.PitchTest.mk_iterable(list)
+        test_obj0 = test_class([self.PitchTest(200), SubPitchTest(200), None])
+        result = test_obj0.multiplied(2)
+        self.assertIsInstance(result, test_class)
+        self.assertEqual(result.freq, (400, 800))
+        self.assertEqual(test_class([]).freq, test_class([]))
+        self.assertEqual(test_class([]).multiplied(2), test_class([]))
+
+    def test_iterable_empty_pitches(self):
+        """test whether properties of containers, whose elements
+        return only None, return None"""
+
+        class EmptyPitchTest(abstract.AbstractPitch):
+            def calc(self):
+                return None
+
+            @property
+            def cents(self) -> None:
+                return None
+
+            @property
+            def is_empty(self) -> bool:
+                return True
+
+        empty_pitches = EmptyPitchTest.mk_iterable(list)(
+            [EmptyPitchTest(), EmptyPitchTest()]
+        )
+        self.assertIsNone(empty_pitches.freq)
+        self.assertIsNone(empty_pitches.cents)
+        self.assertEqual(empty_pitches.is_empty, (True, True))
+        test_class = self.PitchTest.mk_iterable(list)
+        self.assertIsNone(test_class([self.PitchTest(200)]).cents)
+        self.assertEqual(test_class([self.PitchTest(200)]).freq, (200,))
+
     def test_midi_conversion(self):
         """test whether the midi conversion function works properly"""
         f0 = 300
@@ -1,9 +1,12 @@
 import unittest
 
 from mu.mel import ji
+from mu.mel import mel
 
 from fractions import Fraction
+import itertools
 import json
+import math
 import os
 
 
@@ -19,6 +22,60 @@ class MonzoTest(unittest.TestCase):
         self.assertEqual(m1B, m1)
         self.assertEqual(m2B, m2)
 
+    def test_shared_vector(self):
+        m0 = ji.r(3, 2)
+        m1 = ji.JIPitch([-1, 1])
+        m2 = ji.r(6, 4)
+        # r and m share vectors, other constructors only on request
+        self.assertIs(m0._vector, m2._vector)
+        self.assertIs(m0._vector, ji.m(-1, 1)._vector)
+        self.assertIsNot(m0._vector, m1._vector)
+        self.assertIsNot((m0 + m0)._vector, ji.r(9, 4)._vector)
+        self.assertIs(m1.share_vector(), m1)
+        self.assertIs(m0._vector, m1._vector)
+        m3 = ji.Monzo([0, 1.0]).share_vector()
+        m4 = ji.Monzo([0, 1]).share_vector()
+        self.assertIsNot(m3._vector, m4._vector)
+        self.assertIs(type(m4._vector[-1]), int)
+        self.assertFalse(hasattr(m0, "__dict__"))
+        self.assertFalse(hasattr(ji.Monzo([1]), "__dict__"))
+        scale0 = ji.JIScale((ji.r(1, 1), ji.r(3, 2)), ji.r(2, 1))
+        scale1 = ji.JIScale((ji.r(3, 1), ji.r(1, 1)), ji.r(2, 1))
+        self.assertIs(scale0[1]._vector, scale1[1]._vector)
+
+    def test_cached_derived_values(self):
+        m0 = ji.r(5, 3)
+        # the dict for cached values is only made when it's needed
+        hash(m0)
+        self.assertFalse(hasattr(m0, "_cache"))
+        self.assertEqual(m0.ratio, Fraction(5, 3))
+        self.assertIs(m0.ratio, m0.ratio)
+        self.assertEqual(m0.factorised, (3, 5))
+        m0.val_border = 5
+        self.assertEqual(m0.ratio, Fraction(1, 1))
+        self.assertEqual(m0.factorised, (1,))
+        m0.val_border = 1
+        self.assertEqual(m0.ratio, Fraction(5, 3))
+        m0.multiply = 300
+        self.assertIs(m0.ratio, m0.ratio)
+        self.assertIsNot(m0.identity, m0.identity)
+        m0 += ji.r(3, 2)
+        self.assertEqual(m0.ratio, Fraction(5, 2))
+        scale = ji.JIMel((ji.r(5, 3), ji.r(7, 5)))
+        self.assertEqual(scale[0].ratio, Fraction(5, 3))
+        scale.val_border = 5
+        self.assertEqual(scale[0].ratio, Fraction(1, 1))
+        self.assertFalse(hasattr(ji.r(5, 3), "__dict__"))
+        try:
+            ji.CACHE_DERIVED_VALUES = False
+            m1 = ji.r(7, 4)
+            self.assertEqual(m1.float, 1.75)
+            hash(m1)
+            self.assertFalse(hasattr(m1, "_cache"))
+            self.assertFalse(hasattr(m1, "_hash"))
+        finally:
+            ji.CACHE_DERIVED_VALUES = True
+
     def test_hash(self):
         m0 = ji.Monzo([0, 1, -1], 2)
         m0B = ji.Monzo([0, 1, -1], 2)
@@ -290,6 +347,19 @@ class MonzoTest(unittest.TestCase):
         m1 = ji.Monzo((0, 1), 2)
         self.assertEqual(m0.float, 1.5)
         self.assertEqual(m1.float, 1.25)
+        m2 = ji.Monzo((400,), 2)
+        self.assertAlmostEqual(m2.float, 2 ** ((400 * math.log2(3)) % 1))
+
+    def test_cents(self):
+        m0 = ji.Monzo((-1, 1))
+        m1 = ji.Monzo((0, 1), 2)
+        m2 = ji.Monzo((2, 0, -1), 3)
+        m3 = ji.Monzo((-4,))
+        for monzo in (m0, m1, m2, m3):
+            self.assertAlmostEqual(monzo.cents, ji.JIPitch.ratio2ct(monzo.ratio))
+        m4 = ji.Monzo((0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1000), 2)
+        self.assertLess(m4.cents, 1200)
+        self.assertGreaterEqual(m4.cents, 0)
 
     def test_inverse(self):
         m0 = ji.Monzo([0, -1, 1, 3, 2, -3])
@@ -647,6 +717,229 @@ class JIPitchTest(unittest.TestCase):
         self.assertEqual(p0.differential(p1), p3)
 
 
+class MonzoArrayTest(unittest.TestCase):
+    pitches = (ji.r(3, 2), ji.r(5, 4), ji.r(7, 4), ji.r(1, 1), ji.r(9, 14))
+
+    def test_init(self):
+        ma = ji.MonzoArray(self.pitches)
+        self.assertEqual(len(ma), len(self.pitches))
+        self.assertEqual(tuple(ma), self.pitches)
+        self.assertEqual(ma[2], self.pitches[2])
+        self.assertEqual(tuple(ma[1:3]), self.pitches[1:3])
+        ma_from_tuples = ji.MonzoArray(((1,), (0, 1)), val_border=2)
+        self.assertEqual(ma_from_tuples.ratio, (Fraction(3, 2), Fraction(5, 4)))
+
+    def test_val_border(self):
+        pitches = tuple(p.set_val_border(2) for p in self.pitches)
+        ma = ji.MonzoArray(pitches)
+        self.assertEqual(ma.val_border, 2)
+        self.assertEqual(ma.ratio, tuple(p.ratio for p in pitches))
+        self.assertEqual(ji.MonzoArray(self.pitches, val_border=2).ratio, ma.ratio)
+        ma.val_border = 1
+        self.assertEqual(ma.ratio, tuple(p.ratio for p in self.pitches))
+        self.assertRaises(ValueError, ji.MonzoArray, (pitches[0], self.pitches[1]))
+
+    def test_math(self):
+        ma = ji.MonzoArray(self.pitches)
+        mb = ji.MonzoArray(tuple(reversed(self.pitches)))
+        self.assertEqual(
+            tuple(ma + mb),
+            tuple(p0 + p1 for p0, p1 in zip(self.pitches, reversed(self.pitches))),
+        )
+        self.assertEqual(
+            tuple(ma - mb),
+            tuple(p0 - p1 for p0, p1 in zip(self.pitches, reversed(self.pitches))),
+        )
+        self.assertEqual(
+            tuple(ma + ji.r(3, 2)), tuple(p + ji.r(3, 2) for p in self.pitches)
+        )
+        self.assertEqual(tuple(ma.scalar(3)), tuple(p.scalar(3) for p in self.pitches))
+        self.assertEqual(tuple(ma.inverse()), tuple(p.inverse() for p in self.pitches))
+        octave_equivalent = ji.MonzoArray(self.pitches, val_border=2)
+        self.assertRaises(ValueError, lambda: ma + octave_equivalent)
+
+    def test_export(self):
+        for val_border in (1, 2, 3):
+            pitches = tuple(p.set_val_border(val_border) for p in self.pitches)
+            ma = ji.MonzoArray(pitches)
+            self.assertEqual(ma.ratio, tuple(p.ratio for p in pitches))
+            for p, f, ct in zip(pitches, ma.float, ma.cents):
+                self.assertAlmostEqual(p.float, f)
+                self.assertAlmostEqual(p.cents, ct)
+
+    def test_harmonicity(self):
+        pitches = self.pitches + (ji.r(2, 1), ji.r(16, 15), ji.r(33, 35), ji.r(1, 6))
+        for val_border in (1, 2, 3):
+            pitches = tuple(p.set_val_border(val_border) for p in pitches)
+            for metric in ji.MonzoArray._harmonicity_metrics:
+                expected = tuple(
+                    getattr(p, "harmonicity_{0}".format(metric)) for p in pitches
+                )
+                result = ji.harmonicity(pitches, metric=metric)
+                self.assertEqual(len(result), len(expected))
+                for res, exp in zip(result, expected):
+                    self.assertAlmostEqual(res, exp)
+        self.assertRaises(ValueError, ji.harmonicity, pitches, "unknown")
+
+    def test_register(self):
+        pitches = self.pitches + (ji.r(2, 1), ji.r(33, 7), ji.r(1, 6), ji.r(64, 81))
+        references = (ji.r(1, 1), ji.r(3, 1), ji.r(7, 32), ji.r(11, 3))
+        for val_border in (1, 2, 3):
+            pitches = tuple(p.set_val_border(val_border) for p in pitches)
+            ma = ji.MonzoArray(pitches)
+            for prime in (2, 3):
+                self.assertEqual(
+                    tuple(ma.normalize(prime)),
+                    tuple(p.normalize(prime) for p in pitches),
+                )
+            for octave in (-2, 0, 1, 3):
+                self.assertEqual(
+                    tuple(ma.register(octave)),
+                    tuple(p.register(octave) for p in pitches),
+                )
+            for reference in references:
+                self.assertEqual(
+                    tuple(ma.move_to_closest_register(reference)),
+                    tuple(p.move_to_closest_register(reference) for p in pitches),
+                )
+        self.assertRaises(ValueError, ma.normalize, 4)
+        self.assertRaises(
+            ValueError, ma.move_to_closest_register, ji.r(3, 2, val_border=2)
+        )
+
+
+class VoiceLeadingTest(unittest.TestCase):
+    @staticmethod
+    def fitness(solution: tuple) -> float:
+        return sum(
+            abs((p0 - p1).cents)
+            for p0, p1 in zip(solution, solution[1:])
+            if mel.TheEmptyPitch not in (p0, p1)
+        )
+
+    def test_find_best_voice_leading(self):
+        import random
+
+        random.seed(3)
+        tonal_range = (ji.r(1, 2), ji.r(4, 1))
+        available = (ji.r(1, 1), ji.r(9, 8), ji.r(5, 4), ji.r(3, 2), ji.r(7, 4))
+        for n in range(20):
+            pitches = tuple(
+                random.choice(available) for i in range(random.randint(1, 6))
+            )
+            if len(pitches) > 2:
+                pitches = pitches[:2] + (mel.TheEmptyPitch,) + pitches[2:]
+            solutions = tuple(
+                itertools.product(
+                    *tuple(
+                        (
+                            ji.find_all_available_pitches_in_a_specified_range(
+                                p, *tonal_range
+                            )
+                            if p != mel.TheEmptyPitch
+                            else (p,)
+                        )
+                        for p in pitches
+                    )
+                )
+            )
+            # brute force: the first solution with minimal fitness
+            best = min(solutions, key=self.fitness)
+            self.assertEqual(ji.find_best_voice_leading(pitches, tonal_range), best)
+            k_best = ji.find_best_voice_leading(pitches, tonal_range, k_best=5)
+            expected = sorted(self.fitness(solution) for solution in solutions)[:5]
+            self.assertEqual(len(k_best), len(expected))
+            for solution, fitness in zip(k_best, expected):
+                self.assertAlmostEqual(self.fitness(solution), fitness)
+
+    def test_long_melody(self):
+        pitches = (ji.r(3, 2), ji.r(5, 4), ji.r(7, 4), ji.r(9, 8)) * 100
+        solution = ji.find_best_voice_leading(pitches, (ji.r(1, 2), ji.r(4, 1)))
+        self.assertEqual(len(solution), len(pitches))
+
+
+class PitchesByComplexityTest(unittest.TestCase):
+    def test_order(self):
+        metrics = {
+            "tenney": lambda p: p.harmonicity_tenney,
+            "euler": lambda p: p.harmonicity_euler,
+            "barlow": lambda p: 1 / abs(p.harmonicity_barlow),
+        }
+        for val_border in (1, 2):
+            for metric, complexity in metrics.items():
+                pitches = tuple(
+                    ji.pitches_by_complexity(
+                        7, max_exponent=2, val_border=val_border, metric=metric
+                    )
+                )
+                n_primes = 3 if val_border == 2 else 4
+                self.assertEqual(len(pitches), 5 ** n_primes)
+                self.assertEqual(len(set(pitches)), len(pitches))
+                complexities = tuple(complexity(p) for p in pitches)
+                for c0, c1 in zip(complexities, complexities[1:]):
+                    self.assertLessEqual(c0, c1 + 1e-9)
+
+    def test_lazy(self):
+        pitches = ji.pitches_by_complexity(13, val_border=2, metric="euler")
+        self.assertEqual(
+            tuple(itertools.islice(pitches, 6)),
+            (ji.r(1, 1), ji.r(3, 2), ji.r(4, 3), ji.r(5, 4), ji.r(5, 3), ji.r(8, 5)),
+        )
+        bounded = tuple(ji.pitches_by_complexity(5, max_exponent=(2, 1), val_border=2))
+        self.assertEqual(len(bounded), 15)
+        self.assertRaises(ValueError, ji.pitches_by_complexity(5, metric="x").__next__)
+        self.assertRaises(
+            ValueError, ji.pitches_by_complexity(5, max_exponent=(1,)).__next__
+        )
+
+
+class HarmonicityTableTest(unittest.TestCase):
+    def test_build(self):
+        table = ji.HarmonicityTable.build(primes=(3, 5, 7), max_exponent=2)
+        self.assertEqual(len(table), 5 ** 3)
+        for row in table.table:
+            pitch = ji.JIPitch(tuple(int(e) for e in row["monzo"]), 2)
+            ratio = Fraction(int(row["numerator"]), int(row["denominator"]))
+            self.assertEqual(pitch.ratio, ratio)
+            self.assertAlmostEqual(row["barlow"], pitch.harmonicity_barlow)
+            self.assertEqual(row["euler"], pitch.harmonicity_euler)
+            self.assertAlmostEqual(row["tenney"], pitch.harmonicity_tenney)
+            self.assertAlmostEqual(row["cents"], pitch.cents)
+        self.assertRaises(ValueError, ji.HarmonicityTable.build, (2, 3))
+        self.assertRaises(ValueError, ji.HarmonicityTable.build, (3, 9))
+
+    def test_odd_limit(self):
+        table = ji.HarmonicityTable.build(primes=(3, 5, 7), odd_limit=9)
+        self.assertEqual(len(table), 19)
+        self.assertEqual(table.get_ratio(9, 5)["euler"], 9)
+        self.assertRaises(KeyError, table.get_ratio, 15, 8)
+
+    def test_query(self):
+        table = ji.HarmonicityTable.build(primes=(3, 7), max_exponent=1)
+        self.assertEqual(tuple(table.get_ratio(7, 6)["monzo"]), (-1, 1))
+        self.assertEqual(tuple(table.get_ratio(7, 3)["monzo"]), (-1, 1))
+        self.assertEqual(tuple(table.get_monzo((1, -1))["monzo"]), (1, -1))
+        self.assertEqual(table.get_monzo(ji.r(3, 2))["numerator"], 3)
+        self.assertRaises(KeyError, table.get_ratio, 5, 4)
+        self.assertRaises(KeyError, table.get_ratio, 9, 8)
+        self.assertRaises(KeyError, table.get_monzo, (1,))
+
+    def test_save_and_load(self):
+        import os
+        import tempfile
+
+        table = ji.HarmonicityTable.build(primes=(3, 5), max_exponent=3, odd_limit=15)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "table")
+            table.save(path)
+            loaded = ji.HarmonicityTable.load(path)
+            self.assertEqual(loaded.primes, table.primes)
+            self.assertEqual(loaded.odd_limit, 15)
+            self.assertEqual(len(loaded), len(table))
+            self.assertEqual(loaded.get_ratio(15, 8), table.get_ratio(15, 8))
+            del loaded
+
+
 class JIScaleTest(unittest.TestCase):
     def test_add(self):
         scale0 = ji.JIScale(
@@ -661,6 +954,123 @@ class JIScaleTest(unittest.TestCase):
         )
         self.assertEqual(scale0 + scale1, scale2)
 
+    def test_init(self):
+        scale = ji.JIScale(
+            [ji.r(1, 1), ji.r(9, 4), ji.r(4, 1), ji.r(7, 1), ji.r(2, 3)], ji.r(2, 1)
+        )
+        self.assertEqual(
+            tuple(scale), (ji.r(2, 3), ji.r(1, 1), ji.r(9, 8), ji.r(7, 4), ji.r(2, 1))
+        )
+        scale = ji.JIScale([ji.r(1, 1), ji.r(5, 1), ji.r(9, 1)], ji.r(3, 1))
+        self.assertEqual(tuple(scale), (ji.r(1, 1), ji.r(5, 3), ji.r(3, 1)))
+        self.assertRaises(ValueError, ji.JIScale, [ji.r(3, 1)], ji.r(1, 1))
+
+    def test_index(self):
+        pitches = (ji.r(1, 1), ji.r(9, 8), ji.r(4, 3), ji.r(3, 2), ji.r(7, 4))
+        scale = ji.JIScale(pitches, ji.r(2, 1))
+        for idx, pitch in enumerate(pitches + (ji.r(2, 1),)):
+            self.assertEqual(scale.index(pitch), idx)
+        self.assertRaises(ValueError, scale.index, ji.r(5, 4))
+        self.assertRaises(ValueError, scale.index, ji.r(9, 8, multiply=200))
+        self.assertRaises(ValueError, scale.index, mel.TheEmptyPitch)
+
+    def test_index_after_change(self):
+        r = ji.r
+        s = ji.JIScale((r(1, 1), r(9, 8), r(3, 2)), r(2, 1))
+        s.index(r(9, 8))
+        s.val_border = 2
+        self.assertEqual(s.index(r(9, 1, val_border=2)), 1)
+        s.val_border = 1
+        s.discard(r(9, 8))
+        s.add(r(5, 4))
+        self.assertEqual(s.index(r(5, 4)), 3)
+        self.assertRaises(ValueError, s.index, r(9, 8))
+
+    def test_index_speed(self):
+        import time
+
+        def lookup_time(n):
+            scale = ji.GeneratorScale.build(ji.r(3, 2), n=n, period=ji.r(2, 1))
+            item = ji.r(9, 8)
+            scale.index(item)
+            times = []
+            for repetition in range(5):
+                start = time.perf_counter()
+                for i in range(200):
+                    scale.index(item)
+                times.append(time.perf_counter() - start)
+            return min(times)
+
+        # the size of the scale differs by a factor of 100
+        self.assertLess(lookup_time(4000), lookup_time(40) * 10)
+
+    def test_quantize(self):
+        scale = ji.JIScale(
+            [ji.r(1, 1), ji.r(9, 8), ji.r(5, 4), ji.r(3, 2), ji.r(7, 4)], ji.r(2, 1)
+        )
+        cents = (0, 150, 310, 1000, 1150, 1210, 3600, -300)
+        quantized = (
+            ji.r(1, 1),
+            ji.r(9, 8),
+            ji.r(5, 4),
+            ji.r(7, 4),
+            ji.r(2, 1),
+            ji.r(2, 1),
+            ji.r(8, 1),
+            ji.r(7, 8),
+        )
+        self.assertEqual(scale.quantize(cents), quantized)
+        frequencies = tuple(p.freq for p in quantized)
+        self.assertEqual(scale.quantize(frequencies, frequencies=True), quantized)
+        # between 1/1 and 9/8 the lower degree wins
+        self.assertEqual(scale.quantize((ji.r(9, 8).cents / 2,)), (ji.r(1, 1),))
+
+    def test_generator_scale(self):
+        fifths = ji.GeneratorScale.iter_degrees(ji.r(3, 2), n=5, period=ji.r(2, 1))
+        fifths = tuple(fifths)
+        self.assertEqual(
+            fifths, (ji.r(1, 1), ji.r(3, 2), ji.r(9, 8), ji.r(27, 16), ji.r(81, 64))
+        )
+        # the chain closes at 2/1, therefore it stops before n is reached
+        closed = ji.GeneratorScale.iter_degrees(
+            ji.r(3, 2), ji.r(4, 3), n=100, period=ji.r(2, 1)
+        )
+        self.assertEqual(tuple(closed), (ji.r(1, 1), ji.r(3, 2)))
+        scale = ji.GeneratorScale(ji.r(3, 2), n=7, period=ji.r(2, 1))
+        built = ji.GeneratorScale.build(ji.r(3, 2), n=7, period=ji.r(2, 1))
+        self.assertEqual(tuple(built), tuple(scale))
+        array = ji.GeneratorScale.degree_array(ji.r(3, 2), n=5, period=ji.r(2, 1))
+        self.assertEqual(array.ratio, tuple(p.ratio for p in fifths))
+        long_chain = ji.GeneratorScale.degree_array(
+            ji.r(3, 2), n=10000, period=ji.r(2, 1)
+        )
+        self.assertEqual(len(long_chain), 10000)
+        self.assertRaises(
+            ValueError,
+            tuple,
+            ji.GeneratorScale.iter_degrees(ji.r(3, 2), n=3, period=ji.r(1, 1)),
+        )
+
+    def test_generator_scale_below_unison(self):
+        # the constructor only moves degrees above the period down,
+        # build moves every degree into [1/1, period)
+        r = ji.r
+        scale = ji.GeneratorScale(r(2, 3), n=4, period=r(2, 1))
+        self.assertEqual(tuple(scale), (r(8, 27), r(4, 9), r(2, 3), r(1, 1), r(2, 1)))
+        built = ji.GeneratorScale.build(r(2, 3), n=4, period=r(2, 1))
+        self.assertEqual(tuple(built), (r(1, 1), r(32, 27), r(4, 3), r(16, 9), r(2, 1)))
+        # chains that never close need n
+        self.assertRaises(ValueError, ji.GeneratorScale.build, r(3, 2))
+        self.assertRaises(ValueError, tuple, ji.GeneratorScale.iter_degrees(r(5, 4)))
+        self.assertRaises(ValueError, ji.GeneratorScale.degree_array, r(3, 2), r(5, 4))
+        closed = ji.GeneratorScale.build(r(3, 2), r(4, 3))
+        self.assertEqual(tuple(closed), (r(1, 1), r(3, 2), r(2, 1)))
+        closed = ji.GeneratorScale.build(r(9, 8), r(8, 9), r(3, 2), r(4, 3))
+        self.assertEqual(tuple(closed), (r(1, 1), r(9, 8), r(3, 2), r(2, 1)))
+        # the default period of build is 2/1
+        built = ji.GeneratorScale.build(r(3, 2), n=3)
+        self.assertEqual(tuple(built), (r(1, 1), r(9, 8), r(3, 2), r(2, 1)))
+
     """
     def test_intervals(self):
         scale = ji.JIScale(
@@ -722,6 +1132,13 @@ class JIMelTest(unittest.TestCase):
         test_mel1 = test_mel1 + test_mel1.inverse()
         self.assertEqual(test_mel0, test_mel1)
 
+    def test_cents(self):
+        mel0 = ji.JIMel([ji.r(3, 2), mel.TheEmptyPitch, ji.r(7, 9, val_border=2)])
+        self.assertEqual(mel0.cents[1], None)
+        for p, ct in zip(mel0, mel0.cents):
+            if p:
+                self.assertAlmostEqual(p.cents, ct)
+
     def test_intervals(self):
         test_mel0 = ji.JIMel(
             (ji.JIPitch((0, 1, -1)), ji.JIPitch((0, 2, -2)), ji.JIPitch((0, 3, -3)))
@@ -1023,6 +1440,115 @@ class JIMelTest(unittest.TestCase):
         test_mel1 = ji.JIMel((p0, p1, p2, p3, p4))
         self.assertEqual(test_mel0.uniqify(), test_mel1)
 
+    def test_move_to_closest_register(self):
+        pitches = (ji.r(3, 2), ji.r(5, 16), ji.r(7, 1), ji.r(1, 1), ji.r(9, 28))
+        reference = ji.r(3, 1)
+        mel0 = ji.JIMel(pitches)
+        self.assertEqual(
+            mel0.move_to_closest_register(reference),
+            ji.JIMel(p.move_to_closest_register(reference) for p in pitches),
+        )
+        self.assertEqual(mel0.register(2), ji.JIMel(p.register(2) for p in pitches))
+        self.assertEqual(mel0.normalize(), ji.JIMel(p.normalize() for p in pitches))
+        # pitches with different val_borders
+        mel1 = ji.JIMel((ji.r(3, 2, val_border=2),) + pitches)
+        self.assertEqual(
+            mel1.move_to_closest_register(reference),
+            ji.JIMel(p.move_to_closest_register(reference) for p in mel1),
+        )
+        harmonies = (ji.JIHarmony(pitches[:3]), ji.JIHarmony(pitches[3:]))
+        cadence = ji.JICadence(harmonies)
+        self.assertEqual(
+            cadence.move_to_closest_register(reference),
+            tuple(
+                ji.JIHarmony(p.move_to_closest_register(reference) for p in h)
+                for h in harmonies
+            ),
+        )
+        self.assertEqual(
+            cadence.register(-1),
+            tuple(ji.JIHarmony(p.register(-1) for p in h) for h in harmonies),
+        )
+
+
+class FindByWalkBestTest(unittest.TestCase):
+    @staticmethod
+    def compare(p0, p1) -> float:
+        return abs((p0 - p1).cents)
+
+    @staticmethod
+    def brute_force(melody, pitch, compare_function) -> tuple:
+        solutions = []
+        for permutation in itertools.permutations(melody):
+            if pitch is not None:
+                permutation = (pitch,) + permutation
+            fitness = sum(
+                compare_function(p0, p1) for p0, p1 in zip(permutation, permutation[1:])
+            )
+            solutions.append((fitness, permutation))
+        minima = min(fitness for fitness, permutation in solutions)
+        best = []
+        for fitness, permutation in solutions:
+            if abs(fitness - minima) < 1e-9 and permutation not in best:
+                best.append(permutation)
+        return tuple(ji.JIMel(permutation) for permutation in best)
+
+    def test_exact(self):
+        melody = ji.JIMel(
+            [ji.r(3, 2), ji.r(5, 4), ji.r(7, 4), ji.r(9, 8), ji.r(7, 6), ji.r(3, 2)]
+        )
+        for pitch in (ji.r(1, 1), ji.r(7, 4), None):
+            self.assertEqual(
+                melody.find_by_walk_best(pitch, self.compare),
+                self.brute_force(melody, pitch, self.compare),
+            )
+
+        def asymmetric(p0, p1):
+            return 2 * (p1 - p0).cents if p1.float > p0.float else (p0 - p1).cents
+
+        self.assertEqual(
+            melody.find_by_walk_best(ji.r(1, 1), asymmetric),
+            self.brute_force(melody, ji.r(1, 1), asymmetric),
+        )
+        self.assertEqual(
+            ji.JIMel([]).find_by_walk_best(ji.r(1, 1), self.compare),
+            (ji.JIMel([ji.r(1, 1)]),),
+        )
+
+    def test_repeated_pitches(self):
+        melody = ji.JIMel([ji.r(3, 2)] * 9)
+        self.assertEqual(
+            melody.find_by_walk_best(ji.r(1, 1), self.compare),
+            (ji.JIMel([ji.r(1, 1)] + [ji.r(3, 2)] * 9),),
+        )
+        melody = ji.JIMel([ji.r(3, 2), ji.r(5, 4), ji.r(3, 2), ji.r(5, 4), ji.r(9, 8)])
+        for pitch in (ji.r(1, 1), ji.r(4, 3), None):
+            self.assertEqual(
+                melody.find_by_walk_best(pitch, self.compare),
+                self.brute_force(melody, pitch, self.compare),
+            )
+
+    def test_time_budget(self):
+        melody = ji.JIMel(ji.r(n, 16) for n in range(17, 32, 2))
+        best = melody.find_by_walk_best(ji.r(1, 1), self.compare)
+        heuristic = melody.find_by_walk_best(ji.r(1, 1), self.compare, time_budget=0.5)
+        self.assertEqual(heuristic, best)
+        large = ji.JIMel(ji.r(n, 64) for n in range(65, 128, 2))
+        self.assertRaises(ValueError, large.find_by_walk_best, None, self.compare)
+        walk = large.find_by_walk_best(None, self.compare, time_budget=0.2)[0]
+        self.assertEqual(sorted(walk.float), sorted(large.float))
+
+
+def register_fitness(harmony, solution):
+    # prefers the third register and low registers for higher identities
+    return sum(
+        abs(register - 3) + idx * register for idx, (_, register) in enumerate(solution)
+    )
+
+
+def register_lower_bound(harmony, solution):
+    return register_fitness(harmony, solution)
+
 
 class JIHarmonyTest(unittest.TestCase):
     def test_root(self):
@@ -1096,6 +1622,102 @@ class JIHarmonyTest(unittest.TestCase):
         self.assertEqual(h0.intervals, h0_intervals)
         self.assertEqual(h1.intervals, h1_intervals)
 
+    def test_adjust_register_by_fitness(self):
+        harmony = ji.JIHarmony(
+            (
+                ji.r(3, 2, val_border=2),
+                ji.r(5, 4, val_border=2),
+                ji.r(7, 4, val_border=2),
+            )
+        )
+        identities = harmony.identity
+        registers = (2, 3, 4)
+        data = tuple(
+            (solution, register_fitness(harmony, solution))
+            for solution in (
+                tuple(zip(identities, combination))
+                for combination in itertools.combinations(
+                    registers * len(identities), len(identities)
+                )
+            )
+        )
+        best = min(fit for _, fit in data)
+        expected = tuple(
+            harmony.adjust_register_of_identities(*solution)
+            for solution, fit in data
+            if fit == best
+        )
+        self.assertEqual(
+            harmony.adjust_register_by_fitness(register_fitness, registers), expected
+        )
+        self.assertEqual(
+            harmony.adjust_register_by_fitness(
+                register_fitness, registers, lower_bound=register_lower_bound
+            ),
+            expected,
+        )
+        self.assertEqual(
+            harmony.adjust_register_by_fitness(
+                register_fitness, registers, processes=2
+            ),
+            expected,
+        )
+
+
+class JIHarmonyIndexTest(unittest.TestCase):
+    harmonies = (
+        ji.JIHarmony((ji.r(1, 1), ji.r(5, 4), ji.r(3, 2))),
+        ji.JIHarmony((ji.r(1, 1), ji.r(6, 5), ji.r(3, 2))),
+        ji.JIHarmony((ji.r(1, 1), ji.r(7, 4), ji.r(9, 8), ji.r(11, 8))),
+        ji.JIHarmony((ji.r(3, 2), ji.r(15, 8))),
+        ji.JIHarmony([]),
+    )
+
+    def test_transpositions(self):
+        index = ji.JIHarmonyIndex(self.harmonies)
+        self.assertEqual(len(index), len(self.harmonies))
+        for harmony in self.harmonies:
+            for transposition in (ji.r(9, 8), ji.r(7, 11), ji.r(1, 1)):
+                transposed = ji.JIHarmony(p + transposition for p in harmony)
+                self.assertIn(transposed, index)
+                self.assertEqual(index.transpositions(transposed), (harmony,))
+        self.assertNotIn(ji.JIHarmony((ji.r(1, 1), ji.r(7, 6))), index)
+        self.assertEqual(
+            index.transpositions(ji.JIHarmony((ji.r(1, 1), ji.r(7, 6)))), tuple([])
+        )
+
+        # octave equivalent index
+        index = ji.JIHarmonyIndex(self.harmonies, val_border=2)
+        self.assertIn(ji.JIHarmony((ji.r(4, 1), ji.r(5, 2), ji.r(3, 4))), index)
+        self.assertNotIn(
+            ji.JIHarmony((ji.r(4, 1), ji.r(5, 2), ji.r(3, 4))),
+            ji.JIHarmonyIndex(self.harmonies),
+        )
+
+    def test_nearest(self):
+        queries = (
+            ji.JIHarmony((ji.r(1, 1), ji.r(5, 4), ji.r(7, 4))),
+            ji.JIHarmony((ji.r(9, 8),)),
+            ji.JIHarmony((ji.r(4, 1), ji.r(5, 1), ji.r(6, 1))),
+            ji.JIHarmony([]),
+        )
+        # distances don't depend on the val_border of the index
+        for val_border, query in itertools.product((1, 2), queries):
+            index = ji.JIHarmonyIndex(self.harmonies, val_border=val_border)
+            diff = tuple(query.diff(h) for h in self.harmonies)
+            expected = tuple(
+                self.harmonies[idx]
+                for idx in sorted(range(len(diff)), key=lambda idx: diff[idx])
+            )
+            self.assertEqual(index.nearest(query, n=len(index)), expected)
+            dot = tuple(query.dot(h) for h in self.harmonies)
+            expected = tuple(
+                self.harmonies[idx]
+                for idx in sorted(range(len(dot)), key=lambda idx: -dot[idx])
+            )
+            self.assertEqual(index.nearest(query, n=3, metric="dot"), expected[:3])
+        self.assertRaises(ValueError, index.nearest, queries[0], 1, "unknown")
+
 
 class JICadenceTest(unittest.TestCase):
     def test_identity(self):
@@ -1117,6 +1739,60 @@ class JICadenceTest(unittest.TestCase):
             cadence1.identity, (h3.identity, h4.identity, h5.identity, h6.identity)
         )
 
+    def test_pairwise_operations(self):
+        import random
+
+        random.seed(10)
+        for val_border in (1, 2):
+            pitches = tuple(
+                ji.JIPitch([random.randint(-2, 2) for i in range(5)], val_border)
+                for n in range(12)
+            )
+            harmony = ji.JIHarmony(pitches)
+            harmony.val_border = val_border
+            other = ji.JIHarmony(pitches[:4])
+            data = tuple(harmony)
+
+            intervals = ji.JIHarmony([])
+            add, sub, mul = (ji.JIHarmony([]) for i in range(3))
+            for i, p0 in enumerate(data):
+                for p1 in data[i + 1 :]:
+                    intervals.add(p1 - p0)
+                    intervals.add(p0 - p1)
+                    add.add(p0 + p1)
+                    sub.add(p0 - p1)
+                    mul.add(p0 * p1)
+            self.assertEqual(harmony.intervals, intervals)
+            self.assertEqual(harmony.add_harmony(), add)
+            self.assertEqual(harmony.sub_harmony(), sub)
+            self.assertEqual(harmony.mul_harmony(), mul)
+
+            differential = ji.JIHarmony(
+                p0.differential(p1) for p0 in data for p1 in data if p0 != p1
+            )
+            self.assertEqual(harmony.differential, differential)
+
+            dot = sum(p0.dot(p1) for p0 in data for p1 in other)
+            self.assertEqual(harmony.dot(other), dot)
+            dot_sum = sum(p0.dot(p1) for p0 in data for p1 in data if p0 != p1)
+            self.assertEqual(harmony.dot_sum(), dot_sum)
+
+            distance = tuple(sum((p0 - p1).summed() for p1 in data) for p0 in data)
+            root = tuple(p for p, d in zip(data, distance) if d == min(distance))
+            self.assertEqual(harmony.root, root)
+
+        melody = ji.JIMel(pitches[:6] + pitches[:3])
+        melody.val_border = 1
+        dot_sum = sum(p0.dot(p1) for p0 in melody for p1 in melody if p0 != p1)
+        self.assertEqual(melody.dot_sum(), dot_sum)
+        other = ji.JIMel(pitches[4:])
+        other.val_border = 1
+        diff = ji.JIPitch([])
+        for p0 in melody:
+            for p1 in other:
+                diff += p0 - p1
+        self.assertEqual(melody.diff(other), diff.summed() / (len(melody) + len(other)))
+
     def test_empty_chords(self):
         n0 = ji.JIPitch([], val_border=2)
         h0 = ji.JIHarmony([n0, n0])
@@ -1239,6 +1915,14 @@ class JIStencilTest(unittest.TestCase):
         self.assertEqual(teststencil.identity, (p1, p0))
 
 
+def smaller_than_ten(pitch):
+    return pitch.float < 10
+
+
+def first_smaller_than_ten(harmony):
+    return smaller_than_ten(harmony[0])
+
+
 class BlueprintPitchTest(unittest.TestCase):
     def test_init(self):
         self.assertRaises(AssertionError, ji.BlueprintPitch, [0], [1])
@@ -1295,6 +1979,20 @@ class BlueprintPitchTest(unittest.TestCase):
         # bp0 only has 2 arguments
         self.assertRaises(ValueError, bp0, 7, 5, 11)
 
+    def test_instances(self):
+        bp = ji.BlueprintPitch((0, 1), (1,))
+        primes = (3, 5, 7, 11)
+        self.assertEqual(
+            tuple(bp.instances(primes)),
+            tuple(bp(*args) for args in itertools.permutations(primes, 2)),
+        )
+        self.assertEqual(
+            tuple(bp.instances(primes, predicates=(smaller_than_ten,))),
+            tuple(p for p in bp.instances(primes) if p.float < 10),
+        )
+        self.assertEqual(tuple(ji.BlueprintPitch().instances(primes)), (ji.r(1, 1),))
+        self.assertRaises(ValueError, bp.instances, (3, 9))
+
 
 class BlueprintHarmonyTest(unittest.TestCase):
     bp0 = ji.BlueprintPitch((1,))
@@ -1502,6 +2200,70 @@ class BlueprintHarmonyTest(unittest.TestCase):
 
         self.assertEqual(bph0.n_common_pitches(bph1), 1)
 
+    def test_hash_and_dedupe(self):
+        bph0 = ji.BlueprintHarmony(
+            (BlueprintHarmonyTest.bp0, (0,)),
+            (BlueprintHarmonyTest.bp0, (1,)),
+            (BlueprintHarmonyTest.bp3, (0,)),
+        )
+        bph1 = ji.BlueprintHarmony(
+            (BlueprintHarmonyTest.bp0, (1,)),
+            (BlueprintHarmonyTest.bp0, (0,)),
+            (BlueprintHarmonyTest.bp3, (1,)),
+        )
+        bph2 = ji.BlueprintHarmony(
+            (BlueprintHarmonyTest.bp0, (0,)),
+            (BlueprintHarmonyTest.bp1, (0, 1)),
+            (BlueprintHarmonyTest.bp3, (1,)),
+        )
+        bph3 = ji.BlueprintHarmony(
+            (BlueprintHarmonyTest.bp0, (0,)),
+            (BlueprintHarmonyTest.bp1, (1, 0)),
+            (BlueprintHarmonyTest.bp3, (1,)),
+        )
+        self.assertEqual(bph0, bph1)
+        self.assertEqual(hash(bph0), hash(bph1))
+        self.assertEqual(len({bph0, bph1, bph2, bph3}), 3)
+        self.assertEqual(
+            ji.BlueprintHarmony.dedupe((bph2, bph0, bph1, bph3, bph2)),
+            (bph2, bph0, bph3),
+        )
+        self.assertIs(ji.BlueprintHarmony.dedupe((bph0, bph1))[0], bph0)
+        # the identity of an object can't be changed from outside
+        bph0.identity.clear()
+        self.assertEqual(bph0, bph1)
+
+    def test_instances(self):
+        bph = ji.BlueprintHarmony(
+            (BlueprintHarmonyTest.bp0, (1,)),
+            (BlueprintHarmonyTest.bp1, (4, 1)),
+            (BlueprintHarmonyTest.bp3, (5,)),
+        )
+        primes = (3, 5, 7, 11, 13)
+        expected = tuple(
+            bph(*tuple(dict(zip((1, 4, 5), args)).get(idx, 2) for idx in range(6)))
+            for args in itertools.permutations(primes, 3)
+        )
+        self.assertEqual(tuple(bph.instances(primes)), expected)
+        self.assertEqual(tuple(bph.instances(primes, validated=True)), expected)
+        filtered = tuple(h for h in expected if first_smaller_than_ten(h))
+        self.assertEqual(
+            tuple(bph.instances(primes, predicates=(first_smaller_than_ten,))),
+            filtered,
+        )
+        self.assertEqual(
+            tuple(
+                bph.instances(
+                    primes,
+                    predicates=(first_smaller_than_ten,),
+                    processes=2,
+                    chunksize=7,
+                )
+            ),
+            filtered,
+        )
+        self.assertRaises(ValueError, bph.instances, (3, 5, 7, 15))
+
 
 class JIModule(unittest.TestCase):
     def test_m(self):
@@ -0,0 +1,284 @@
+import os
+import random
+import tempfile
+import unittest
+from unittest import mock
+
+import mido
+
+from mu.mel import ji
+from mu.midiplug import midiplug
+from mu.sco import old
+from mu.utils import interpolations
+
+
+def mk_glissando(interval: ji.JIPitch) -> old.GlissandoLine:
+    return old.GlissandoLine(
+        interpolations.InterpolationLine(
+            [
+                old.PitchInterpolation(1, ji.r(1, 1)),
+                old.PitchInterpolation(0, interval),
+            ]
+        )
+    )
+
+
+def read_midi_file(path: str) -> tuple:
+    """Return the note events, the held values per tick, the last tick and messages.
+
+    The held values per tick contain the pitch bend of every channel and every
+    control value after all messages of the tick have been sent.
+    """
+    tick = 0
+    messages = tuple(mido.MidiFile(path).tracks[0])
+    note_events = []
+    values = {}
+    values_per_tick = {}
+    for message in messages:
+        tick += message.time
+        if message.type == "pitchwheel":
+            values[("pitchwheel", message.channel)] = message.pitch
+        elif message.type == "control_change":
+            values[("control_change", message.channel, message.control)] = message.value
+        elif message.type in ("note_on", "note_off"):
+            note_events.append((tick, message.type, message.channel, message.note))
+        values_per_tick[tick] = dict(values)
+
+    last_values = {}
+    complete_values_per_tick = []
+    for nth_tick in range(tick + 1):
+        last_values = values_per_tick.get(nth_tick, last_values)
+        complete_values_per_tick.append(last_values)
+    return tuple(note_events), tuple(complete_values_per_tick), tick, messages
+
+
+class MidiFileTest(unittest.TestCase):
+    def export(self, midi_file: midiplug.MidiFile) -> tuple:
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "test.mid")
+            midi_file.export(path)
+            return read_midi_file(path)
+
+    def test_mk_overlapping_dict(self):
+        # rests only move the following tones and don't get any index
+        sequence = (
+            old.Tone(ji.r(1, 1), delay=1, duration=3),
+            old.Rest(1),
+            old.Tone(ji.r(5, 4), delay=1, duration=1),
+            old.Tone(ji.r(3, 2), delay=1, duration=2),
+            old.Tone(ji.r(7, 4), delay=0, duration=0),
+            old.Rest(2),
+            old.Tone(ji.r(9, 8), delay=1, duration=1),
+        )
+        self.assertEqual(
+            midiplug.MidiFile.mk_overlapping_dict(sequence),
+            {0: [], 1: [0], 2: [], 3: [2], 4: []},
+        )
+
+    def test_detect_grid_position(self):
+        sequence = (
+            # the end is in the middle of two ticks
+            old.Tone(ji.r(1, 1), delay=0.25, duration=0.25),
+            old.Rest(0.5),
+            # starts in the middle and ends just before a tick
+            old.Tone(ji.r(1, 1), delay=0.49, duration=0.24),
+            # starts just before the middle and ends after the last tick
+            old.Tone(ji.r(1, 1), delay=1, duration=10),
+        )
+        self.assertEqual(
+            midiplug.MidiFile.detect_grid_position(sequence, 0.5, 5),
+            ((0, 1), (2, 2), (2, 4)),
+        )
+        self.assertEqual(midiplug.MidiFile.detect_grid_position(tuple([]), 0.5, 5), ())
+
+    @staticmethod
+    def distribute_tones_on_midi_keys(
+        sequence: tuple, available_midi_notes: tuple, backtracking: bool = False
+    ) -> tuple:
+        if backtracking:
+            distribute = midiplug.MidiFile.distribute_tones_on_midi_keys_by_backtracking
+        else:
+            distribute = midiplug.MidiFile.distribute_tones_on_midi_keys
+        return distribute(
+            sequence,
+            len(available_midi_notes),
+            available_midi_notes,
+            midiplug.MidiFile.mk_overlapping_dict(sequence),
+            midiplug.MidiFile.mk_midi_key_dictionary(
+                set(t.pitch for t in sequence),
+                available_midi_notes,
+                len(available_midi_notes),
+            ),
+        )
+
+    def assert_keys_are_free(self, sequence: tuple, keys: tuple) -> None:
+        overlapping_dict = midiplug.MidiFile.mk_overlapping_dict(sequence)
+        for tone, simultan_tones in overlapping_dict.items():
+            for simultan_tone in simultan_tones:
+                self.assertNotEqual(keys[tone], keys[simultan_tone])
+
+    def test_distribute_tones_on_midi_keys(self):
+        available_midi_notes = tuple(range(60, 80))
+        sequence = (
+            old.Tone(ji.r(16, 15), delay=1, duration=3),
+            old.Tone(ji.r(16, 15), delay=1, duration=3),
+            old.Tone(ji.r(3, 2), delay=1, duration=1),
+            old.Tone(ji.r(16, 15), delay=1, duration=1),
+        )
+        keys = self.distribute_tones_on_midi_keys(sequence, available_midi_notes)
+        # 16/15 is closest to 70, which is still used by the first tone when
+        # the second tone starts, but not anymore when the last tone starts
+        self.assertEqual(keys, (70, 71, 76, 70))
+        self.assertEqual(
+            self.distribute_tones_on_midi_keys(tuple([]), available_midi_notes), ()
+        )
+
+    def test_too_many_simultan_tones(self):
+        sequence = tuple(old.Tone(ji.r(16, 15), delay=0, duration=1) for i in range(4))
+        # the greedy allocator has to raise the error on its own
+        with mock.patch.object(
+            midiplug.MidiFile,
+            "distribute_tones_on_midi_keys_by_backtracking",
+            side_effect=AssertionError("backtracking was called"),
+        ):
+            self.assertRaises(
+                ValueError, self.distribute_tones_on_midi_keys, sequence, (69, 70, 71)
+            )
+        self.assertRaises(
+            ValueError,
+            self.distribute_tones_on_midi_keys,
+            sequence,
+            (69, 70, 71),
+            backtracking=True,
+        )
+
+    def test_backtracking_checks_last_tone(self):
+        sequence = (
+            old.Tone(ji.r(16, 15), delay=1, duration=2),
+            old.Tone(ji.r(16, 15), delay=1, duration=1),
+        )
+        keys = self.distribute_tones_on_midi_keys(
+            sequence, (69, 70, 71), backtracking=True
+        )
+        self.assertEqual(keys, (70, 71))
+
+    def test_greedy_and_backtracking_agree(self):
+        random.seed(10)
+        available_midi_notes = tuple(range(66, 74))
+        pitches = (ji.r(1, 1), ji.r(16, 15), ji.r(9, 8), ji.r(6, 5), ji.r(5, 4))
+        for n in range(30):
+            sequence = tuple(
+                old.Tone(
+                    random.choice(pitches),
+                    delay=random.choice((0, 0.5, 1)),
+                    duration=random.choice((0.5, 1, 2, 3)),
+                )
+                for i in range(10)
+            )
+            try:
+                keys = self.distribute_tones_on_midi_keys(
+                    sequence, available_midi_notes
+                )
+            except ValueError:
+                continue
+            self.assert_keys_are_free(sequence, keys)
+            self.assertEqual(
+                keys,
+                self.distribute_tones_on_midi_keys(
+                    sequence, available_midi_notes, backtracking=True
+                ),
+            )
+
+    def test_pitch_bend_changes_only(self):
+        # more tones than channels, so that every channel gets used,
+        # and a rest at the end of the sequence
+        sequence = []
+        for i in range(20):
+            glissando = mk_glissando(ji.r(9 + i % 3, 8)) if i % 2 else None
+            sequence.append(
+                midiplug.PyteqTone(
+                    ji.r(3 + i % 5, 4),
+                    delay=0.03 + (i % 4) * 0.01,
+                    duration=0.06 + (i % 3) * 0.02,
+                    glissando=glissando,
+                )
+            )
+        sequence.append(old.Rest(0.2))
+
+        every_tick = self.export(midiplug.Pianoteq(sequence))
+        changes_only = self.export(
+            midiplug.Pianoteq(sequence, pitch_bend_changes_only=True)
+        )
+        self.assertEqual(every_tick[0], changes_only[0])
+        self.assertEqual(every_tick[2], changes_only[2])
+        for tick, values0, values1 in zip(
+            range(every_tick[2] + 1), every_tick[1], changes_only[1]
+        ):
+            for channel in midiplug.Pianoteq.available_channel:
+                self.assertEqual(
+                    values0.get(("pitchwheel", channel), 0),
+                    values1.get(("pitchwheel", channel), 0),
+                    msg="channel {} at tick {}".format(channel, tick),
+                )
+
+    def test_tolerance(self):
+        pitch_bend_tolerance = 2
+        control_tolerance = 2
+        hammer_noise = interpolations.InterpolationLine(
+            [
+                interpolations.FloatInterpolationEvent(2, 0.2),
+                interpolations.FloatInterpolationEvent(0, 3),
+            ]
+        )
+        sequence = (
+            midiplug.PyteqTone(
+                ji.r(1, 1),
+                delay=2,
+                duration=2,
+                glissando=mk_glissando(ji.r(16, 15)),
+                hammer_noise=hammer_noise,
+            ),
+            old.Rest(0.5),
+        )
+        exact = self.export(midiplug.Pianoteq(sequence, pitch_bend_changes_only=True))
+        simplified = self.export(
+            midiplug.Pianoteq(
+                sequence,
+                pitch_bend_changes_only=True,
+                pitch_bend_tolerance=pitch_bend_tolerance,
+                control_tolerance=control_tolerance,
+            )
+        )
+        self.assertEqual(exact[0], simplified[0])
+        self.assertEqual(exact[2], simplified[2])
+
+        def count(messages, message_type):
+            return sum(1 for message in messages if message.type == message_type)
+
+        for message_type in ("pitchwheel", "control_change"):
+            n_exact = count(exact[3], message_type)
+            n_simplified = count(simplified[3], message_type)
+            self.assertLess(n_simplified, n_exact / 10, msg=message_type)
+
+        # values get truncated to integers after they have been simplified
+        pitch_bend_per_cent = (
+            midiplug.Pianoteq.maximum_pitch_bending
+            / midiplug.Pianoteq.maximum_cent_deviation
+            / 2
+        )
+        max_difference = {
+            "pitchwheel": pitch_bend_tolerance * pitch_bend_per_cent + 1,
+            "control_change": control_tolerance + 1,
+        }
+        for tick, values0, values1 in zip(range(exact[2] + 1), exact[1], simplified[1]):
+            self.assertEqual(set(values0), set(values1))
+            for key, value in values0.items():
+                self.assertLessEqual(
+                    abs(value - values1[key]),
+                    max_difference[key[0]],
+                    msg="{} at tick {}".format(key, tick),
+                )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -58,6 +58,20 @@ class InterpolationsTest(unittest.TestCase):
             tuple(round(n, 2) for n in inter2), (0, 1.33, 2.93, 4.93, 7.33, 10)
         )
 
+    def test_simplify_by_tolerance(self):
+        values = (0, 0.5, 1, 1.5, 2, 2.2)
+        self.assertEqual(
+            interpolations.simplify_by_tolerance(values, 1), (0, 0, 0, 1.5, 1.5, 2.2)
+        )
+        self.assertEqual(interpolations.simplify_by_tolerance(values, 0), values)
+        self.assertEqual(interpolations.simplify_by_tolerance(tuple([]), 1), tuple([]))
+        glissando = interpolations.Linear()(0, 200, 2000)
+        simplified = interpolations.simplify_by_tolerance(glissando, 2)
+        self.assertEqual(len(simplified), len(glissando))
+        self.assertLessEqual(max(abs(a - b) for a, b in zip(glissando, simplified)), 2)
+        self.assertLess(len(set(simplified)), len(glissando) // 10)
+        self.assertRaises(ValueError, interpolations.simplify_by_tolerance, values, -1)
+
 
 class InterpolationEventTest(unittest.TestCase):
     def test_construction(self):
@@ -1,3 +1,4 @@
+import itertools
 import unittest
 from mu.utils import prime_factors
 
@@ -8,3 +9,73 @@ class TestFactorise(unittest.TestCase):
         self.assertEqual(prime_factors.factorise(9), [3, 3])
         self.assertEqual(prime_factors.factorise(15), [3, 5])
         self.assertEqual(prime_factors.factorise(36), [2, 2, 3, 3])
+
+
+class TestPrimeTable(unittest.TestCase):
+    def test_nth_prime(self):
+        table = prime_factors.PrimeTable(limit=16)
+        self.assertEqual(table.nth_prime(0), 2)
+        self.assertEqual(table.nth_prime(4), 11)
+        self.assertEqual(table.nth_prime(99), 541)
+        self.assertGreaterEqual(table.limit, 541)
+
+    def test_n_primes(self):
+        table = prime_factors.PrimeTable(limit=16)
+        self.assertEqual(table.n_primes(0), tuple([]))
+        self.assertEqual(table.n_primes(4), (2, 3, 5, 7))
+        self.assertEqual(len(table.n_primes(200)), 200)
+
+    def test_count_primes(self):
+        table = prime_factors.PrimeTable(limit=16)
+        self.assertEqual(table.count_primes(0), 0)
+        self.assertEqual(table.count_primes(2), 1)
+        self.assertEqual(table.count_primes(16), 6)
+        self.assertEqual(table.count_primes(17), 7)
+        self.assertEqual(table.count_primes(1000), 168)
+
+    def test_iter(self):
+        table = prime_factors.PrimeTable(limit=16)
+        primes = tuple(itertools.islice(table, 100))
+        self.assertEqual(primes[:7], (2, 3, 5, 7, 11, 13, 17))
+        self.assertEqual(primes, table.n_primes(100))
+
+    def test_index(self):
+        table = prime_factors.PrimeTable(limit=16)
+        self.assertEqual(table.index(2), 0)
+        self.assertEqual(table.index(541), 99)
+        self.assertRaises(ValueError, table.index, 15)
+
+
+class TestSmallestPrimeFactorSieve(unittest.TestCase):
+    def test_factors(self):
+        sieve = prime_factors.SmallestPrimeFactorSieve(1000)
+        self.assertEqual(sieve.bound, 1000)
+        self.assertEqual(sieve.factors(1), tuple([]))
+        self.assertEqual(sieve.factors(997), ((997, 1),))
+        self.assertEqual(sieve.factors(360), ((2, 3), (3, 2), (5, 1)))
+        for n in range(2, 1001):
+            self.assertEqual(
+                sieve.smallest_prime_factor(n), prime_factors.factorise(n)[0]
+            )
+
+    def test_memory_map(self):
+        import os
+        import tempfile
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "spf.npy")
+            sieve0 = prime_factors.SmallestPrimeFactorSieve(500, path)
+            self.assertTrue(os.path.isfile(path))
+            sieve1 = prime_factors.SmallestPrimeFactorSieve(200, path)
+            self.assertEqual(sieve1.bound, 500)
+            self.assertEqual(sieve0.factors(462), sieve1.factors(462))
+            del sieve0, sieve1
+
+    def test_above_bound(self):
+        n = 2 ** 5 * 65537 * 1000003
+        bound = prime_factors.SPF_SIEVE.bound
+        self.assertGreater(n, bound)
+        self.assertEqual(
+            tuple(prime_factors.factors(n)), ((2, 5), (65537, 1), (1000003, 1))
+        )
+        self.assertEqual(prime_factors.factorise(-(bound + 2)), [-1, 2, 3, 3, 11, 331])
@@ -0,0 +1,71 @@
+import random
+import unittest
+
+import numpy as np
+
+from mu.utils import tools
+
+
+class FindOverlappingIntervalsTest(unittest.TestCase):
+    def test_touching_intervals(self):
+        self.assertEqual(
+            tools.find_overlapping_intervals(((0, 1), (1, 2), (2, 3))), ((), (), ())
+        )
+
+    def test_zero_length_intervals(self):
+        # zero length intervals see the intervals that are sounding,
+        # but they never overlap later intervals
+        self.assertEqual(
+            tools.find_overlapping_intervals(((0, 2), (1, 1), (1, 3))),
+            ((), (0,), (0,)),
+        )
+        self.assertEqual(tools.find_overlapping_intervals(((1, 1), (1, 2))), ((), ()))
+
+    def test_equal_starts(self):
+        self.assertEqual(
+            tools.find_overlapping_intervals(((0, 2), (0, 1), (0, 3))),
+            ((), (0,), (0, 1)),
+        )
+
+    def test_unsorted_intervals(self):
+        self.assertEqual(
+            tools.find_overlapping_intervals(((2, 4), (0, 3), (5, 6), (3, 7))),
+            ((1,), (), (3,), (0,)),
+        )
+        self.assertEqual(tools.find_overlapping_intervals(tuple([])), tuple([]))
+
+
+class FindClosestGridIndexTest(unittest.TestCase):
+    def test_midpoint(self):
+        # in the middle of two points the later point wins
+        self.assertEqual(
+            tools.find_closest_grid_index((0.25, 0.75, 1.25), 0.5).tolist(), [1, 2, 3]
+        )
+
+    def test_close_to_points(self):
+        times = (1 - 1e-9, 1, 1 + 1e-9, 0.25 - 1e-9, 0.25 + 1e-9)
+        self.assertEqual(
+            tools.find_closest_grid_index(times, 0.5).tolist(), [2, 2, 2, 0, 1]
+        )
+        # 0.7 / 0.1 is 6.999999999999999
+        self.assertEqual(tools.find_closest_grid_index((0.7,), 0.1).tolist(), [7])
+
+    def test_same_like_find_closest_index(self):
+        random.seed(3)
+        for gridsize in (0.001, 0.1, 1 / 3):
+            grid = tuple(i * gridsize for i in range(1200))
+            times = tuple(random.uniform(0, 1000 * gridsize) for i in range(500))
+            # points, midpoints and values close to them
+            times += tuple(grid[:1000])
+            times += tuple(point + (gridsize / 2) for point in grid[:1000])
+            times += tuple(np.nextafter(grid[:1000], 0)) + tuple(
+                np.nextafter(grid[:1000], 1000)
+            )
+            self.assertEqual(
+                tools.find_closest_grid_index(times, gridsize).tolist(),
+                [tools.find_closest_index(time, grid) for time in times],
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()